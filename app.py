@@ -1,21 +1,21 @@
 """
 Main Flask application entry point
 """
-from flask import Flask, render_template, request, redirect, url_for, flash, session, jsonify
-import mysql.connector
-from mysql.connector import pooling
+import time
+_import_started = time.perf_counter()
+
+from flask import Flask, g, request
 import os
-import subprocess
-import re
-from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
-import paramiko
-import io
-from contextlib import contextmanager
 import logging
 from dotenv import load_dotenv
 from config import Config
 from database import db_manager
+from job_queue import job_queue
+from health_monitor import health_monitor
+from migrator import db_cli
+from assets import asset_pipeline, assets_cli
+from compression import CompressionMiddleware
+from auth import session_interface, get_current_user
 
 # Import blueprints
 from routes.auth import auth_bp
@@ -23,17 +23,29 @@ from routes.dashboard import dashboard_bp
 from routes.marketplace import marketplace_bp
 from routes.deployments import deployments_bp
 from routes.health import health_bp
+from routes.metrics import metrics_bp, init_request_metrics
+from routes.assets import assets_bp
 
 # Load environment variables from .env file
 load_dotenv()
 
+IMPORT_TIME = time.perf_counter() - _import_started
+
 def create_app(config_name=None):
-    """Application factory pattern"""
+    """Application factory pattern
+    
+    Does no database or SSH I/O: connections open on first use, background
+    services start on the first request (i.e. inside each forked worker),
+    and the schema is managed by the separate `flask db upgrade` command.
+    """
+    started = time.perf_counter()
     if config_name is None:
         config_name = os.getenv('FLASK_ENV', 'default')
     
     app = Flask(__name__)
     app.config.from_object(Config)
+    if session_interface is not None:
+        app.session_interface = session_interface
     
     # Configure logging
     logging.basicConfig(level=logging.INFO)
@@ -45,20 +57,64 @@ def create_app(config_name=None):
     app.register_blueprint(marketplace_bp)
     app.register_blueprint(deployments_bp)
     app.register_blueprint(health_bp)
+    app.register_blueprint(metrics_bp)
+    app.register_blueprint(assets_bp)
+    init_request_metrics(app)
     
-    # Initialize database
-    try:
-        db_manager.initialize_database()
-        logger.info("🚀 Application initialized successfully")
-        logger.info(f"📊 Database: {Config.DB_CONFIG['host']}:{Config.DB_CONFIG['port']}/{Config.DB_CONFIG['database']}")
-        logger.info(f"🔐 SSH Backend: {Config.SSH_CONFIG['hostname']}:{Config.SSH_CONFIG['port']}")
-    except Exception as e:
-        logger.error(f"❌ Application initialization failed: {e}")
+    # Templates' url_for('static', ...) resolves to fingerprinted builds when present
+    app.jinja_env.globals['url_for'] = asset_pipeline.url_for
+    
+    services_started = False
+    
+    @app.before_request
+    def start_background_services():
+        # Threads don't survive fork, so start them in the process that serves requests
+        nonlocal services_started
+        if not services_started:
+            services_started = True
+            job_queue.start()
+            health_monitor.start()
+    
+    # Attribute queries to the logged-in user so their reads follow their writes
+    @app.before_request
+    def bind_db_session():
+        # Static files run no queries; reading the session would add Vary: Cookie to them
+        if request.endpoint in ('static', 'assets.asset'):
+            return
+        user = get_current_user()
+        g.db_session_token = db_manager.bind_session(user.id if user else None)
+    
+    @app.teardown_request
+    def unbind_db_session(exc=None):
+        token = g.pop('db_session_token', None)
+        if token is not None:
+            db_manager.unbind_session(token)
+    
+    app.wsgi_app = CompressionMiddleware(app.wsgi_app, **Config.COMPRESSION_CONFIG)
+    
+    # `flask db upgrade` / `flask db status`
+    app.cli.add_command(db_cli)
+    # `flask assets build`
+    app.cli.add_command(assets_cli)
+    
+    app.config['STARTUP_REPORT'] = {
+        'imports_ms': round(IMPORT_TIME * 1000, 1),
+        'create_app_ms': round((time.perf_counter() - started) * 1000, 1)
+    }
+    logger.info(f"🚀 Application created - imports {app.config['STARTUP_REPORT']['imports_ms']}ms, "
+                f"create_app {app.config['STARTUP_REPORT']['create_app_ms']}ms")
+    logger.info(f"📊 Database: {Config.DB_CONFIG['host']}:{Config.DB_CONFIG['port']}/{Config.DB_CONFIG['database']}")
+    logger.info(f"🔐 SSH Backend: {Config.SSH_CONFIG['hostname']}:{Config.SSH_CONFIG['port']}")
     
     return app
 
 if __name__ == '__main__':
     app = create_app()
+    # The development server runs the schema step inline; production uses `flask db upgrade`
+    try:
+        db_manager.initialize_database()
+    except Exception as e:
+        logging.getLogger(__name__).error(f"❌ Application initialization failed: {e}")
     print("🚀 Starting Hostinator with Remote MySQL Database")
     print(f"📊 Database: {Config.DB_CONFIG['host']}:{Config.DB_CONFIG['port']}")
     print(f"🔐 Backend: {Config.SSH_CONFIG['hostname']}:{Config.SSH_CONFIG['port']}")
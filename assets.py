@@ -0,0 +1,331 @@
+"""
+Static asset build: minified, content-fingerprinted and pre-compressed CSS/JS
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import logging
+import click
+import flask
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+ASSET_EXTENSIONS = ('.css', '.js')
+MANIFEST_NAME = 'manifest.json'
+HASHED_NAME_REGEX = re.compile(r'^[\w./-]+\.[0-9a-f]{12}\.(css|js)$')
+
+# Characters after which a '/' starts a regular expression rather than a division
+REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+REGEX_KEYWORDS = {'return', 'typeof', 'case', 'do', 'else', 'in', 'of', 'new', 'delete', 'void', 'throw', 'yield', 'await'}
+
+class AssetError(ValueError):
+    """Raised when an asset can't be parsed for minification"""
+
+def _skip_string(source, i):
+    """Index just past the quoted string or template literal starting at i"""
+    quote = source[i]
+    j = i + 1
+    while j < len(source):
+        c = source[j]
+        if c == '\\':
+            j += 2
+            continue
+        if c == quote:
+            return j + 1
+        if quote == '`' and source.startswith('${', j):
+            j = _skip_braces(source, j + 1)
+            continue
+        if c == '\n' and quote != '`':
+            break
+        j += 1
+    raise AssetError(f"Unterminated string at offset {i}")
+
+def _skip_braces(source, i):
+    """Index just past the balanced {...} block starting at i (a template substitution)"""
+    depth = 0
+    j = i
+    while j < len(source):
+        c = source[j]
+        if c in '\'"`':
+            j = _skip_string(source, j)
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+            if depth == 0:
+                return j + 1
+        j += 1
+    raise AssetError(f"Unterminated template substitution at offset {i}")
+
+def _starts_regex(source, i):
+    k = i - 1
+    while k >= 0 and source[k] in ' \t\r\n':
+        k -= 1
+    if k < 0 or source[k] in REGEX_PRECEDERS:
+        return True
+    end = k + 1
+    while k >= 0 and (source[k].isalnum() or source[k] in '_$'):
+        k -= 1
+    return source[k + 1:end] in REGEX_KEYWORDS
+
+def _skip_regex(source, i):
+    j = i + 1
+    in_class = False
+    while j < len(source) and source[j] != '\n':
+        c = source[j]
+        if c == '\\':
+            j += 2
+            continue
+        if in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '/':
+            return j + 1
+        j += 1
+    raise AssetError(f"Unterminated regular expression at offset {i}")
+
+def minify_js(source):
+    """Strip comments, indentation, blank lines and repeated spaces
+
+    Conservative on purpose: line breaks and identifiers are kept, so
+    automatic semicolon insertion and the global functions templates call
+    from onclick attributes behave exactly as in the source. Strings,
+    template literals and regular expressions are copied verbatim.
+    """
+    out = []
+    at_line_start = True
+    pending_space = False
+    i = 0
+    n = len(source)
+
+    def emit(chunk):
+        nonlocal at_line_start, pending_space
+        if pending_space and not at_line_start:
+            out.append(' ')
+        out.append(chunk)
+        at_line_start = pending_space = False
+
+    while i < n:
+        c = source[i]
+        if c in '\'"`':
+            j = _skip_string(source, i)
+            emit(source[i:j])
+            i = j
+        elif source.startswith('//', i):
+            j = source.find('\n', i)
+            i = n if j == -1 else j
+        elif source.startswith('/*', i):
+            j = source.find('*/', i + 2)
+            if j == -1:
+                raise AssetError(f"Unterminated comment at offset {i}")
+            pending_space = True
+            i = j + 2
+        elif c == '/' and _starts_regex(source, i):
+            j = _skip_regex(source, i)
+            emit(source[i:j])
+            i = j
+        elif c == '\n':
+            if not at_line_start:
+                out.append('\n')
+            at_line_start = True
+            pending_space = False
+            i += 1
+        elif c in ' \t\r':
+            pending_space = True
+            i += 1
+        else:
+            emit(c)
+            i += 1
+    if not at_line_start:
+        out.append('\n')
+    return ''.join(out)
+
+def minify_css(source):
+    """Strip comments and whitespace that CSS doesn't need
+
+    Whitespace before ':' is kept since it is a descendant combinator in
+    selectors (``a :hover``); strings are copied verbatim.
+    """
+    out = []
+    pending_space = False
+    i = 0
+    n = len(source)
+    while i < n:
+        c = source[i]
+        if source.startswith('/*', i):
+            j = source.find('*/', i + 2)
+            if j == -1:
+                raise AssetError(f"Unterminated comment at offset {i}")
+            pending_space = True
+            i = j + 2
+            continue
+        if c in ' \t\r\n':
+            pending_space = True
+            i += 1
+            continue
+        if c in '{};,>':
+            pending_space = False
+            if c == '}' and out and out[-1] == ';':
+                out.pop()
+        elif pending_space and out and out[-1] not in '{};,>:':
+            out.append(' ')
+        pending_space = False
+        if c in '\'"':
+            j = _skip_string(source, i)
+            out.append(source[i:j])
+            i = j
+            continue
+        out.append(c)
+        i += 1
+    return ''.join(out) + '\n'
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+class AssetPipeline:
+    """Builds fingerprinted assets and maps static URLs onto them
+
+    ``flask assets build`` writes each minified file as name.<hash>.ext under
+    output_dir, with .gz (and .br when the brotli package is installed)
+    siblings and a manifest of logical name -> hashed name. Templates keep
+    calling url_for('static', filename=...); names in the manifest resolve
+    to the hashed copy, anything else falls through to the plain static
+    route. The manifest is read once per process, so rebuild before
+    (re)starting workers.
+    """
+
+    def __init__(self, source_dir, output_dir, enabled=True, max_age=31536000, gzip_level=9, brotli_quality=11):
+        self.source_dir = source_dir
+        self.output_dir = output_dir
+        self.enabled = enabled
+        self.max_age = max_age
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self._manifest = None
+        self._lock = threading.Lock()
+
+    def sources(self):
+        """Logical names (relative to the static folder) of the assets to build"""
+        output_dir = os.path.abspath(self.output_dir)
+        names = []
+        for root, dirs, files in os.walk(self.source_dir):
+            # Never re-process our own output
+            dirs[:] = sorted(d for d in dirs if os.path.abspath(os.path.join(root, d)) != output_dir)
+            for filename in sorted(files):
+                if os.path.splitext(filename)[1] in ASSET_EXTENSIONS:
+                    path = os.path.relpath(os.path.join(root, filename), self.source_dir)
+                    names.append(path.replace(os.sep, '/'))
+        return names
+
+    def _write(self, path, content):
+        # Write then rename, so a worker never serves a half-written file
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(content)
+        os.replace(tmp, path)
+
+    def build(self, prune=False):
+        """Minify, fingerprint and compress every source; returns the new manifest"""
+        try:
+            import brotli
+        except ImportError:
+            brotli = None
+            logger.warning("⚠️ brotli not installed; writing gzip variants only")
+
+        manifest = {}
+        for name in self.sources():
+            stem, ext = os.path.splitext(name)
+            with open(os.path.join(self.source_dir, name), encoding='utf-8') as f:
+                source = f.read()
+            try:
+                content = MINIFIERS[ext](source).encode('utf-8')
+            except AssetError as e:
+                raise AssetError(f"{name}: {e}") from e
+
+            hashed = f"{stem}.{hashlib.sha256(content).hexdigest()[:12]}{ext}"
+            path = os.path.join(self.output_dir, hashed)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write(path, content)
+            # mtime=0 keeps the .gz bytes identical between builds
+            self._write(f"{path}.gz", gzip.compress(content, compresslevel=self.gzip_level, mtime=0))
+            if brotli is not None:
+                self._write(f"{path}.br", brotli.compress(content, quality=self.brotli_quality))
+            manifest[name] = hashed
+            logger.info(f"✅ {name} -> {hashed} ({len(source.encode('utf-8'))} -> {len(content)} bytes)")
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        self._write(os.path.join(self.output_dir, MANIFEST_NAME),
+                    (json.dumps(manifest, indent=2, sort_keys=True) + '\n').encode('utf-8'))
+        if prune:
+            self.prune(manifest)
+        with self._lock:
+            self._manifest = manifest
+        return manifest
+
+    def prune(self, manifest):
+        """Delete built files that the given manifest no longer references"""
+        current = set(manifest.values())
+        for root, _, files in os.walk(self.output_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                name = os.path.relpath(path, self.output_dir).replace(os.sep, '/')
+                for suffix in ('.gz', '.br'):
+                    if name.endswith(suffix):
+                        name = name[:-len(suffix)]
+                if HASHED_NAME_REGEX.match(name) and name not in current:
+                    os.remove(path)
+                    logger.info(f"🗑️ Removed {name}")
+
+    def manifest(self):
+        """Logical name -> hashed name, empty when disabled or not built"""
+        if self._manifest is None:
+            with self._lock:
+                if self._manifest is None:
+                    manifest = {}
+                    if self.enabled:
+                        try:
+                            with open(os.path.join(self.output_dir, MANIFEST_NAME)) as f:
+                                manifest = json.load(f)
+                        except FileNotFoundError:
+                            logger.info("ℹ️ No asset manifest; serving unfingerprinted static files")
+                    self._manifest = manifest
+        return self._manifest
+
+    def url_for(self, endpoint, **values):
+        """flask.url_for that points static files at their fingerprinted build"""
+        if endpoint == 'static':
+            hashed = self.manifest().get(values.get('filename'))
+            if hashed is not None:
+                values['filename'] = hashed
+                endpoint = 'assets.asset'
+        return flask.url_for(endpoint, **values)
+
+    def path_for(self, filename):
+        """Built file for a hashed name, or None"""
+        if not HASHED_NAME_REGEX.match(filename) or '..' in filename.split('/'):
+            return None
+        path = os.path.join(self.output_dir, filename)
+        return path if os.path.isfile(path) else None
+
+# Global asset pipeline instance
+asset_pipeline = AssetPipeline(**Config.ASSET_CONFIG)
+
+@click.group('assets')
+def assets_cli():
+    """Static asset commands"""
+
+@assets_cli.command('build')
+@click.option('--prune', is_flag=True, help='Delete builds no longer in the manifest')
+def build_command(prune):
+    """Minify, fingerprint and pre-compress static CSS and JS"""
+    manifest = asset_pipeline.build(prune=prune)
+    click.echo(f"Built {len(manifest)} assets into {asset_pipeline.output_dir}")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    assets_cli()
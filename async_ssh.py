@@ -0,0 +1,133 @@
+"""
+asyncio front end for SSHManager
+"""
+import asyncio
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from ssh_manager import SSHManager
+from ssh_pool import SSHConnectionPool
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Per-host gates shared by every event loop and thread in the process; callers
+# each run their own asyncio.run loop, so loop-bound semaphores wouldn't add up
+_host_gates = {}
+_host_gates_lock = threading.Lock()
+
+def get_executor():
+    """Shared thread pool that runs blocking paramiko calls"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=Config.ASYNC_SSH_CONFIG['max_workers'],
+                                           thread_name_prefix='async-ssh')
+        return _executor
+
+def shutdown_executor(wait=True):
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=wait)
+            _executor = None
+
+class HostGate:
+    """Counting semaphore that coroutines on any event loop can wait on
+
+    Waiters park as futures on their own loop, so a call queued behind a
+    busy host holds no executor thread. A released slot is handed straight
+    to the oldest waiter.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                return
+            waiter = (loop, loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter[1]
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+                    raise
+            # The slot was handed over as we were cancelled; pass it on
+            if waiter[1].done() and not waiter[1].cancelled():
+                self.release()
+            raise
+
+    def _grant(self, future):
+        # Runs on the waiter's loop
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                loop, future = self._waiters.popleft()
+                try:
+                    loop.call_soon_threadsafe(self._grant, future)
+                    return
+                except RuntimeError:
+                    # That waiter's loop has closed
+                    continue
+            self.in_use -= 1
+
+def _host_gate(ssh_config, limit):
+    key = SSHConnectionPool.host_key(ssh_config)
+    with _host_gates_lock:
+        gate = _host_gates.get(key)
+        if gate is None:
+            gate = _host_gates[key] = HostGate(limit)
+        return gate
+
+class AsyncSSHManager:
+    """Coroutine versions of SSHManager.execute_command/read_remote_file.
+
+    Work runs on pooled paramiko transports in a managed executor, with at
+    most max_concurrency_per_host operations in flight per backend host
+    across the whole process (the first limit set for a host applies).
+    """
+
+    def __init__(self, ssh_config, pool=None, max_concurrency_per_host=None):
+        self.ssh_config = ssh_config
+        self.ssh_manager = SSHManager(ssh_config, pool=pool)
+        self.max_concurrency_per_host = (max_concurrency_per_host
+                                         or Config.ASYNC_SSH_CONFIG['max_concurrency_per_host'])
+
+    async def _run(self, func, *args, **kwargs):
+        gate = _host_gate(self.ssh_config, self.max_concurrency_per_host)
+        # Wait for the host's slot before submitting, so waiting never ties up a worker
+        await gate.acquire()
+        try:
+            future = get_executor().submit(func, *args, **kwargs)
+        except BaseException:
+            gate.release()
+            raise
+        # Released when the work finishes or is cancelled before it starts
+        future.add_done_callback(lambda _: gate.release())
+        return await asyncio.wrap_future(future)
+
+    async def execute_command(self, command, timeout=300):
+        """Execute a command on the remote server, same result shape as SSHManager"""
+        return await self._run(self.ssh_manager.execute_command, command, timeout=timeout)
+
+    async def read_remote_file(self, file_path):
+        """Read a file from the remote server, same result as SSHManager"""
+        return await self._run(self.ssh_manager.read_remote_file, file_path)
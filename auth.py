@@ -0,0 +1,237 @@
+"""
+Server-side sessions, the current user and the login_required decorator
+"""
+import hashlib
+import os
+import secrets
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from flask import g, session, redirect, url_for
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SecureCookieSession
+from itsdangerous import Signer, BadSignature
+from werkzeug.local import LocalProxy
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Expired SQLite sessions are purged after this many writes
+PURGE_EVERY = 500
+
+def new_session_id():
+    return secrets.token_urlsafe(32)
+
+class MemorySessionStore:
+    """Per-process LRU of sessions; only for a single worker process"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, sid):
+        """Return (data, expires_at) for a live session, else None"""
+        with self._lock:
+            record = self._entries.get(sid)
+            if record is None:
+                return None
+            if record[1] <= time.time():
+                del self._entries[sid]
+                return None
+            self._entries.move_to_end(sid)
+            return record
+
+    def save(self, sid, data, expires_at):
+        with self._lock:
+            self._entries[sid] = (data, expires_at)
+            self._entries.move_to_end(sid)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, sid):
+        with self._lock:
+            self._entries.pop(sid, None)
+
+class SQLiteSessionStore:
+    """Sessions in a local SQLite file, shared by every worker process on the host"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            # WAL lets readers in other workers proceed while one writes
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    sid TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires ON sessions (expires_at)")
+            self._local.conn = conn
+        return conn
+
+    def load(self, sid):
+        """Return (data, expires_at) for a live session, else None"""
+        row = self._conn().execute("SELECT data, expires_at FROM sessions WHERE sid = ? AND expires_at > ?",
+                                   (sid, time.time())).fetchone()
+        return tuple(row) if row else None
+
+    def save(self, sid, data, expires_at):
+        conn = self._conn()
+        conn.execute("INSERT OR REPLACE INTO sessions (sid, data, expires_at) VALUES (?, ?, ?)",
+                     (sid, data, expires_at))
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % PURGE_EVERY == 0
+        if purge:
+            deleted = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)).rowcount
+            if deleted:
+                logger.info(f"🧹 Purged {deleted} expired sessions")
+
+    def delete(self, sid):
+        self._conn().execute("DELETE FROM sessions WHERE sid = ?", (sid,))
+
+class ServerSession(SecureCookieSession):
+    """Session whose data lives in a store; the cookie only carries its signed id"""
+
+    def __init__(self, initial=None, sid=None, new=False, expires_at=0):
+        super().__init__(initial)
+        self.sid = sid
+        self.new = new
+        self.expires_at = expires_at
+        self.stale_sid = None
+
+    def regenerate(self):
+        """Move the data to a fresh id and retire the old one"""
+        if not self.new:
+            self.stale_sid = self.sid
+        self.sid = new_session_id()
+        self.new = True
+        self.modified = True
+
+class ServerSideSessionInterface(SessionInterface):
+    """Flask session interface backed by a MemorySessionStore or SQLiteSessionStore
+
+    [SECURITY] The cookie holds only a random id signed with SECRET_KEY, so
+    forged ids are rejected without a store lookup, and logging out
+    deletes the session itself rather than just the client's copy.
+    """
+
+    serializer = TaggedJSONSerializer()
+    salt = 'hostinator-session'
+
+    def __init__(self, store, ttl=604800):
+        self.store = store
+        self.ttl = ttl
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt=self.salt, key_derivation='hmac', digest_method=hashlib.sha256)
+
+    def open_session(self, app, request):
+        if not app.secret_key:
+            return None
+        value = request.cookies.get(self.get_cookie_name(app))
+        if value:
+            try:
+                sid = self._signer(app).unsign(value).decode('ascii')
+            except BadSignature:
+                sid = None
+            record = self.store.load(sid) if sid else None
+            if record is not None:
+                data, expires_at = record
+                return ServerSession(self.serializer.loads(data), sid=sid, expires_at=expires_at)
+        return ServerSession(sid=new_session_id(), new=True)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+        if session.accessed:
+            response.vary.add('Cookie')
+        if session.stale_sid:
+            self.store.delete(session.stale_sid)
+
+        if not session:
+            if not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path, secure=self.get_cookie_secure(app),
+                                       samesite=self.get_cookie_samesite(app), httponly=self.get_cookie_httponly(app))
+            return
+
+        now = time.time()
+        # Unchanged sessions are re-saved only once half their idle lifetime has passed
+        if session.modified or session.new or session.expires_at - now < self.ttl / 2:
+            self.store.save(session.sid, self.serializer.dumps(dict(session)), now + self.ttl)
+        if not (session.new or self.should_set_cookie(app, session)):
+            return
+        response.set_cookie(name, self._signer(app).sign(session.sid).decode('ascii'),
+                            expires=self.get_expiration_time(app, session), httponly=self.get_cookie_httponly(app),
+                            domain=domain, path=path, secure=self.get_cookie_secure(app),
+                            samesite=self.get_cookie_samesite(app))
+
+def build_session_interface(backend='sqlite', ttl=604800, max_entries=10000, sqlite_path=None):
+    """Session interface for the configured backend; None keeps Flask's signed cookies"""
+    if backend == 'cookie':
+        return None
+    if backend == 'memory':
+        return ServerSideSessionInterface(MemorySessionStore(max_entries), ttl)
+    if backend == 'sqlite':
+        return ServerSideSessionInterface(SQLiteSessionStore(sqlite_path), ttl)
+    raise ValueError(f"Unknown SESSION_BACKEND {backend!r}; expected sqlite, memory or cookie")
+
+# Global session interface instance
+session_interface = build_session_interface(**Config.SESSION_CONFIG)
+
+class CurrentUser:
+    """The logged-in user, as recorded in their session at login"""
+
+    def __init__(self, id, username):
+        self.id = id
+        self.username = username
+
+def get_current_user():
+    """The request's CurrentUser, or None when nobody is logged in; built once per request"""
+    if 'current_user' not in g:
+        user_id = session.get('user_id')
+        g.current_user = CurrentUser(user_id, session.get('username')) if user_id is not None else None
+    return g.current_user
+
+current_user = LocalProxy(get_current_user)
+
+def login_user(user):
+    """Start an authenticated session for a users row"""
+    # [SECURITY] A fresh session id on login defeats session fixation
+    session.clear()
+    if isinstance(session, ServerSession):
+        session.regenerate()
+    session['user_id'] = user['id']
+    session['username'] = user['username']
+    g.pop('current_user', None)
+
+def logout_user():
+    session.clear()
+    if isinstance(session, ServerSession):
+        session.regenerate()
+    g.pop('current_user', None)
+
+def login_required(f):
+    """Decorator to require login"""
+    def decorated_function(*args, **kwargs):
+        if get_current_user() is None:
+            return redirect(url_for('auth.login'))
+        return f(*args, **kwargs)
+    decorated_function.__name__ = f.__name__
+    return decorated_function
@@ -0,0 +1,97 @@
+"""
+Backend host registry and deployment placement
+"""
+import threading
+import time
+import logging
+from config import Config
+from database import db_manager
+
+logger = logging.getLogger(__name__)
+
+class NoBackendAvailable(Exception):
+    """Raised when no enabled backend host can take a deployment"""
+
+class BackendScheduler:
+    """Chooses a backend host for each deployment and resolves hosts to SSH configs"""
+
+    def __init__(self, cache_ttl=30):
+        self.cache_ttl = cache_ttl
+        self._hosts = None
+        self._hosts_loaded_at = 0
+        self._lock = threading.Lock()
+        self._placement_lock = threading.Lock()
+
+    def list_hosts(self, refresh=False):
+        """Registered backend hosts keyed by id, cached briefly"""
+        with self._lock:
+            if refresh or self._hosts is None or time.monotonic() - self._hosts_loaded_at > self.cache_ttl:
+                rows = db_manager.execute_query(
+                    "SELECT id, name, hostname, port, username, capacity, labels, enabled FROM backend_hosts",
+                    fetch=True, primary=True
+                )
+                self._hosts = {row['id']: row for row in rows}
+                self._hosts_loaded_at = time.monotonic()
+            return self._hosts
+
+    @staticmethod
+    def accepts(host, deployment_type):
+        """Whether a host's labels allow the deployment type"""
+        labels = {label.strip() for label in (host['labels'] or '').split(',') if label.strip()}
+        return '*' in labels or deployment_type in labels
+
+    def host_loads(self):
+        """Number of deployments currently placed on each host"""
+        rows = db_manager.execute_query('''
+        SELECT backend_host_id, COUNT(*) as count FROM deployments
+        WHERE backend_host_id IS NOT NULL
+        GROUP BY backend_host_id
+        ''', fetch=True, primary=True)
+        return {row['backend_host_id']: row['count'] for row in rows}
+
+    def choose_host(self, deployment_type):
+        """Pick the least-loaded enabled host that accepts the type and has free capacity"""
+        loads = self.host_loads()
+        candidates = []
+        for host in self.list_hosts().values():
+            if not host['enabled'] or not self.accepts(host, deployment_type):
+                continue
+            load = loads.get(host['id'], 0)
+            if load >= host['capacity']:
+                continue
+            candidates.append((load / host['capacity'], load, host['id'], host))
+
+        if not candidates:
+            raise NoBackendAvailable(f"No backend host has capacity for {deployment_type}")
+        return min(candidates, key=lambda c: c[:3])[3]
+
+    def place(self, deployment_id, deployment_type):
+        """Choose a host for a deployment and record it on the deployments row"""
+        # Serialise placement so concurrent deployments in this process see each other's load
+        with self._placement_lock:
+            host = self.choose_host(deployment_type)
+            db_manager.execute_query(
+                "UPDATE deployments SET backend_host_id = %s WHERE id = %s", (host['id'], deployment_id)
+            )
+        logger.info(f"📍 Deployment {deployment_id} ({deployment_type}) placed on backend {host['name']}")
+        return host
+
+    def ssh_config_for(self, backend_host_id):
+        """SSH config for a host id; None means the configured default host"""
+        if backend_host_id is None:
+            return Config.SSH_CONFIG
+        host = self.list_hosts().get(backend_host_id)
+        if host is None:
+            host = self.list_hosts(refresh=True).get(backend_host_id)
+        if host is None:
+            raise NoBackendAvailable(f"Backend host {backend_host_id} is not registered")
+        # [SECURITY] Passwords are never stored in the registry; hosts share the configured credential
+        return {
+            'hostname': host['hostname'],
+            'port': host['port'],
+            'username': host['username'] or Config.SSH_CONFIG['username'],
+            'password': Config.SSH_CONFIG['password']
+        }
+
+# Global backend scheduler instance
+backend_scheduler = BackendScheduler()
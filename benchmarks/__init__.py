@@ -0,0 +1,3 @@
+"""
+Endpoint benchmarks run against fake MySQL and SSH backends
+"""
@@ -0,0 +1,240 @@
+"""
+In-process stand-in for the MySQL server used by the benchmarks
+
+Only the wire is faked: FakeDatabaseManager is the real DatabaseManager with
+pools whose connections run SQL against a shared in-memory SQLite database,
+so pooling, cursor caching, prepared statements, transactions and session
+pinning all run the production code paths. Each round trip sleeps for a
+configurable latency to stand in for the network.
+"""
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+import mysql.connector
+from database import DatabaseManager, ConnectionPool, _PooledSlot
+from config import Config
+
+# MySQL's VALUES(col) in ON DUPLICATE KEY UPDATE
+VALUES_FUNCTION_REGEX = re.compile(r'\bVALUES\((\w+)\)')
+
+# SQLite versions of the tables the migrations create
+SCHEMA = """
+CREATE TABLE users (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    username TEXT UNIQUE NOT NULL,
+    password TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE backend_hosts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    hostname TEXT NOT NULL,
+    port INTEGER NOT NULL DEFAULT 22,
+    username TEXT,
+    capacity INTEGER NOT NULL DEFAULT 100,
+    labels TEXT NOT NULL DEFAULT '*',
+    enabled BOOLEAN NOT NULL DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE deployments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    email TEXT NOT NULL,
+    status TEXT NOT NULL,
+    deployment_type TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    credentials_file TEXT,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    backend_host_id INTEGER
+);
+CREATE INDEX idx_user_created ON deployments (user_id, created_at, id);
+CREATE INDEX idx_backend_host ON deployments (backend_host_id);
+CREATE TABLE jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_type TEXT NOT NULL,
+    deployment_id INTEGER NOT NULL REFERENCES deployments(id) ON DELETE CASCADE,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    status TEXT NOT NULL,
+    output TEXT,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP NULL,
+    finished_at TIMESTAMP NULL
+);
+CREATE INDEX idx_job_status ON jobs (status);
+CREATE INDEX idx_job_deployment ON jobs (deployment_id, status);
+CREATE TABLE deployment_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    deployment_id INTEGER NOT NULL,
+    user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+    status TEXT NOT NULL,
+    occurred_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    seq INTEGER
+);
+CREATE INDEX idx_event_user ON deployment_events (user_id, id);
+CREATE INDEX idx_event_deployment ON deployment_events (deployment_id, id);
+CREATE INDEX idx_event_user_seq ON deployment_events (user_id, seq);
+CREATE TABLE deployment_event_sequences (
+    user_id INTEGER PRIMARY KEY REFERENCES users(id) ON DELETE CASCADE,
+    last_seq INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INTEGER NOT NULL
+);
+"""
+
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('TIMESTAMP', lambda value: datetime.fromisoformat(value.decode('ascii')))
+
+class FakeMySQLServer:
+    """Shared in-memory database plus round-trip accounting"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.round_trips = 0
+        self.connections_opened = 0
+        self._db = sqlite3.connect(':memory:', check_same_thread=False,
+                                   detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None)
+        self._db.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def round_trip(self):
+        # Sleep outside the lock so concurrent sessions overlap like they would on the network
+        with self._lock:
+            self.round_trips += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def run(self, query, seq_params):
+        """Execute a %s-style statement once per parameter tuple"""
+        query = query.replace('%s', '?')
+        # MySQL upserts as SQLite ones; VALUES(col) is the row that conflicted
+        query = query.replace('ON DUPLICATE KEY UPDATE', 'ON CONFLICT DO UPDATE SET')
+        query = VALUES_FUNCTION_REGEX.sub(r'excluded.\1', query)
+        # Transactions aren't isolated here (see FakeConnection.start_transaction), so row locks are dropped
+        query = query.replace(' FOR UPDATE', '')
+        try:
+            with self._lock:
+                cursor = self._db.cursor()
+                try:
+                    rowcount = 0
+                    for params in seq_params:
+                        cursor.execute(query, params)
+                        rowcount += max(cursor.rowcount, 0)
+                    columns = [column[0] for column in cursor.description] if cursor.description else None
+                    rows = cursor.fetchall() if columns else []
+                    return columns, rows, rowcount, cursor.lastrowid
+                finally:
+                    cursor.close()
+        except sqlite3.IntegrityError as e:
+            raise mysql.connector.IntegrityError(msg=str(e), errno=1062) from e
+        except sqlite3.Error as e:
+            raise mysql.connector.DatabaseError(msg=str(e)) from e
+
+class FakeCursor:
+    """Buffered mysql.connector-style cursor"""
+
+    def __init__(self, server, dictionary):
+        self.server = server
+        self.dictionary = dictionary
+        self.lastrowid = None
+        self.rowcount = -1
+        self._rows = []
+
+    def _store(self, query, columns, rows, rowcount, lastrowid):
+        is_insert = query.lstrip().upper().startswith('INSERT')
+        self.lastrowid = lastrowid if is_insert else None
+        if columns:
+            self._rows = [dict(zip(columns, row)) for row in rows] if self.dictionary else [tuple(row) for row in rows]
+            self.rowcount = len(self._rows)
+        else:
+            self._rows = []
+            self.rowcount = rowcount
+
+    def execute(self, query, params=None):
+        self.server.round_trip()
+        self._store(query, *self.server.run(query, [tuple(params or ())]))
+
+    def executemany(self, query, seq_params):
+        # mysql.connector rewrites INSERT ... VALUES into one multi-row statement
+        self.server.round_trip()
+        self._store(query, *self.server.run(query, [tuple(params) for params in seq_params]))
+
+    def fetchall(self):
+        rows, self._rows = self._rows, []
+        return rows
+
+    def close(self):
+        self._rows = []
+
+class FakeConnection:
+    """One client session on the fake server"""
+
+    def __init__(self, server):
+        self.server = server
+        self.in_transaction = False
+        with server._lock:
+            server.connections_opened += 1
+
+    def cursor(self, buffered=True, dictionary=False, prepared=False):
+        return FakeCursor(self.server, dictionary)
+
+    def start_transaction(self):
+        # Statements still apply immediately: the benchmark measures round trips, not isolation
+        self.server.round_trip()
+        self.in_transaction = True
+
+    def commit(self):
+        self.server.round_trip()
+        self.in_transaction = False
+
+    def rollback(self):
+        self.server.round_trip()
+        self.in_transaction = False
+
+    def ping(self, reconnect=False):
+        self.server.round_trip()
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        pass
+
+class FakeConnectionPool(ConnectionPool):
+    """The production pool, connecting to the fake server"""
+
+    def __init__(self, server, name, db_config, **kwargs):
+        super().__init__(name, db_config, **kwargs)
+        self.server = server
+
+    def _connect(self):
+        with self._cond:
+            self._metrics['created'] += 1
+        return _PooledSlot(FakeConnection(self.server))
+
+class FakeDatabaseManager(DatabaseManager):
+    """DatabaseManager whose pools talk to a FakeMySQLServer"""
+
+    def __init__(self, server):
+        self.server = server
+        super().__init__()
+
+    def create_pool(self, name, db_config):
+        return FakeConnectionPool(self.server, name, db_config, **Config.DB_POOL_CONFIG)
+
+    def check_connection(self):
+        return True
+
+    def initialize_database(self, target=None):
+        """Mark every migration applied; the schema is created with the server"""
+        from migrator import migrator
+        rows = [(m.version, m.name, 0) for m in migrator.discover() if target is None or m.version <= target]
+        self.bulk_insert('schema_migrations', ('version', 'name', 'duration_ms'), rows)
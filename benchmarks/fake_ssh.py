@@ -0,0 +1,129 @@
+"""
+Local stand-in SSH backend for the benchmarks
+
+Accepts password logins, answers every exec request with canned output and
+exit status 0 after a configurable delay, and serves any path over SFTP as a
+small credentials file. The application talks to it through the production
+SSH pool and managers.
+"""
+import io
+import socket
+import threading
+import time
+import logging
+import paramiko
+
+logger = logging.getLogger(__name__)
+
+CREDENTIALS_CONTENT = b"admin_user=admin\nadmin_password=benchmark\n"
+
+class _ServerInterface(paramiko.ServerInterface):
+    def __init__(self, backend):
+        self.backend = backend
+
+    def get_allowed_auths(self, username):
+        return 'password'
+
+    def check_auth_password(self, username, password):
+        if username == self.backend.username and password == self.backend.password:
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == 'session':
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        threading.Thread(target=self.backend.run_command, args=(channel, command), daemon=True).start()
+        return True
+
+class _SFTPHandle(paramiko.SFTPHandle):
+    def stat(self):
+        attributes = paramiko.SFTPAttributes()
+        attributes.st_size = len(CREDENTIALS_CONTENT)
+        return attributes
+
+class _SFTPServerInterface(paramiko.SFTPServerInterface):
+    def __init__(self, server, backend, *args, **kwargs):
+        super().__init__(server, *args, **kwargs)
+        self.backend = backend
+
+    def open(self, path, flags, attr):
+        self.backend.count('sftp')
+        handle = _SFTPHandle(flags)
+        handle.readfile = io.BytesIO(CREDENTIALS_CONTENT)
+        handle.filename = path
+        return handle
+
+    def stat(self, path):
+        attributes = paramiko.SFTPAttributes()
+        attributes.st_size = len(CREDENTIALS_CONTENT)
+        return attributes
+
+    lstat = stat
+
+class FakeSSHBackend:
+    """Threaded SSH server on 127.0.0.1 with exec and SFTP support"""
+
+    def __init__(self, username='bench', password='bench', latency=0.0, output='Deployment completed\n'):
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.output = output.encode('utf-8')
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.operations = {'connect': 0, 'exec': 0, 'sftp': 0}
+        self._lock = threading.Lock()
+        self._transports = []
+        self._socket = None
+        self.port = None
+
+    def count(self, operation):
+        with self._lock:
+            self.operations[operation] += 1
+
+    def start(self):
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind(('127.0.0.1', 0))
+        self._socket.listen(128)
+        self.port = self._socket.getsockname()[1]
+        threading.Thread(target=self._accept_loop, name='fake-ssh', daemon=True).start()
+        return self
+
+    def _accept_loop(self):
+        while True:
+            try:
+                client, _ = self._socket.accept()
+            except OSError:
+                return
+            self.count('connect')
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.host_key)
+            transport.set_subsystem_handler('sftp', paramiko.SFTPServer, _SFTPServerInterface, self)
+            try:
+                transport.start_server(server=_ServerInterface(self))
+            except paramiko.SSHException as e:
+                logger.warning(f"Fake SSH handshake failed: {e}")
+                continue
+            with self._lock:
+                self._transports.append(transport)
+
+    def run_command(self, channel, command):
+        self.count('exec')
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if command.strip() != 'true':
+                channel.sendall(self.output)
+            channel.send_exit_status(0)
+        finally:
+            channel.close()
+
+    def stop(self):
+        if self._socket is not None:
+            self._socket.close()
+        with self._lock:
+            transports, self._transports = self._transports, []
+        for transport in transports:
+            transport.close()
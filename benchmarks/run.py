@@ -0,0 +1,371 @@
+"""
+Endpoint benchmarks against in-process fake MySQL and SSH backends
+
+    python -m benchmarks.run -c 1 -c 8 -c 32 --duration 10 --db-latency-ms 0.5
+
+Boots create_app on a local threaded WSGI server, drives each endpoint with
+keep-alive HTTP clients at every concurrency level and reports throughput,
+p50/p95/p99 latency and database round trips / SSH operations per request.
+Results are written as JSON; pass --compare with an earlier results file to
+print the change against it.
+"""
+import http.client
+import json
+import logging
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.cookies import SimpleCookie
+from urllib.parse import urlencode
+import click
+from benchmarks.fake_ssh import FakeSSHBackend
+
+logger = logging.getLogger(__name__)
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BENCH_PASSWORD = 'bench-password'
+DEPLOYMENT_TYPES = ('WordPress', 'NextCloud', 'Moodle', 'Ghost')
+DEPLOYMENT_STATUSES = ('Active', 'Active', 'Inactive', 'Pending')
+JOB_DRAIN_TIMEOUT = 120
+
+# name -> (method, path builder taking a deployment id)
+ENDPOINTS = {
+    'dashboard': ('GET', lambda id: '/dashboard'),
+    'deployment_status': ('GET', lambda id: f"/api/deployment-status/{id}"),
+    'deployment_detail': ('GET', lambda id: f"/deployment/{id}"),
+    'execute_deployment': ('POST', lambda id: f"/api/execute-deployment/{id}"),
+    'marketplace': ('GET', lambda id: '/marketplace'),
+}
+
+def configure_environment(ssh_backend):
+    """Point the application config at the fake backends; must run before importing config"""
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+    # One process, so the in-memory store needs no file
+    os.environ.setdefault('SESSION_BACKEND', 'memory')
+    os.environ.setdefault('DB_HOST', '127.0.0.1')
+    os.environ.setdefault('DB_ROOT_USER', 'bench')
+    os.environ.setdefault('DB_ROOT_PASSWORD', 'bench')
+    os.environ['DB_REPLICA_HOSTS'] = ''
+    os.environ['SSH_HOSTNAME'] = '127.0.0.1'
+    os.environ['SSH_PORT'] = str(ssh_backend.port)
+    os.environ['SSH_USERNAME'] = ssh_backend.username
+    os.environ['SSH_PASSWORD'] = ssh_backend.password
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+
+def install_fake_database(db_latency):
+    """Swap database.db_manager for a FakeDatabaseManager before anything imports it"""
+    import database
+    from benchmarks.fake_db import FakeMySQLServer, FakeDatabaseManager
+    server = FakeMySQLServer(latency=db_latency)
+    database.db_manager = FakeDatabaseManager(server)
+    return database.db_manager
+
+def seed(db_manager, ssh_backend, num_users, deployments_per_user):
+    """Users, one backend host and deployments; returns [(username, [deployment ids])]"""
+    from werkzeug.security import generate_password_hash
+    db_manager.initialize_database()
+    db_manager.bulk_insert('backend_hosts', ('name', 'hostname', 'port', 'username', 'capacity', 'labels'),
+                           [('bench', '127.0.0.1', ssh_backend.port, ssh_backend.username, 1000000, '*')])
+
+    password_hash = generate_password_hash(BENCH_PASSWORD)
+    usernames = [f"bench{n}" for n in range(num_users)]
+    db_manager.bulk_insert('users', ('username', 'password'), [(name, password_hash) for name in usernames])
+    users = db_manager.execute_query("SELECT id, username FROM users ORDER BY id", fetch=True)
+
+    now = datetime.now().replace(microsecond=0)
+    rows = []
+    for user in users:
+        for n in range(deployments_per_user):
+            name = f"site{n}-u{user['id']}.bench.example.com"
+            status = DEPLOYMENT_STATUSES[n % len(DEPLOYMENT_STATUSES)]
+            credentials_file = f"/home/{name}/credentials_{name}.txt" if status == 'Active' else None
+            created_at = now - timedelta(minutes=n)
+            rows.append((name, f"admin@{name}", status, DEPLOYMENT_TYPES[n % len(DEPLOYMENT_TYPES)],
+                         created_at, created_at, credentials_file, user['id'], 1))
+    db_manager.bulk_insert('deployments', ('name', 'email', 'status', 'deployment_type', 'created_at',
+                                           'last_updated', 'credentials_file', 'user_id', 'backend_host_id'), rows)
+
+    seeded = []
+    for user in users:
+        ids = db_manager.execute_query("SELECT id FROM deployments WHERE user_id = %s ORDER BY id",
+                                       (user['id'],), fetch=True)
+        seeded.append((user['username'], [row['id'] for row in ids]))
+    return seeded
+
+class BenchmarkClient:
+    """One keep-alive HTTP connection carrying one user's session cookie"""
+
+    def __init__(self, port):
+        self.port = port
+        self.cookies = SimpleCookie()
+        self.conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+
+    def request(self, method, path, body=None, headers=None):
+        headers = dict(headers or {})
+        if self.cookies:
+            headers['Cookie'] = '; '.join(f"{k}={v.value}" for k, v in self.cookies.items())
+        for attempt in range(2):
+            try:
+                self.conn.request(method, path, body=body, headers=headers)
+                response = self.conn.getresponse()
+                response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed the keep-alive connection; reconnect once
+                self.conn.close()
+                self.conn = http.client.HTTPConnection('127.0.0.1', self.port, timeout=60)
+                if attempt:
+                    raise
+        for header in response.headers.get_all('Set-Cookie') or []:
+            self.cookies.load(header)
+        return response.status
+
+    def login(self, username, password):
+        status = self.request('POST', '/login', body=urlencode({'username': username, 'password': password}),
+                              headers={'Content-Type': 'application/x-www-form-urlencoded'})
+        if status != 302:
+            raise RuntimeError(f"Login failed for {username} (HTTP {status})")
+
+    def close(self):
+        self.conn.close()
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+def summarize_latencies(latencies):
+    latencies = sorted(latencies)
+    as_ms = lambda value: round(value * 1000, 3) if value is not None else None
+    return {
+        'mean': as_ms(sum(latencies) / len(latencies)) if latencies else None,
+        'p50': as_ms(percentile(latencies, 50)),
+        'p95': as_ms(percentile(latencies, 95)),
+        'p99': as_ms(percentile(latencies, 99)),
+        'max': as_ms(latencies[-1] if latencies else None)
+    }
+
+def run_scenario(port, endpoint, concurrency, users, duration, warmup, seed_value, db_server, ssh_backend):
+    """Drive one endpoint with `concurrency` clients for warmup + duration seconds"""
+    method, build_path = ENDPOINTS[endpoint]
+    clients = []
+    for n in range(concurrency):
+        username, deployment_ids = users[n % len(users)]
+        client = BenchmarkClient(port)
+        client.login(username, BENCH_PASSWORD)
+        clients.append((client, deployment_ids, random.Random(f"{seed_value}-{endpoint}-{n}")))
+
+    latencies = [[] for _ in clients]
+    statuses = [{} for _ in clients]
+    failures = [0] * len(clients)
+    issued = [0] * len(clients)
+    barrier = threading.Barrier(concurrency + 1)
+    timing = {}
+
+    def worker(n):
+        client, deployment_ids, rng = clients[n]
+        barrier.wait()
+        measure_from = timing['measure_from']
+        stop_at = timing['stop_at']
+        while True:
+            started = time.perf_counter()
+            if started >= stop_at:
+                break
+            try:
+                status = client.request(method, build_path(rng.choice(deployment_ids)))
+            except Exception as e:
+                logger.warning(f"Request failed: {e}")
+                status = None
+            elapsed = time.perf_counter() - started
+            issued[n] += 1
+            if started < measure_from:
+                continue
+            latencies[n].append(elapsed)
+            key = str(status) if status is not None else 'error'
+            statuses[n][key] = statuses[n].get(key, 0) + 1
+            if status is None or status >= 500:
+                failures[n] += 1
+
+    threads = [threading.Thread(target=worker, args=(n,), daemon=True) for n in range(concurrency)]
+    for thread in threads:
+        thread.start()
+
+    round_trips_before = db_server.round_trips
+    ssh_before = dict(ssh_backend.operations)
+    timing['measure_from'] = time.perf_counter() + warmup
+    timing['stop_at'] = timing['measure_from'] + duration
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    for client, _, _ in clients:
+        client.close()
+
+    total_issued = sum(issued)
+    all_latencies = [value for per_client in latencies for value in per_client]
+    status_counts = {}
+    for per_client in statuses:
+        for key, count in per_client.items():
+            status_counts[key] = status_counts.get(key, 0) + count
+    return {
+        'endpoint': endpoint,
+        'method': method,
+        'concurrency': concurrency,
+        'duration_s': duration,
+        'requests': len(all_latencies),
+        'errors': sum(failures),
+        'status_codes': status_counts,
+        'throughput_rps': round(len(all_latencies) / duration, 2),
+        'latency_ms': summarize_latencies(all_latencies),
+        # Per request over warmup + measured requests; includes background work they triggered
+        'db_round_trips_per_request': round((db_server.round_trips - round_trips_before) / max(total_issued, 1), 3),
+        'ssh_operations_per_request': {
+            operation: round((count - ssh_before[operation]) / max(total_issued, 1), 3)
+            for operation, count in ssh_backend.operations.items()
+        }
+    }
+
+def drain_jobs(db_manager, first_job_id):
+    """Wait for queued deployment jobs to finish and summarise those created since first_job_id"""
+    started = time.monotonic()
+    while time.monotonic() - started < JOB_DRAIN_TIMEOUT:
+        active = db_manager.execute_query("SELECT COUNT(*) AS count FROM jobs WHERE status IN (%s, %s)",
+                                          ('Pending', 'Running'), fetch_one=True, primary=True)['count']
+        if not active:
+            break
+        time.sleep(0.1)
+    drain_time = time.monotonic() - started
+
+    jobs = db_manager.execute_query("SELECT status, started_at, finished_at FROM jobs WHERE id >= %s",
+                                    (first_job_id,), fetch=True, primary=True)
+    counts = {}
+    durations = []
+    for job in jobs:
+        counts[job['status']] = counts.get(job['status'], 0) + 1
+        if job['started_at'] and job['finished_at']:
+            durations.append((job['finished_at'] - job['started_at']).total_seconds())
+    return {'drain_s': round(drain_time, 3), 'status_counts': counts, 'duration_ms': summarize_latencies(durations)}
+
+def next_job_id(db_manager):
+    row = db_manager.execute_query("SELECT COALESCE(MAX(id), 0) + 1 AS next_id FROM jobs", fetch_one=True, primary=True)
+    return row['next_id']
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def print_result(result):
+    latency = result['latency_ms']
+    ssh = sum(result['ssh_operations_per_request'].values())
+    click.echo(f"{result['endpoint']:<20} c={result['concurrency']:<4} {result['throughput_rps']:>9.1f} req/s  "
+               f"p50 {latency['p50'] or 0:>8.2f}ms  p95 {latency['p95'] or 0:>8.2f}ms  p99 {latency['p99'] or 0:>8.2f}ms  "
+               f"errors {result['errors']:<5} db {result['db_round_trips_per_request']:.2f}/req  ssh {ssh:.2f}/req")
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as f:
+        report = json.load(f)
+    baseline = {(r['endpoint'], r['concurrency']): r for r in report['results']}
+
+    def change(new, old):
+        return f"{(new - old) / old * 100:+.1f}%" if old else 'n/a'
+
+    click.echo(f"\nCompared with {baseline_path} (revision {report.get('revision')}):")
+    for result in results:
+        old = baseline.get((result['endpoint'], result['concurrency']))
+        if old is None:
+            continue
+        click.echo(f"{result['endpoint']:<20} c={result['concurrency']:<4} "
+                   f"throughput {change(result['throughput_rps'], old['throughput_rps']):>8}  "
+                   f"p95 {change(result['latency_ms']['p95'] or 0, old['latency_ms']['p95'] or 0):>8}  "
+                   f"db/req {change(result['db_round_trips_per_request'], old['db_round_trips_per_request']):>8}")
+
+@click.command()
+@click.option('--concurrency', '-c', type=int, multiple=True, default=(1, 8), show_default=True,
+              help='Concurrent clients; repeat for several levels')
+@click.option('--duration', type=float, default=10.0, show_default=True, help='Measured seconds per scenario')
+@click.option('--warmup', type=float, default=2.0, show_default=True, help='Unmeasured seconds before each scenario')
+@click.option('--endpoint', '-e', 'endpoints', type=click.Choice(list(ENDPOINTS)), multiple=True,
+              help='Endpoints to drive (default: all)')
+@click.option('--deployments', type=int, default=50, show_default=True, help='Deployments seeded per user')
+@click.option('--db-latency-ms', type=float, default=0.5, show_default=True, help='Simulated MySQL round trip')
+@click.option('--ssh-latency-ms', type=float, default=50.0, show_default=True, help='Simulated remote command runtime')
+@click.option('--seed', 'seed_value', type=int, default=1, show_default=True, help='Random seed for request targets')
+@click.option('--output', '-o', type=click.Path(dir_okay=False), help='Results file (default: benchmarks/results/)')
+@click.option('--compare', type=click.Path(exists=True, dir_okay=False), help='Earlier results file to compare with')
+@click.option('--verbose', is_flag=True, help='Show application logs')
+def main(concurrency, duration, warmup, endpoints, deployments, db_latency_ms, ssh_latency_ms,
+         seed_value, output, compare, verbose):
+    """Benchmark the Flask endpoints against fake MySQL and SSH backends"""
+    logging.basicConfig(level=logging.INFO if verbose else logging.WARNING)
+    # werkzeug raises its own logger to INFO for the request log
+    logging.getLogger('werkzeug').setLevel(logging.INFO if verbose else logging.WARNING)
+    endpoints = endpoints or tuple(ENDPOINTS)
+
+    ssh_backend = FakeSSHBackend(latency=ssh_latency_ms / 1000).start()
+    configure_environment(ssh_backend)
+    db_manager = install_fake_database(db_latency_ms / 1000)
+    users = seed(db_manager, ssh_backend, max(concurrency), deployments)
+
+    from werkzeug.serving import make_server
+    from app import create_app
+    app = create_app()
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, name='bench-http', daemon=True).start()
+    click.echo(f"🚀 Serving on 127.0.0.1:{server.server_port}, fake SSH on 127.0.0.1:{ssh_backend.port}")
+
+    results = []
+    try:
+        for endpoint in endpoints:
+            for level in concurrency:
+                first_job_id = next_job_id(db_manager) if endpoint == 'execute_deployment' else None
+                result = run_scenario(server.server_port, endpoint, level, users, duration, warmup,
+                                      seed_value, db_manager.server, ssh_backend)
+                if first_job_id is not None:
+                    result['jobs'] = drain_jobs(db_manager, first_job_id)
+                print_result(result)
+                results.append(result)
+    finally:
+        server.shutdown()
+        ssh_backend.stop()
+
+    report = {
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'parameters': {
+            'concurrency': list(concurrency),
+            'duration_s': duration,
+            'warmup_s': warmup,
+            'deployments_per_user': deployments,
+            'db_latency_ms': db_latency_ms,
+            'ssh_latency_ms': ssh_latency_ms,
+            'seed': seed_value
+        },
+        'results': results
+    }
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"bench-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+    click.echo(f"📄 Results written to {output}")
+
+    if compare:
+        print_comparison(results, compare)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""
+WSGI response compression with gzip and (when installed) brotli
+"""
+import gzip
+import zlib
+import logging
+from werkzeug.datastructures import Headers
+from werkzeug.http import parse_accept_header, parse_options_header
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Statuses whose bodies are empty or must not be re-encoded
+SKIPPED_STATUSES = {204, 206, 304}
+
+class CompressionMiddleware:
+    """Compresses eligible responses for clients that accept it
+
+    A response is eligible when its Content-Type is in the allowlist, it
+    isn't already encoded (pre-built assets are) and it doesn't opt out
+    with Cache-Control: no-transform. Eligible responses always get
+    Vary: Accept-Encoding. Buffered bodies are compressed only above
+    min_size; streamed bodies (no Content-Length) are compressed chunk by
+    chunk with a flush after each, so streamed pages still arrive
+    progressively. Strong ETags become weak on compressed responses, as
+    the bytes differ from the identity representation; If-None-Match uses
+    weak comparison, so revalidation keeps working.
+    """
+
+    def __init__(self, app, enabled=True, min_size=1024, mimetypes=(), gzip_level=6, brotli_quality=4):
+        self.app = app
+        self.enabled = enabled
+        self.min_size = min_size
+        self.mimetypes = frozenset(mimetypes)
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def negotiate(self, accept_encoding):
+        """Best encoding the client accepts: 'br', 'gzip' or None"""
+        accept = parse_accept_header(accept_encoding)
+        candidates = [('br', accept['br'])] if brotli is not None else []
+        candidates.append(('gzip', accept['gzip']))
+        # Quality first; brotli wins ties
+        encoding, quality = max(candidates, key=lambda c: c[1])
+        return encoding if quality > 0 else None
+
+    def _compressor(self, encoding):
+        if encoding == 'br':
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.flush, compressor.finish
+        # wbits 31 = gzip container
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+
+    def _compress(self, encoding, body):
+        if encoding == 'br':
+            return brotli.compress(body, quality=self.brotli_quality)
+        return gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+    def _stream(self, encoding, chunks):
+        compress, flush, finish = self._compressor(encoding)
+        for chunk in chunks:
+            if chunk:
+                yield compress(chunk) + flush()
+        yield finish()
+
+    def __call__(self, environ, start_response):
+        if not self.enabled:
+            return self.app(environ, start_response)
+
+        started = []
+
+        def capture(status, headers, exc_info=None):
+            started[:] = [status, headers, exc_info]
+            return written.append
+
+        written = []
+        app_iter = self.app(environ, capture)
+        chunks = iter(app_iter)
+        # start_response may legally be deferred until the first chunk
+        first = []
+        if not started:
+            for chunk in chunks:
+                first.append(chunk)
+                if started:
+                    break
+        status, header_list, exc_info = started
+        headers = Headers(header_list)
+        body = written + first
+
+        encoding = self._plan(environ, status, headers)
+        if encoding is None:
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return ClosingIterator(_chain(body, chunks), getattr(app_iter, 'close', None))
+
+        headers['Content-Encoding'] = encoding
+        etag = headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = f"W/{etag}"
+
+        length = headers.get('Content-Length')
+        if length is not None:
+            # Buffered response: compress it whole and keep an exact length
+            try:
+                compressed = self._compress(encoding, b''.join(_chain(body, chunks)))
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+            headers['Content-Length'] = str(len(compressed))
+            start_response(status, headers.to_wsgi_list(), exc_info)
+            return [compressed]
+
+        start_response(status, headers.to_wsgi_list(), exc_info)
+        return ClosingIterator(self._stream(encoding, _chain(body, chunks)), getattr(app_iter, 'close', None))
+
+    def _plan(self, environ, status, headers):
+        """Encoding to apply to this response, or None; adds Vary when eligible"""
+        if int(status[:3]) in SKIPPED_STATUSES or 'Content-Encoding' in headers:
+            return None
+        mimetype = parse_options_header(headers.get('Content-Type', ''))[0]
+        if mimetype not in self.mimetypes:
+            return None
+
+        vary = [v.strip() for v in headers.get('Vary', '').split(',') if v.strip()]
+        if 'accept-encoding' not in (v.lower() for v in vary):
+            headers['Vary'] = ', '.join(vary + ['Accept-Encoding'])
+
+        if environ['REQUEST_METHOD'] == 'HEAD' or 'no-transform' in headers.get('Cache-Control', ''):
+            return None
+        length = headers.get('Content-Length')
+        if length is not None and int(length) < self.min_size:
+            return None
+        return self.negotiate(environ.get('HTTP_ACCEPT_ENCODING', ''))
+
+def _chain(first, rest):
+    yield from first
+    yield from rest
@@ -24,9 +24,6 @@ class Config:
         'charset': 'utf8mb4',
         'collation': 'utf8mb4_unicode_ci',
         'autocommit': True,
-        'pool_name': 'hostinator_pool',
-        'pool_size': 10,
-        'pool_reset_session': True,
         'connect_timeout': int(os.getenv('MYSQL_CONNECT_TIMEOUT', '30')),
         'sql_mode': 'STRICT_TRANS_TABLES,NO_ZERO_DATE,NO_ZERO_IN_DATE,ERROR_FOR_DIVISION_BY_ZERO'
     }
@@ -36,7 +33,33 @@ class Config:
     for var in required_db_vars:
         if not os.getenv(var):
             raise ValueError(f"Required environment variable {var} is not set")
-    
+
+    # Connection pool sizing; the pool grows toward max_size under load and
+    # shrinks back to min_size as connections sit idle
+    DB_POOL_CONFIG = {
+        'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '20')),
+        'acquire_timeout': float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '10')),
+        'idle_timeout': int(os.getenv('DB_POOL_IDLE_TIMEOUT', '300')),
+        'max_lifetime': int(os.getenv('DB_POOL_MAX_LIFETIME', '3600')),
+        # Connections idle longer than this are pinged before reuse
+        'validate_idle': int(os.getenv('DB_POOL_VALIDATE_IDLE', '30'))
+    }
+
+    # Read replicas as "host[:port],host[:port]"; they share the primary's credentials
+    DB_REPLICA_HOSTS = [
+        (entry.partition(':')[0].strip(), int(entry.partition(':')[2] or os.getenv('DB_PORT', '3306')))
+        for entry in os.getenv('DB_REPLICA_HOSTS', '').split(',') if entry.strip()
+    ]
+
+    # Replica routing settings
+    DB_REPLICA_CONFIG = {
+        'max_lag': int(os.getenv('DB_REPLICA_MAX_LAG', '5')),
+        'health_interval': int(os.getenv('DB_REPLICA_HEALTH_INTERVAL', '10')),
+        # Seconds a session reads from the primary after it writes
+        'read_your_writes_window': int(os.getenv('DB_READ_YOUR_WRITES_WINDOW', '5'))
+    }
+
     # SSH Configuration for backend machine
     SSH_CONFIG = {
         'hostname': os.getenv('SSH_HOSTNAME'),
@@ -50,6 +73,113 @@ class Config:
     for var in required_ssh_vars:
         if not os.getenv(var):
             raise ValueError(f"Required environment variable {var} is not set")
+    
+    # Capacity of the default backend host registered from SSH_CONFIG
+    BACKEND_DEFAULT_CAPACITY = int(os.getenv('BACKEND_DEFAULT_CAPACITY', '100'))
+    
+    # Persistent SSH transport pool settings
+    SSH_POOL_CONFIG = {
+        'max_transports_per_host': int(os.getenv('SSH_POOL_MAX_TRANSPORTS', '4')),
+        'max_channels_per_transport': int(os.getenv('SSH_POOL_MAX_CHANNELS', '8')),
+        'keepalive_interval': int(os.getenv('SSH_POOL_KEEPALIVE', '30')),
+        'idle_timeout': int(os.getenv('SSH_POOL_IDLE_TIMEOUT', '300')),
+        'connect_timeout': int(os.getenv('SSH_CONNECT_TIMEOUT', '15')),
+        'acquire_timeout': float(os.getenv('SSH_POOL_ACQUIRE_TIMEOUT', '30'))
+    }
+    
+    # Background deployment job queue settings
+    JOB_QUEUE_CONFIG = {
+        'num_workers': int(os.getenv('JOB_WORKERS', '4')),
+        'max_pending': int(os.getenv('JOB_MAX_PENDING', '100')),
+        'stale_after': int(os.getenv('JOB_STALE_AFTER', '900'))
+    }
+    
+    # Live deployment output buffers
+    DEPLOYMENT_LOG_CONFIG = {
+        'max_chars_per_log': int(os.getenv('DEPLOYMENT_LOG_MAX_CHARS', '262144')),
+        'max_logs': int(os.getenv('DEPLOYMENT_LOG_MAX_LOGS', '200')),
+        'retention': int(os.getenv('DEPLOYMENT_LOG_RETENTION', '3600'))
+    }
+    
+    # asyncio SSH backend settings
+    ASYNC_SSH_CONFIG = {
+        'max_workers': int(os.getenv('ASYNC_SSH_MAX_WORKERS', '32')),
+        'max_concurrency_per_host': int(os.getenv('ASYNC_SSH_MAX_PER_HOST', '16'))
+    }
+    
+    # Dashboard aggregate cache
+    DASHBOARD_SUMMARY_CONFIG = {
+        'ttl': int(os.getenv('DASHBOARD_SUMMARY_TTL', '30')),
+        'max_users': int(os.getenv('DASHBOARD_SUMMARY_MAX_USERS', '10000'))
+    }
+    
+    # Background health probing; /health endpoints serve the cached result
+    HEALTH_CHECK_CONFIG = {
+        'interval': int(os.getenv('HEALTH_CHECK_INTERVAL', '5')),
+        # Readiness fails when the last completed probe is older than this
+        'stale_after': int(os.getenv('HEALTH_CHECK_STALE_AFTER', '30')),
+        'probe_timeout': int(os.getenv('HEALTH_PROBE_TIMEOUT', '5')),
+        'saturation_threshold': float(os.getenv('HEALTH_POOL_SATURATION', '0.9')),
+        'slow_probe': float(os.getenv('HEALTH_SLOW_PROBE', '1.0'))
+    }
+    
+    # Bearer token required by /metrics; unset leaves the endpoint open
+    METRICS_TOKEN = os.getenv('METRICS_TOKEN')
+    
+    # Remote credentials file cache
+    CREDENTIALS_CACHE_CONFIG = {
+        'ttl': int(os.getenv('CREDENTIALS_CACHE_TTL', '600')),
+        'max_entries': int(os.getenv('CREDENTIALS_CACHE_MAX_ENTRIES', '500'))
+    }
+
+    # Rendered dashboard/deployment page cache
+    FRAGMENT_CACHE_CONFIG = {
+        'max_bytes': int(os.getenv('FRAGMENT_CACHE_MAX_BYTES', str(32 * 1024 * 1024))),
+        # Bounds staleness from writes made by other worker processes
+        'ttl': int(os.getenv('FRAGMENT_CACHE_TTL', '30')),
+        'max_versions': int(os.getenv('FRAGMENT_CACHE_MAX_VERSIONS', '100000'))
+    }
+
+    # Server-side sessions: "sqlite" (shared by the workers on one host), "memory"
+    # (single process only) or "cookie" (Flask's signed cookies, for multi-host setups)
+    SESSION_CONFIG = {
+        'backend': os.getenv('SESSION_BACKEND', 'sqlite'),
+        # Idle lifetime in seconds; activity extends it
+        'ttl': int(os.getenv('SESSION_TTL', str(7 * 24 * 3600))),
+        'max_entries': int(os.getenv('SESSION_MAX_ENTRIES', '10000')),
+        'sqlite_path': os.getenv('SESSION_SQLITE_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'instance', 'sessions.sqlite3'))
+    }
+
+    # Response compression middleware
+    COMPRESSION_CONFIG = {
+        'enabled': os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true',
+        # Buffered bodies smaller than this aren't worth the CPU or the header overhead
+        'min_size': int(os.getenv('COMPRESSION_MIN_SIZE', '1024')),
+        'mimetypes': ('text/html', 'text/css', 'text/plain', 'text/javascript', 'application/javascript',
+                      'application/json', 'application/xml', 'image/svg+xml'),
+        'gzip_level': int(os.getenv('COMPRESSION_GZIP_LEVEL', '6')),
+        'brotli_quality': int(os.getenv('COMPRESSION_BROTLI_QUALITY', '4'))
+    }
+
+    # Stream the dashboard HTML as it renders instead of buffering the whole page
+    DASHBOARD_STREAMING = os.getenv('DASHBOARD_STREAMING', 'false').lower() == 'true'
+
+    # Static asset build; see `flask assets build`
+    ASSET_CONFIG = {
+        'source_dir': os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static'),
+        'output_dir': os.getenv('ASSET_OUTPUT_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'dist')),
+        # Set to false while editing CSS/JS to serve the source files directly
+        'enabled': os.getenv('ASSETS_ENABLED', 'true').lower() == 'true',
+        'max_age': int(os.getenv('ASSET_MAX_AGE', '31536000'))
+    }
+
+    # Marketplace catalog data file and vendored logo directory
+    MARKETPLACE_CONFIG = {
+        'catalog_file': os.getenv('MARKETPLACE_CATALOG_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'marketplace.json')),
+        'logo_dir': os.getenv('MARKETPLACE_LOGO_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'img', 'marketplace')),
+        # Seconds between checks of the data file for edits
+        'reload_interval': int(os.getenv('MARKETPLACE_RELOAD_INTERVAL', '30'))
+    }
 
 class DevelopmentConfig(Config):
     """Development configuration"""
@@ -0,0 +1,85 @@
+"""
+In-process cache for remote credentials file contents
+"""
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+
+class CredentialsCache:
+    """TTL + LRU cache that keeps entries encrypted in memory"""
+
+    def __init__(self, ttl=600, max_entries=500):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._fernet = None
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _cipher(self):
+        if self._fernet is None:
+            # Deferred so importing the cache doesn't load cryptography at boot
+            from cryptography.fernet import Fernet
+            with self._lock:
+                if self._fernet is None:
+                    # Per-process key: cached secrets never outlive the process that read them
+                    self._fernet = Fernet(Fernet.generate_key())
+        return self._fernet
+
+    def get(self, key):
+        """Return the cached plaintext for key, or None on miss/expiry"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            token, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return self._cipher().decrypt(token).decode('utf-8')
+
+    def set(self, key, value, ttl=None):
+        token = self._cipher().encrypt(value.encode('utf-8'))
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (token, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
+
+# Global credentials cache instance
+credentials_cache = CredentialsCache(**Config.CREDENTIALS_CACHE_CONFIG)
@@ -2,38 +2,370 @@
 Database connection and query management
 """
 import mysql.connector
-from mysql.connector import pooling
 from contextlib import contextmanager
 import re
 import logging
+import threading
+import time
+from collections import deque
+import weakref
+import contextvars
 from datetime import datetime
 from config import Config
+from db_replicas import ReplicaSelector, build_replicas
+from metrics import metrics, statement_label, DB_QUERY_DURATION, DB_QUERY_ERRORS
 
 logger = logging.getLogger(__name__)
 
+# MySQL error raised when a cached prepared statement no longer exists server-side
+ER_UNKNOWN_STMT_HANDLER = 1243
+
+# Key (usually the user id) identifying whose reads must see their own writes
+_session_key = contextvars.ContextVar('db_session_key', default=None)
+
+# Prune expired read-your-writes pins once this many are held
+MAX_PRIMARY_PINS = 10000
+
+# Rows per multi-row INSERT; keeps each statement well under max_allowed_packet
+BULK_BATCH_SIZE = 1000
+
+IDENTIFIER_REGEX = re.compile(r'^[a-zA-Z0-9_]+$')
+
+class PoolTimeout(mysql.connector.errors.PoolError):
+    """Raised when no connection frees up within the acquire timeout"""
+
+class _PooledSlot:
+    """A physical connection plus the bookkeeping the pool keeps for it"""
+    __slots__ = ('conn', 'created_at', 'idle_since', 'checked_out_at')
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.created_at = time.monotonic()
+        self.idle_since = self.created_at
+        self.checked_out_at = None
+
+class ConnectionPool:
+    """Blocking MySQL connection pool that grows under load and shrinks when idle
+
+    Sessions are not reset on check-in so prepared statements cached on a
+    connection survive between checkouts; open transactions are rolled back.
+    """
+
+    def __init__(self, name, db_config, min_size=2, max_size=20, acquire_timeout=10,
+                 idle_timeout=300, max_lifetime=3600, validate_idle=30):
+        self.name = name
+        self.db_config = db_config
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.idle_timeout = idle_timeout
+        self.max_lifetime = max_lifetime
+        self.validate_idle = validate_idle
+        # Most recently used at the right; idle expiry trims from the left
+        self._idle = deque()
+        self._in_use = {}
+        self._size = 0
+        self._waiting = 0
+        self._cond = threading.Condition()
+        self._metrics = {
+            'acquired': 0,
+            'released': 0,
+            'timeouts': 0,
+            'waits': 0,
+            'wait_time_total': 0.0,
+            'wait_time_max': 0.0,
+            'checkout_time_total': 0.0,
+            'checkout_time_max': 0.0,
+            'peak_in_use': 0,
+            'created': 0,
+            'closed': 0,
+            'connect_failures': 0,
+            'validation_failures': 0,
+            'discarded': 0
+        }
+
+    def _connect(self):
+        try:
+            conn = mysql.connector.connect(**self.db_config)
+        except mysql.connector.Error:
+            with self._cond:
+                self._metrics['connect_failures'] += 1
+            raise
+        with self._cond:
+            self._metrics['created'] += 1
+        return _PooledSlot(conn)
+
+    def open_unpooled(self):
+        """A connection with the pool's settings that doesn't count toward max_size"""
+        return self._connect().conn
+
+    def _close(self, slot):
+        try:
+            slot.conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._metrics['closed'] += 1
+
+    def _validate(self, slot, now):
+        """Ping only connections that sat idle long enough to have been dropped"""
+        if now - slot.created_at > self.max_lifetime:
+            return False
+        if now - slot.idle_since < self.validate_idle:
+            return True
+        try:
+            slot.conn.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+    def _expire_idle_locked(self, now):
+        """Pop idle connections past idle_timeout while the pool is above min_size"""
+        expired = []
+        while self._idle and self._size > self.min_size and now - self._idle[0].idle_since > self.idle_timeout:
+            expired.append(self._idle.popleft())
+            self._size -= 1
+        return expired
+
+    def acquire(self, timeout=None):
+        """Check out a connection, waiting up to timeout seconds for one to free up"""
+        timeout = self.acquire_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        waited = False
+
+        while True:
+            slot = None
+            with self._cond:
+                while True:
+                    if self._idle:
+                        slot = self._idle.pop()
+                        break
+                    if self._size < self.max_size:
+                        # Reserve the slot so concurrent callers don't overshoot max_size
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"No connection available in pool {self.name} after {timeout}s "
+                            f"({self._size} open, {len(self._in_use)} in use)"
+                        )
+                    if not waited:
+                        waited = True
+                        self._metrics['waits'] += 1
+                    self._waiting += 1
+                    self._cond.wait(remaining)
+                    self._waiting -= 1
+
+            if slot is None:
+                try:
+                    slot = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+            elif not self._validate(slot, time.monotonic()):
+                with self._cond:
+                    self._size -= 1
+                    self._metrics['validation_failures'] += 1
+                self._close(slot)
+                continue
+            break
+
+        now = time.monotonic()
+        wait_time = now - started
+        with self._cond:
+            slot.checked_out_at = now
+            self._in_use[id(slot.conn)] = slot
+            metrics = self._metrics
+            metrics['acquired'] += 1
+            metrics['wait_time_total'] += wait_time
+            metrics['wait_time_max'] = max(metrics['wait_time_max'], wait_time)
+            metrics['peak_in_use'] = max(metrics['peak_in_use'], len(self._in_use))
+        return slot.conn
+
+    def release(self, conn, discard=False):
+        """Return a connection; discard drops it instead of reusing it"""
+        with self._cond:
+            slot = self._in_use.pop(id(conn), None)
+        if slot is None:
+            return
+
+        if not discard:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except mysql.connector.Error:
+                discard = True
+
+        now = time.monotonic()
+        checkout_time = now - slot.checked_out_at
+        with self._cond:
+            metrics = self._metrics
+            metrics['released'] += 1
+            metrics['checkout_time_total'] += checkout_time
+            metrics['checkout_time_max'] = max(metrics['checkout_time_max'], checkout_time)
+            if discard or now - slot.created_at > self.max_lifetime:
+                if discard:
+                    metrics['discarded'] += 1
+                self._size -= 1
+                expired = [slot]
+            else:
+                slot.idle_since = now
+                self._idle.append(slot)
+                expired = []
+            expired.extend(self._expire_idle_locked(now))
+            self._cond.notify()
+
+        for stale in expired:
+            self._close(stale)
+
+    @contextmanager
+    def connection(self, timeout=None):
+        conn = self.acquire(timeout)
+        discard = False
+        try:
+            yield conn
+        except (mysql.connector.InterfaceError, mysql.connector.OperationalError):
+            # The session may be broken; don't hand it to the next caller
+            discard = True
+            raise
+        finally:
+            self.release(conn, discard=discard)
+
+    def warm(self):
+        """Open connections up to min_size"""
+        while True:
+            with self._cond:
+                if self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                slot = self._connect()
+            except Exception:
+                with self._cond:
+                    self._size -= 1
+                raise
+            with self._cond:
+                self._idle.appendleft(slot)
+                self._cond.notify()
+
+    def close_all(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+        for slot in idle:
+            self._close(slot)
+
+    def stats(self):
+        """Pool size, saturation, wait/checkout timings and connection churn"""
+        with self._cond:
+            metrics = dict(self._metrics)
+            in_use = len(self._in_use)
+            metrics.update({
+                'name': self.name,
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': in_use,
+                'waiting': self._waiting,
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'saturation': in_use / self.max_size if self.max_size else 0.0
+            })
+        metrics['wait_time_avg'] = metrics['wait_time_total'] / (metrics['acquired'] or 1)
+        metrics['checkout_time_avg'] = metrics['checkout_time_total'] / (metrics['released'] or 1)
+        return metrics
+
+class UnitOfWork:
+    """Statements run on one primary connection and committed together"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self._cursors = {}
+
+    def _cursor(self, as_tuple):
+        cursor = self._cursors.get(as_tuple)
+        if cursor is None:
+            cursor = self.conn.cursor(buffered=True, dictionary=not as_tuple)
+            self._cursors[as_tuple] = cursor
+        return cursor
+
+    def execute(self, query, params=None, fetch=False, fetch_one=False, as_tuple=False):
+        cursor = self._cursor(as_tuple)
+        with DB_QUERY_DURATION.time(statement_label(query)):
+            cursor.execute(query, params or ())
+        if fetch_one:
+            rows = cursor.fetchall()
+            return rows[0] if rows else None
+        if fetch:
+            return cursor.fetchall()
+        return cursor.lastrowid or cursor.rowcount
+
+    def execute_many(self, query, seq_params, batch_size=BULK_BATCH_SIZE):
+        """Run a statement for every parameter tuple, batch_size tuples per round trip
+
+        INSERT ... VALUES statements are sent as one multi-row INSERT per batch.
+        Returns the number of affected rows.
+        """
+        cursor = self._cursor(True)
+        label = statement_label(query)
+        total = 0
+        batch = []
+        for params in seq_params:
+            batch.append(params)
+            if len(batch) >= batch_size:
+                with DB_QUERY_DURATION.time(label):
+                    cursor.executemany(query, batch)
+                total += cursor.rowcount
+                batch = []
+        if batch:
+            with DB_QUERY_DURATION.time(label):
+                cursor.executemany(query, batch)
+            total += cursor.rowcount
+        return total
+
+    def close(self):
+        for cursor in self._cursors.values():
+            try:
+                cursor.close()
+            except mysql.connector.Error:
+                pass
+        self._cursors.clear()
+
 class DatabaseManager:
     """Database connection and query management"""
     
     def __init__(self):
-        self.connection_pool = None
-        self.initialize_pool()
+        # Connections open on first use, so importing this module does no I/O
+        self.connection_pool = self.create_pool('primary', Config.DB_CONFIG)
+        # Named statements, prepared once per pooled connection on first use
+        self.statements = {}
+        self._cursor_caches = weakref.WeakKeyDictionary()
+        self._cursor_caches_lock = threading.Lock()
+        # Reads go to replicas when configured; writers are pinned to the primary briefly
+        self.replicas = ReplicaSelector(
+            build_replicas(Config.DB_CONFIG, Config.DB_REPLICA_HOSTS, self.create_pool),
+            max_lag=Config.DB_REPLICA_CONFIG['max_lag'],
+            health_interval=Config.DB_REPLICA_CONFIG['health_interval']
+        )
+        self.read_your_writes_window = Config.DB_REPLICA_CONFIG['read_your_writes_window']
+        self._primary_pins = {}
+        self._primary_pins_lock = threading.Lock()
     
-    def initialize_pool(self):
-        """Initialize database connection pool"""
+    def check_connection(self):
+        """Open one connection to the server, logging diagnostics on failure"""
         try:
-            # First test basic connection without pool
             logger.info("🔍 Testing basic MySQL connection...")
-            test_config = {k: v for k, v in Config.DB_CONFIG.items() 
-                           if k not in ['pool_name', 'pool_size', 'pool_reset_session', 'database']}
+            test_config = {k: v for k, v in Config.DB_CONFIG.items() if k != 'database'}
             test_conn = mysql.connector.connect(**test_config)
             test_conn.close()
-            logger.info("✅ Basic MySQL connection successful")
-            
-            # Now create the connection pool
-            self.connection_pool = mysql.connector.pooling.MySQLConnectionPool(**Config.DB_CONFIG)
-            logger.info(f"✅ Database pool created successfully - Connected to {Config.DB_CONFIG['host']}:{Config.DB_CONFIG['port']}")
+            logger.info(f"✅ Basic MySQL connection successful - Connected to {Config.DB_CONFIG['host']}:{Config.DB_CONFIG['port']}")
         except mysql.connector.Error as err:
-            logger.error(f"❌ Failed to create database pool: {err}")
+            logger.error(f"❌ Failed to connect to MySQL: {err}")
             logger.error(f"🔍 Error code: {err.errno}")
             logger.error(f"🔍 SQL State: {err.sqlstate}")
             if err.errno == 1045:
@@ -41,67 +373,256 @@ class DatabaseManager:
                 logger.error("    1. Username and password are correct")
                 logger.error("    2. MySQL user has permission to connect from this IP")
                 logger.error("    3. MySQL server allows remote connections")
-            self.connection_pool = None
-        except Exception as e:
-            logger.error(f"❌ Unexpected error creating database pool: {e}")
-            self.connection_pool = None
+            raise
     
     @contextmanager
-    def get_connection(self):
-        """Context manager for database connections with automatic cleanup"""
+    def get_connection(self, read_only=False):
+        """Context manager for database connections with automatic cleanup
+
+        read_only connections come from a healthy replica when one is available
+        and the current session has not written recently; otherwise the primary.
+        """
+        pool = None
         connection = None
+        replica = self.replicas.choose() if read_only and not self.is_pinned() else None
+        if replica is not None:
+            try:
+                connection = replica.pool.acquire()
+                pool = replica.pool
+            except mysql.connector.Error as err:
+                replica.mark_down(err)
+                logger.warning(f"⚠️ Replica {replica.name} unavailable, reading from primary: {err}")
+        
+        discard = False
         try:
-            if self.connection_pool is None:
-                raise Exception("Database pool not initialized")
-            
-            connection = self.connection_pool.get_connection()
-            if connection.is_connected():
-                yield connection
-            else:
-                raise Exception("Failed to get database connection")
+            if connection is None:
+                pool = self.connection_pool
+                connection = pool.acquire()
+            yield connection
+        except (mysql.connector.InterfaceError, mysql.connector.OperationalError) as err:
+            # Connection-level failure; don't return the session to the pool
+            logger.error(f"Database error: {err}")
+            discard = True
+            raise
         except mysql.connector.Error as err:
             logger.error(f"Database error: {err}")
             raise
         finally:
-            if connection and connection.is_connected():
-                connection.close()
+            if connection is not None:
+                if discard:
+                    self._drop_cursor_cache(connection)
+                pool.release(connection, discard=discard)
+    
+    @staticmethod
+    def create_pool(name, db_config):
+        """Connection pool sized by DB_POOL_CONFIG"""
+        return ConnectionPool(name, db_config, **Config.DB_POOL_CONFIG)
+    
+    def pool_stats(self):
+        """Metrics for the primary pool and every replica pool that has been opened"""
+        pools = [self.connection_pool] + [replica.pool for replica in self.replicas.replicas if replica.pool]
+        return [pool.stats() for pool in pools]
+    
+    def bind_session(self, key):
+        """Attribute queries in the current context to a session; returns a reset token"""
+        return _session_key.set(key)
+    
+    def unbind_session(self, token):
+        _session_key.reset(token)
+    
+    @contextmanager
+    def session_scope(self, key, pin=False):
+        """Bind a session for the duration of a block, optionally reading from the primary throughout"""
+        token = self.bind_session(key)
+        try:
+            if pin:
+                self.pin_to_primary()
+            yield
+        finally:
+            self.unbind_session(token)
+    
+    def pin_to_primary(self):
+        """Send the current session's reads to the primary for the read-your-writes window
+
+        Pins live in this process only. Reads of state written elsewhere (job
+        status from worker processes) must pass primary=True instead.
+        """
+        key = _session_key.get()
+        if key is None or not self.replicas.replicas:
+            return
+        now = time.monotonic()
+        with self._primary_pins_lock:
+            self._primary_pins[key] = now + self.read_your_writes_window
+            if len(self._primary_pins) > MAX_PRIMARY_PINS:
+                self._primary_pins = {k: v for k, v in self._primary_pins.items() if v > now}
+    
+    def is_pinned(self):
+        key = _session_key.get()
+        if key is None:
+            return False
+        with self._primary_pins_lock:
+            expires = self._primary_pins.get(key)
+            if expires is None:
+                return False
+            if expires > time.monotonic():
+                return True
+            del self._primary_pins[key]
+            return False
+    
+    def register_statement(self, name, query):
+        """Register a named statement for execute_statement"""
+        # The prepared cursor only reuses a statement when handed the same string object
+        self.statements[name] = query
+        return name
+    
+    def _cursor_cache(self, conn):
+        """Cursors kept for reuse on a pooled connection"""
+        with self._cursor_caches_lock:
+            cache = self._cursor_caches.get(conn)
+            if cache is None:
+                cache = {}
+                self._cursor_caches[conn] = cache
+            return cache
+    
+    def _drop_cursor_cache(self, conn):
+        with self._cursor_caches_lock:
+            self._cursor_caches.pop(conn, None)
+    
+    @staticmethod
+    def _finish(conn, cursor, fetch, fetch_one):
+        """Collect the result; reads skip commit, and so do writes under autocommit"""
+        if fetch_one:
+            rows = cursor.fetchall()
+            return rows[0] if rows else None
+        if fetch:
+            return cursor.fetchall()
+        result = cursor.lastrowid or cursor.rowcount
+        if not Config.DB_CONFIG.get('autocommit'):
+            conn.commit()
+        return result
     
-    def execute_query(self, query, params=None, fetch=False, fetch_one=False):
-        """Execute a database query with proper error handling"""
+    def execute_query(self, query, params=None, fetch=False, fetch_one=False, as_tuple=False, primary=False):
+        """Execute a database query with proper error handling
+
+        Reads may be served by a replica; pass primary=True when a read must be current.
+        """
+        read_only = (fetch or fetch_one) and not primary
+        label = statement_label(query)
+        started = time.perf_counter()
         try:
-            with self.get_connection() as conn:
-                cursor = conn.cursor(dictionary=True)
+            with self.get_connection(read_only=read_only) as conn:
+                cache = self._cursor_cache(conn)
+                key = 'tuple' if as_tuple else 'dict'
+                cursor = cache.get(key)
+                if cursor is None:
+                    cursor = conn.cursor(buffered=True, dictionary=not as_tuple)
+                    cache[key] = cursor
                 cursor.execute(query, params or ())
-                
-                if fetch_one:
-                    result = cursor.fetchone()
-                elif fetch:
-                    result = cursor.fetchall()
-                else:
-                    result = cursor.lastrowid or cursor.rowcount
-                
-                conn.commit()
-                cursor.close()
-                return result
+                result = self._finish(conn, cursor, fetch, fetch_one)
+            if not (fetch or fetch_one):
+                self.pin_to_primary()
+            return result
         except mysql.connector.Error as err:
+            DB_QUERY_ERRORS.inc(label)
             logger.error(f"Query execution failed: {err}")
             logger.error(f"Query: {query}")
             logger.error(f"Params: {params}")
             raise
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, label)
     
-    def initialize_database(self):
-        """Initialize database tables and sample data"""
+    def execute_statement(self, name, params=None, fetch=False, fetch_one=False, as_tuple=False, primary=False):
+        """Execute a registered statement as a server-side prepared statement"""
+        query = self.statements[name]
+        read_only = (fetch or fetch_one) and not primary
+        started = time.perf_counter()
         try:
+            with self.get_connection(read_only=read_only) as conn:
+                cache = self._cursor_cache(conn)
+                key = (name, as_tuple)
+                for attempt in range(2):
+                    cursor = cache.get(key)
+                    if cursor is None:
+                        cursor = conn.cursor(prepared=True, dictionary=not as_tuple)
+                        cache[key] = cursor
+                    try:
+                        cursor.execute(query, params or ())
+                        result = self._finish(conn, cursor, fetch, fetch_one)
+                        break
+                    except mysql.connector.Error as err:
+                        # The session lost its prepared statements (e.g. reconnect); prepare again
+                        if err.errno != ER_UNKNOWN_STMT_HANDLER or attempt:
+                            raise
+                        self._drop_cursor_cache(conn)
+                        cache = self._cursor_cache(conn)
+            if not (fetch or fetch_one):
+                self.pin_to_primary()
+            return result
+        except mysql.connector.Error as err:
+            DB_QUERY_ERRORS.inc(name)
+            logger.error(f"Statement execution failed: {err}")
+            logger.error(f"Statement: {name}")
+            logger.error(f"Params: {params}")
+            raise
+        finally:
+            DB_QUERY_DURATION.observe(time.perf_counter() - started, name)
+    
+    @contextmanager
+    def transaction(self):
+        """Unit of work: statements share one primary connection and one commit
+
+        Rolls back if the block raises.
+        """
+        with self.get_connection() as conn:
+            conn.start_transaction()
+            uow = UnitOfWork(conn)
+            try:
+                yield uow
+                conn.commit()
+            except Exception as e:
+                logger.error(f"Transaction rolled back: {e}")
+                try:
+                    conn.rollback()
+                except mysql.connector.Error:
+                    # The pool discards connections left mid-transaction
+                    pass
+                raise
+            finally:
+                uow.close()
+        self.pin_to_primary()
+    
+    def execute_many(self, query, seq_params, batch_size=BULK_BATCH_SIZE):
+        """Run a statement for many parameter tuples in one transaction"""
+        with self.transaction() as uow:
+            return uow.execute_many(query, seq_params, batch_size)
+    
+    def bulk_insert(self, table, columns, rows, batch_size=BULK_BATCH_SIZE, ignore=False):
+        """Insert rows with multi-row INSERTs, returning the number inserted
+
+        ignore=True skips rows that collide with an existing unique key.
+        """
+        for identifier in (table, *columns):
+            if not IDENTIFIER_REGEX.match(identifier):
+                raise ValueError(f"Invalid identifier: {identifier}")
+        query = "INSERT {}INTO `{}` ({}) VALUES ({})".format(
+            'IGNORE ' if ignore else '',
+            table,
+            ', '.join(f"`{column}`" for column in columns),
+            ', '.join(['%s'] * len(columns))
+        )
+        return self.execute_many(query, rows, batch_size)
+    
+    def initialize_database(self, target=None):
+        """Create the database, apply schema migrations and seed sample data"""
+        try:
+            self.check_connection()
+            
             # First, create the database if it doesn't exist
             temp_config = Config.DB_CONFIG.copy()
             db_name = temp_config.pop('database', None)
             charset = temp_config.pop('charset', 'utf8mb4')
             collation = temp_config.pop('collation', 'utf8mb4_unicode_ci')
             
-            temp_config.pop('pool_name', None)
-            temp_config.pop('pool_size', None)
-            temp_config.pop('pool_reset_session', None)
-            
             # Create database
             try:
                 temp_conn = mysql.connector.connect(**temp_config)
@@ -120,57 +641,24 @@ class DatabaseManager:
                 logger.info(f"✅ Database '{db_name}' ensured to exist")
             except mysql.connector.Error as err:
                 logger.error(f"❌ Failed to create database: {err}")
-                return
+                raise
 
-            self._create_tables()
+            # Deferred import: migrator depends on this module's db_manager
+            from migrator import migrator
+            migrator.upgrade(target=target)
             self._create_sample_data()
+            self.connection_pool.warm()
 
         except Exception as err:
             logger.error(f"❌ Database initialization failed: {err}")
             raise
     
-    def _create_tables(self):
-        """Create database tables"""
-        # Create users table
-        users_table = """
-        CREATE TABLE IF NOT EXISTS users (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            username VARCHAR(255) UNIQUE NOT NULL,
-            password TEXT NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
-        ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
-        """
-        self.execute_query(users_table)
-        logger.info("✅ Users table created/verified")
-
-        # Create deployments table
-        deployments_table = """
-        CREATE TABLE IF NOT EXISTS deployments (
-            id INT AUTO_INCREMENT PRIMARY KEY,
-            name VARCHAR(255) NOT NULL,
-            email VARCHAR(255) NOT NULL,
-            status VARCHAR(50) NOT NULL,
-            deployment_type VARCHAR(100) NOT NULL,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-            credentials_file TEXT,
-            user_id INT,
-            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
-            INDEX idx_user_id (user_id),
-            INDEX idx_status (status),
-            INDEX idx_deployment_type (deployment_type)
-        ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
-        """
-        self.execute_query(deployments_table)
-        logger.info("✅ Deployments table created/verified")
-    
     def _create_sample_data(self):
         """Create sample data if not exists"""
         from werkzeug.security import generate_password_hash
         
         # Check if admin user exists
-        admin_user = self.execute_query("SELECT id FROM users WHERE username = %s", ('admin',), fetch_one=True)
+        admin_user = self.execute_query("SELECT id FROM users WHERE username = %s", ('admin',), fetch_one=True, primary=True)
         
         if not admin_user:
             # Create admin user
@@ -184,10 +672,21 @@ class DatabaseManager:
             logger.info(f"✅ Admin user exists with ID: {admin_id}")
 
         # Check if sample deployments exist
-        existing_deployments = self.execute_query("SELECT COUNT(*) as count FROM deployments", fetch_one=True)
+        existing_deployments = self.execute_query("SELECT COUNT(*) as count FROM deployments", fetch_one=True, primary=True)
         
         if existing_deployments['count'] == 0:
             self._create_sample_deployments(admin_id)
+
+        # Register the configured SSH backend as the default host
+        existing_hosts = self.execute_query("SELECT COUNT(*) as count FROM backend_hosts", fetch_one=True, primary=True)
+        
+        if existing_hosts['count'] == 0:
+            self.execute_query('''
+            INSERT INTO backend_hosts (name, hostname, port, username, capacity, labels)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ''', ('default', Config.SSH_CONFIG['hostname'], Config.SSH_CONFIG['port'],
+                  Config.SSH_CONFIG['username'], Config.BACKEND_DEFAULT_CAPACITY, '*'))
+            logger.info("✅ Default backend host registered")
     
     def _create_sample_deployments(self, admin_id):
         """Create sample deployments"""
@@ -204,15 +703,34 @@ class DatabaseManager:
             ('jupyter-notebook.com', 'jupyter@example.com', 'Active', 'Jupyter', now, now, '/home/jupyter-notebook.com/credentials_jupyter-notebook.com.txt', admin_id)  
         ]
         
-        insert_query = """
-        INSERT INTO deployments (name, email, status, deployment_type, created_at, last_updated, credentials_file, user_id)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        for deployment in sample_deployments:
-            self.execute_query(insert_query, deployment)
+        self.bulk_insert(
+            'deployments',
+            ('name', 'email', 'status', 'deployment_type', 'created_at', 'last_updated', 'credentials_file', 'user_id'),
+            sample_deployments
+        )
         
         logger.info(f"✅ {len(sample_deployments)} sample deployments created")
 
 # Global database manager instance
 db_manager = DatabaseManager()
+
+def _pool_samples(*keys):
+    """Scrape-time samples of pool stats, labelled by pool (and key when several)"""
+    def collect():
+        for stats in db_manager.pool_stats():
+            for key in keys:
+                labels = (stats['name'], key) if len(keys) > 1 else (stats['name'],)
+                yield labels, stats[key]
+    return collect
+
+metrics.callback('hostinator_db_pool_connections', 'Connections by pool and state',
+                 ('pool', 'state'), _pool_samples('size', 'idle', 'in_use', 'waiting'))
+metrics.callback('hostinator_db_pool_saturation', 'Share of max_size checked out',
+                 ('pool',), _pool_samples('saturation'))
+metrics.callback('hostinator_db_pool_wait_seconds_total', 'Time spent waiting for a connection',
+                 ('pool',), _pool_samples('wait_time_total'), 'counter')
+metrics.callback('hostinator_db_pool_checkout_seconds_total', 'Time connections spent checked out',
+                 ('pool',), _pool_samples('checkout_time_total'), 'counter')
+metrics.callback('hostinator_db_pool_events_total', 'Pool acquisitions, timeouts and connection churn',
+                 ('pool', 'event'), _pool_samples('acquired', 'timeouts', 'created', 'closed',
+                                                   'validation_failures', 'discarded'), 'counter')
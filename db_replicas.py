@@ -0,0 +1,123 @@
+"""
+Read replica pools, health checking and selection
+"""
+import itertools
+import threading
+import time
+import logging
+import mysql.connector
+
+logger = logging.getLogger(__name__)
+
+class Replica:
+    """One read replica with its own connection pool and last known health"""
+
+    def __init__(self, name, db_config, pool_factory):
+        self.name = name
+        self.db_config = db_config
+        self.pool_factory = pool_factory
+        self.pool = None
+        self.healthy = False
+        self.lag = None
+        self.last_checked = 0
+        self.last_error = None
+
+    def ensure_pool(self):
+        if self.pool is None:
+            self.pool = self.pool_factory(f"replica {self.name}", self.db_config)
+        return self.pool
+
+    def check(self):
+        """Probe connectivity and replication lag"""
+        self.last_checked = time.monotonic()
+        try:
+            with self.ensure_pool().connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    cursor.execute("SHOW REPLICA STATUS")
+                except mysql.connector.Error:
+                    # Servers older than MySQL 8.0.22
+                    cursor.execute("SHOW SLAVE STATUS")
+                status = cursor.fetchone()
+                cursor.close()
+
+            if status is None:
+                # Not configured as a replica (e.g. a read-only clone); treat as current
+                self.lag = 0
+            else:
+                lag = status.get('Seconds_Behind_Source', status.get('Seconds_Behind_Master'))
+                self.lag = int(lag) if lag is not None else None
+            self.healthy = self.lag is not None
+            self.last_error = None if self.healthy else 'Replication is not running'
+        except Exception as e:
+            self.healthy = False
+            self.lag = None
+            self.last_error = str(e)
+            logger.warning(f"⚠️ Replica {self.name} health check failed: {e}")
+        return self.healthy
+
+    def mark_down(self, error):
+        self.healthy = False
+        self.last_error = str(error)
+
+class ReplicaSelector:
+    """Round-robin over healthy replicas whose lag is within max_lag"""
+
+    def __init__(self, replicas, max_lag=5, health_interval=10):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.health_interval = health_interval
+        self._cycle = itertools.cycle(replicas) if replicas else None
+        self._lock = threading.Lock()
+        self._checker = None
+
+    def start(self):
+        """Run health checks in a background thread"""
+        if not self.replicas:
+            return
+        with self._lock:
+            if self._checker is not None:
+                return
+            self._checker = threading.Thread(target=self._check_loop, name='replica-health', daemon=True)
+            self._checker.start()
+
+    def _check_loop(self):
+        while True:
+            self.check_all()
+            time.sleep(self.health_interval)
+
+    def check_all(self):
+        for replica in self.replicas:
+            replica.check()
+
+    def usable(self, replica):
+        return replica.healthy and replica.lag is not None and replica.lag <= self.max_lag
+
+    def choose(self):
+        """Next usable replica, or None to fall back to the primary"""
+        if not self.replicas:
+            return None
+        self.start()
+        with self._lock:
+            for _ in range(len(self.replicas)):
+                replica = next(self._cycle)
+                if self.usable(replica):
+                    return replica
+        return None
+
+    def status(self):
+        return [{
+            'name': replica.name,
+            'healthy': replica.healthy,
+            'lag': replica.lag,
+            'usable': self.usable(replica),
+            'error': replica.last_error
+        } for replica in self.replicas]
+
+def build_replicas(primary_config, replica_hosts, pool_factory):
+    """Create Replica objects sharing the primary's settings except host and port"""
+    replicas = []
+    for host, port in replica_hosts:
+        db_config = dict(primary_config, host=host, port=port)
+        replicas.append(Replica(f"{host}:{port}", db_config, pool_factory))
+    return replicas
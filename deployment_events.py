@@ -0,0 +1,85 @@
+"""
+Append-only deployment status event log and its incremental change feed
+"""
+from database import db_manager
+
+DEFAULT_EVENT_LIMIT = 100
+MAX_EVENT_LIMIT = 500
+
+INSERT_EVENT = """
+INSERT INTO deployment_events (deployment_id, user_id, status, occurred_at, seq)
+VALUES (%s, %s, %s, %s, %s)
+"""
+
+UPSERT_SEQUENCE = """
+INSERT INTO deployment_event_sequences (user_id, last_seq) VALUES (%s, %s)
+ON DUPLICATE KEY UPDATE last_seq = last_seq + VALUES(last_seq)
+"""
+
+class DeploymentEventLog:
+    """Records every status transition and serves them back by per-user sequence number"""
+
+    def _allocate(self, uow, user_id, count):
+        """Reserve count sequence numbers for a user; returns the first
+
+        The upsert creates or bumps the user's sequence row in one atomic
+        statement and holds its row lock until the caller's transaction
+        commits, so a later number can never become visible before an
+        earlier one. Unlike AUTO_INCREMENT ids, which are handed out at
+        INSERT time and can commit out of order, a cursor over these never
+        skips an event.
+        """
+        uow.execute(UPSERT_SEQUENCE, (user_id, count))
+        row = uow.execute("SELECT last_seq FROM deployment_event_sequences WHERE user_id = %s",
+                          (user_id,), fetch_one=True)
+        return row['last_seq'] - count + 1
+
+    def record(self, uow, deployment_id, user_id, status, occurred_at):
+        """Append one event inside the caller's transaction"""
+        seq = self._allocate(uow, user_id, 1)
+        return uow.execute(INSERT_EVENT, (deployment_id, user_id, status, occurred_at, seq))
+
+    def record_many(self, uow, deployment_ids, user_id, status, occurred_at):
+        """Append the same transition for many deployments in one multi-row INSERT"""
+        deployment_ids = list(deployment_ids)
+        if not deployment_ids:
+            return 0
+        first = self._allocate(uow, user_id, len(deployment_ids))
+        return uow.execute_many(INSERT_EVENT, [(id, user_id, status, occurred_at, first + n)
+                                               for n, id in enumerate(deployment_ids)])
+
+    def fetch(self, user_id, after=0, limit=DEFAULT_EVENT_LIMIT, deployment_id=None):
+        """Return a user's events with seq greater than the cursor, oldest first.
+
+        The cursor is the seq of the last event the client has seen, so each
+        poll is a range scan on (user_id, seq) that returns only what changed.
+        Reads go to the primary: a lagging replica would only delay events,
+        never reorder them, but the feed exists to be prompt.
+        """
+        limit = max(1, min(int(limit), MAX_EVENT_LIMIT))
+        conditions = ["user_id = %s", "seq > %s"]
+        params = [user_id, after]
+
+        if deployment_id is not None:
+            conditions.append("deployment_id = %s")
+            params.append(deployment_id)
+
+        # Fetch one extra row to learn whether the client should poll again at once
+        rows = db_manager.execute_query(f'''
+        SELECT id, seq, deployment_id, status, occurred_at
+        FROM deployment_events
+        WHERE {' AND '.join(conditions)}
+        ORDER BY seq
+        LIMIT %s
+        ''', tuple(params) + (limit + 1,), fetch=True, primary=True)
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return {
+            'events': rows,
+            'cursor': rows[-1]['seq'] if rows else after,
+            'has_more': has_more
+        }
+
+# Global deployment event log instance
+deployment_events = DeploymentEventLog()
@@ -0,0 +1,69 @@
+"""
+Keyset-paginated deployment listings
+"""
+import base64
+import json
+from datetime import datetime
+from database import db_manager
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+# Columns the listings render; credentials_file is reduced to a flag
+LIST_COLUMNS = """
+id, name, email, status, deployment_type, created_at, last_updated,
+credentials_file IS NOT NULL AS has_credentials
+"""
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+def encode_cursor(deployment):
+    """Opaque cursor pointing just after the given row"""
+    payload = json.dumps([deployment['created_at'].isoformat(), deployment['id']])
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    try:
+        created_at, deployment_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(created_at), int(deployment_id)
+    except (ValueError, TypeError, UnicodeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+def list_deployments(user_id, cursor=None, limit=DEFAULT_PAGE_SIZE, status=None, deployment_type=None):
+    """Return one page of a user's deployments, newest first.
+
+    Pages are addressed by (created_at, id) of the last row seen, so each
+    page is an index range scan on idx_user_created regardless of how many
+    deployments the user has.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    conditions = ["user_id = %s"]
+    params = [user_id]
+
+    if status:
+        conditions.append("status = %s")
+        params.append(status)
+    if deployment_type:
+        conditions.append("deployment_type = %s")
+        params.append(deployment_type)
+    if cursor:
+        created_at, deployment_id = decode_cursor(cursor)
+        conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+        params.extend([created_at, created_at, deployment_id])
+
+    # Fetch one extra row to learn whether another page exists
+    rows = db_manager.execute_query(f'''
+    SELECT {LIST_COLUMNS}
+    FROM deployments
+    WHERE {' AND '.join(conditions)}
+    ORDER BY created_at DESC, id DESC
+    LIMIT %s
+    ''', tuple(params) + (limit + 1,), fetch=True)
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'deployments': rows,
+        'next_cursor': encode_cursor(rows[-1]) if has_more else None
+    }
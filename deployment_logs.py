@@ -0,0 +1,107 @@
+"""
+Bounded in-memory buffers for live deployment script output
+"""
+import threading
+import time
+from collections import deque, OrderedDict
+from config import Config
+
+class OutputRingBuffer:
+    """Keeps the most recent max_chars of a stream, addressed by absolute offset"""
+
+    def __init__(self, max_chars=262144, owner_id=None):
+        self.max_chars = max_chars
+        self.owner_id = owner_id
+        self.start_offset = 0
+        self.end_offset = 0
+        self.complete = False
+        self.updated_at = time.monotonic()
+        self._chunks = deque()
+        self._lock = threading.Lock()
+
+    def append(self, text):
+        if not text:
+            return
+        with self._lock:
+            if len(text) > self.max_chars:
+                # Only the tail of an oversized chunk can ever be read back
+                self.start_offset += len(text) - self.max_chars
+                self.end_offset += len(text) - self.max_chars
+                text = text[-self.max_chars:]
+            self._chunks.append(text)
+            self.end_offset += len(text)
+            self.updated_at = time.monotonic()
+
+            overflow = (self.end_offset - self.start_offset) - self.max_chars
+            while overflow > 0:
+                head = self._chunks[0]
+                if len(head) <= overflow:
+                    self._chunks.popleft()
+                    self.start_offset += len(head)
+                    overflow -= len(head)
+                else:
+                    self._chunks[0] = head[overflow:]
+                    self.start_offset += overflow
+                    overflow = 0
+
+    def read(self, offset=0, limit=None):
+        """Return output from offset onwards and the offset to resume from"""
+        with self._lock:
+            truncated = offset < self.start_offset
+            offset = min(max(offset, self.start_offset), self.end_offset)
+            text = ''.join(self._chunks)[offset - self.start_offset:]
+            if limit is not None:
+                text = text[:limit]
+            return {
+                'output': text,
+                'offset': offset + len(text),
+                'truncated': truncated,
+                'complete': self.complete
+            }
+
+    def tail(self):
+        with self._lock:
+            return ''.join(self._chunks)
+
+    def close(self):
+        with self._lock:
+            self.complete = True
+            self.updated_at = time.monotonic()
+
+class DeploymentLogStore:
+    """Per-deployment output buffers with a bounded count and retention"""
+
+    def __init__(self, max_chars_per_log=262144, max_logs=200, retention=3600):
+        self.max_chars_per_log = max_chars_per_log
+        self.max_logs = max_logs
+        self.retention = retention
+        self._logs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def open(self, deployment_id, owner_id=None):
+        """Start a fresh buffer for a deployment run"""
+        buffer = OutputRingBuffer(self.max_chars_per_log, owner_id=owner_id)
+        with self._lock:
+            self._logs.pop(deployment_id, None)
+            self._logs[deployment_id] = buffer
+            self._prune()
+        return buffer
+
+    def get(self, deployment_id):
+        with self._lock:
+            return self._logs.get(deployment_id)
+
+    def discard(self, deployment_id):
+        with self._lock:
+            self._logs.pop(deployment_id, None)
+
+    def _prune(self):
+        now = time.monotonic()
+        for deployment_id, buffer in list(self._logs.items()):
+            if buffer.complete and now - buffer.updated_at > self.retention:
+                del self._logs[deployment_id]
+        while len(self._logs) > self.max_logs:
+            self._logs.popitem(last=False)
+
+# Global deployment log store instance
+deployment_logs = DeploymentLogStore(**Config.DEPLOYMENT_LOG_CONFIG)
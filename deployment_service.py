@@ -1,19 +1,35 @@
 """
 Deployment management service
 """
+import asyncio
 import logging
 import shlex  # [SECURITY] Import shlex for shell sanitization
 from datetime import datetime
 from ssh_manager import SSHManager
+from async_ssh import AsyncSSHManager
+from credentials_cache import credentials_cache
+from backend_scheduler import backend_scheduler
 from config import Config
 
 logger = logging.getLogger(__name__)
 
+# Structured exit codes for batched container actions
+EXIT_COMPOSE_MISSING = 100
+EXIT_SCRIPT_MISSING = 101
+
+# Prefix for per-target result markers in bulk action output
+BULK_MARKER = '__HOSTINATOR_BULK__'
+
 class DeploymentService:
     """Service for managing deployments"""
     
     def __init__(self):
+        # Managers for the default SSH_CONFIG host; other backends are created on demand
         self.ssh_manager = SSHManager(Config.SSH_CONFIG)
+        self.async_ssh_manager = AsyncSSHManager(Config.SSH_CONFIG)
+        self.scheduler = backend_scheduler
+        self._host_managers = {}
+        self.credentials_cache = credentials_cache
         # Updated script paths to use setup_service directory
         self.script_mapping = {
             'WordPress': 'setup_wp.sh',
@@ -39,8 +55,37 @@ class DeploymentService:
             'Jupyter': 'delete_jupyter.sh'
         }
     
-    def execute_deployment_script(self, domain, email, deployment_type):
-        """Execute deployment script for given parameters"""
+    def ssh_manager_for(self, backend_host_id=None):
+        """SSHManager for a backend host (None is the default SSH_CONFIG host)"""
+        if backend_host_id is None:
+            return self.ssh_manager
+        return self._managers_for(backend_host_id)[0]
+    
+    def async_ssh_manager_for(self, backend_host_id=None):
+        """AsyncSSHManager for a backend host (None is the default SSH_CONFIG host)"""
+        if backend_host_id is None:
+            return self.async_ssh_manager
+        return self._managers_for(backend_host_id)[1]
+    
+    def _managers_for(self, backend_host_id):
+        ssh_config = self.scheduler.ssh_config_for(backend_host_id)
+        managers = self._host_managers.get(backend_host_id)
+        if managers is None or managers[0].ssh_config != ssh_config:
+            managers = (SSHManager(ssh_config), AsyncSSHManager(ssh_config))
+            self._host_managers[backend_host_id] = managers
+        return managers
+    
+    def execute_deployment_script(self, domain, email, deployment_type, log=None,
+                                  deployment_id=None, backend_host_id=None):
+        """Execute deployment script for given parameters.
+        
+        When a log buffer is given, script output is streamed into it as it
+        arrives and the returned output is the buffer's bounded tail.
+        
+        A deployment without a backend host is placed by the scheduler, which
+        records the chosen host on the deployments row; the host id is
+        returned as 'backend_host_id'.
+        """
         try:
             if deployment_type not in self.script_mapping:
                 return {
@@ -58,21 +103,35 @@ class DeploymentService:
             # [SECURITY] Use sanitized variables in f-string
             command = f"cd ~ && ./{script_name} {safe_domain} {safe_email}"
             
-            result = self.ssh_manager.execute_command(command)
+            if backend_host_id is None and deployment_id is not None:
+                backend_host_id = self.scheduler.place(deployment_id, deployment_type)['id']
+            ssh_manager = self.ssh_manager_for(backend_host_id)
+            
+            try:
+                if log is None:
+                    result = ssh_manager.execute_command(command)
+                else:
+                    result = self._stream_to_log(ssh_manager, command, log)
+            finally:
+                # The script rewrites the credentials file; drop copies read (and
+                # re-cached by page views) while it was still running
+                self.invalidate_credentials(self.credentials_path(domain))
             
             if result['success']:
-                credentials_file = f"/home/{domain}/credentials_{domain}.txt"
+                credentials_file = self.credentials_path(domain)
                 
                 return {
                     'success': True,
                     'output': result['output'],
-                    'credentials_file': credentials_file
+                    'credentials_file': credentials_file,
+                    'backend_host_id': backend_host_id
                 }
             else:
                 return {
                     'success': False,
                     'output': result['output'],
-                    'credentials_file': None
+                    'credentials_file': None,
+                    'backend_host_id': backend_host_id
                 }
                 
         except Exception as e:
@@ -82,109 +141,229 @@ class DeploymentService:
                 'credentials_file': None
             }
     
-    def execute_container_action(self, domain, action, deployment_type):
+    def _stream_to_log(self, ssh_manager, command, log):
+        """Run a command, appending its output to a log buffer as it arrives"""
+        saw_stderr = False
+        exit_status = None
+        try:
+            for stream, data in ssh_manager.stream_command(command):
+                if stream == 'exit':
+                    exit_status = data
+                else:
+                    saw_stderr = saw_stderr or stream == 'stderr'
+                    log.append(data)
+        except Exception as e:
+            log.append(f"\nSSH Error: {str(e)}")
+            return {'success': False, 'output': log.tail()}
+        finally:
+            log.close()
+        
+        output = log.tail()
+        if exit_status != 0 and saw_stderr:
+            return {'success': False, 'output': output}
+        return {'success': True, 'output': output if output else "Command executed successfully"}
+    
+    def execute_container_action(self, domain, action, deployment_type, backend_host_id=None):
         """Execute container actions with proper timeout handling for delete operations"""
         try:
-            if action == 'stop':
-                return self._stop_container(domain)
-            elif action == 'start':
-                return self._start_container(domain)
-            elif action == 'delete':
-                return self._delete_container(domain, deployment_type)
-            else:
-                return {
-                    'success': False,
-                    'output': f"Action {action} not supported"
-                }
+            command = self._action_command(domain, action, deployment_type)
+            if command is None:
+                return self._unsupported_action(action)
+            
+            if action == 'delete':
+                self.invalidate_credentials(self.credentials_path(domain))
+            
+            # Precondition check and action run as one remote invocation
+            ssh_manager = self.ssh_manager_for(backend_host_id)
+            result = ssh_manager.execute_command(command, timeout=self._action_timeout(action))
+            return self._action_result(domain, action, deployment_type, result['exit_status'], result['output'], result['success'])
         except Exception as e:
             return {
                 'success': False,
                 'output': f"Error: {str(e)}"
             }
     
-    def _stop_container(self, domain):
-        """Stop container for domain"""
-        # [SECURITY] Sanitize domain
-        safe_domain = shlex.quote(domain)
+    def execute_bulk_action(self, action, targets):
+        """Run one container action across many deployments, one SSH session per backend host.
         
-        # [SECURITY] Use sanitized domain
-        check_command = f"test -f /home/{safe_domain}/docker-compose.yml && echo 'exists' || echo 'not found'"
-        check_result = self.ssh_manager.execute_command(check_command)
+        targets is a list of (deployment_id, domain, deployment_type,
+        backend_host_id) tuples. Returns a dict mapping each deployment id
+        to its {'success', 'output'} result; domains needn't be unique.
+        """
+        by_host = {}
+        for deployment_id, domain, deployment_type, backend_host_id in targets:
+            by_host.setdefault(backend_host_id, []).append((deployment_id, domain, deployment_type))
         
-        if 'not found' in check_result.get('output', ''):
-            return {
-                'success': False,
-                'output': f"docker-compose.yml not found for {domain}"
-            }
+        results = {}
+        for backend_host_id, host_targets in by_host.items():
+            try:
+                ssh_manager = self.ssh_manager_for(backend_host_id)
+            except Exception as e:
+                for deployment_id, _, _ in host_targets:
+                    results[deployment_id] = {'success': False, 'output': f"Error: {str(e)}"}
+                continue
+            results.update(self._bulk_action_on_host(ssh_manager, action, host_targets))
+        return results
+    
+    def _bulk_action_on_host(self, ssh_manager, action, targets):
+        results = {}
+        snippets = []
+        for deployment_id, domain, deployment_type in targets:
+            command = self._action_command(domain, action, deployment_type)
+            if command is None:
+                results[deployment_id] = self._unsupported_action(action)
+                continue
+            if action == 'delete':
+                self.invalidate_credentials(self.credentials_path(domain))
+            # [SECURITY] Domain is only emitted in quoted form; the id is an int
+            safe_domain = shlex.quote(domain)
+            snippets.append(
+                f"echo {BULK_MARKER}BEGIN {int(deployment_id)} {safe_domain}; "
+                f"( {command} ) 2>&1; "
+                f"echo {BULK_MARKER}END {int(deployment_id)} $?"
+            )
         
-        # [SECURITY] Use sanitized domain
-        command = f"cd /home/{safe_domain} && docker-compose stop"
-        result = self.ssh_manager.execute_command(command)
+        if not snippets:
+            return results
         
-        return {
-            'success': result['success'],
-            'output': result['output']
-        }
+        result = ssh_manager.execute_command('\n'.join(snippets), timeout=self._action_timeout(action))
+        if result['exit_status'] is None:
+            # The session itself failed; every target shares the error
+            for deployment_id, _, _ in targets:
+                results.setdefault(deployment_id, {'success': False, 'output': result['output']})
+            return results
+        
+        # Output is attributed by the id in each marker, which stays unambiguous
+        # when two deployments share a domain
+        by_id = {deployment_id: (domain, deployment_type) for deployment_id, domain, deployment_type in targets}
+        current, lines = None, []
+        for line in result['output'].splitlines():
+            if line.startswith(f"{BULK_MARKER}BEGIN "):
+                marker = line.split(' ', 2)[1]
+                current, lines = (int(marker) if marker.isdigit() else None), []
+            elif line.startswith(f"{BULK_MARKER}END ") and current is not None:
+                exit_status = int(line.rsplit(' ', 1)[1])
+                output = '\n'.join(lines) or "Command executed successfully"
+                domain, deployment_type = by_id.get(current, (None, None))
+                results[current] = self._action_result(domain, action, deployment_type, exit_status, output, exit_status == 0)
+                current = None
+            elif current is not None:
+                lines.append(line)
+        
+        for deployment_id, _, _ in targets:
+            results.setdefault(deployment_id, {'success': False, 'output': 'No result returned from backend server'})
+        return results
     
-    def _start_container(self, domain):
-        """Start container for domain"""
+    def _action_command(self, domain, action, deployment_type):
+        """Shell snippet that checks the action's precondition and runs it.
+        
+        Exits with EXIT_COMPOSE_MISSING/EXIT_SCRIPT_MISSING when the
+        precondition fails, so no separate check round trip is needed.
+        """
         # [SECURITY] Sanitize domain
         safe_domain = shlex.quote(domain)
         
-        # [SECURITY] Use sanitized domain
-        check_command = f"test -f /home/{safe_domain}/docker-compose.yml && echo 'exists' || echo 'not found'"
-        check_result = self.ssh_manager.execute_command(check_command)
+        if action in ('stop', 'start'):
+            # [SECURITY] Use sanitized domain
+            return (f"test -f /home/{safe_domain}/docker-compose.yml || exit {EXIT_COMPOSE_MISSING}; "
+                    f"cd /home/{safe_domain} && docker-compose {action}")
         
-        if 'not found' in check_result.get('output', ''):
+        if action == 'delete':
+            if deployment_type not in self.delete_script_mapping:
+                return None
+            script_name = self.delete_script_mapping[deployment_type]
+            
+            # Execute delete script with force kill if stuck (60 second limit + cleanup)
+            # [SECURITY] Use sanitized domain in command
+            return (f"test -f ~/{script_name} || exit {EXIT_SCRIPT_MISSING}; "
+                    f"timeout 60 bash -c 'cd ~ && ./{script_name} {safe_domain}' || (echo 'Delete operation timed out but continuing cleanup' && pkill -f '{script_name}' 2>/dev/null; rm -rf /home/{safe_domain} 2>/dev/null; echo 'Forced cleanup completed')")
+        
+        return None
+    
+    @staticmethod
+    def _action_timeout(action):
+        return 90 if action == 'delete' else 300
+    
+    def _unsupported_action(self, action):
+        if action == 'delete':
             return {
                 'success': False,
-                'output': f"docker-compose.yml not found for {domain}"
+                'output': "Deployment type not supported for deletion"
             }
-        
-        # [SECURITY] Use sanitized domain
-        command = f"cd /home/{safe_domain} && docker-compose start"
-        result = self.ssh_manager.execute_command(command)
-        
         return {
-            'success': result['success'],
-            'output': result['output']
+            'success': False,
+            'output': f"Action {action} not supported"
         }
     
-    def _delete_container(self, domain, deployment_type):
-        """Delete container and cleanup"""
-        if deployment_type not in self.delete_script_mapping:
+    def _action_result(self, domain, action, deployment_type, exit_status, output, success):
+        """Map a structured exit status to the action result dict"""
+        if exit_status == EXIT_COMPOSE_MISSING:
             return {
                 'success': False,
-                'output': "Deployment type not supported for deletion"
+                'output': f"docker-compose.yml not found for {domain}"
             }
-        
-        script_name = self.delete_script_mapping[deployment_type]
-        
-        # [SECURITY] Sanitize inputs
-        safe_domain = shlex.quote(domain)
-        
-        # Check if script exists with shorter timeout (10 seconds)
-        check_command = f"test -f ~/{script_name} && echo 'exists' || echo 'not found'"
-        check_result = self.ssh_manager.execute_command(check_command, timeout=10)
-        
-        if 'not found' in check_result.get('output', ''):
+        if exit_status == EXIT_SCRIPT_MISSING:
             return {
                 'success': False,
-                'output': f"Delete script {script_name} not found on backend server"
+                'output': f"Delete script {self.delete_script_mapping.get(deployment_type)} not found on backend server"
             }
-        
-        # Execute delete script with force kill if stuck (60 second limit + cleanup)
-        # [SECURITY] Use sanitized domain in command
-        command = f"timeout 60 bash -c 'cd ~ && ./{script_name} {safe_domain}' || (echo 'Delete operation timed out but continuing cleanup' && pkill -f '{script_name}' 2>/dev/null; rm -rf /home/{safe_domain} 2>/dev/null; echo 'Forced cleanup completed')"
-        result = self.ssh_manager.execute_command(command, timeout=90)
-        
         return {
-            'success': result['success'],
-            'output': result['output']
+            'success': success,
+            'output': output
         }
     
-    def read_credentials_file(self, file_path):
-        """Read credentials file from remote server"""
+    @staticmethod
+    def credentials_path(domain):
+        """Remote path of the credentials file written by the setup scripts"""
+        return f"/home/{domain}/credentials_{domain}.txt"
+    
+    def read_credentials_file(self, file_path, backend_host_id=None):
+        """Read credentials file from remote server, served from cache when fresh"""
         # [SECURITY] Note: file_path here comes from database (which we trust more than user input), 
         # but paramiko sftp handles paths safely as string literals, not shell commands.
-        return self.ssh_manager.read_remote_file(file_path)
+        cached = self.credentials_cache.get(file_path)
+        if cached is not None:
+            return cached
+        
+        content = self.ssh_manager_for(backend_host_id).read_remote_file(file_path)
+        if content:
+            self.credentials_cache.set(file_path, content)
+        return content
+    
+    def run_commands(self, commands, timeout=300, backend_host_id=None):
+        """Run independent remote commands concurrently, returning results in order"""
+        async_ssh_manager = self.async_ssh_manager_for(backend_host_id)
+        
+        async def gather():
+            return await asyncio.gather(*(
+                async_ssh_manager.execute_command(command, timeout=timeout) for command in commands
+            ))
+        return asyncio.run(gather())
+    
+    def read_credentials_files(self, file_paths, backend_host_id=None):
+        """Read many credentials files concurrently, returning {path: content}"""
+        async_ssh_manager = self.async_ssh_manager_for(backend_host_id)
+        contents = {}
+        missing = []
+        for file_path in file_paths:
+            cached = self.credentials_cache.get(file_path)
+            if cached is not None:
+                contents[file_path] = cached
+            elif file_path:
+                missing.append(file_path)
+        
+        async def gather():
+            return await asyncio.gather(*(
+                async_ssh_manager.read_remote_file(file_path) for file_path in missing
+            ))
+        
+        for file_path, content in zip(missing, asyncio.run(gather()) if missing else []):
+            if content:
+                self.credentials_cache.set(file_path, content)
+            contents[file_path] = content
+        return contents
+    
+    def invalidate_credentials(self, file_path):
+        """Drop a cached credentials file after it changes or is removed"""
+        if file_path:
+            self.credentials_cache.invalidate(file_path)
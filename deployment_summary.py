@@ -0,0 +1,91 @@
+"""
+Per-user deployment aggregates for the dashboard
+"""
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from database import db_manager
+
+class DeploymentSummaryCache:
+    """Caches GROUP BY aggregates per user until a write invalidates them
+
+    Each invalidation bumps the user's version, and a computed summary is
+    only stored if the version it was read at is still current, so a write
+    that lands mid-compute can't leave stale counts cached.
+    """
+
+    def __init__(self, ttl=30, max_users=10000):
+        # The TTL bounds staleness from writes made by other worker processes
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries = OrderedDict()
+        self._versions = OrderedDict()
+        self._counter = 0
+        # Version of users whose counter was pruned; always newer than anything they had cached
+        self._floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        """Return the dashboard summary for a user, computing it on a miss"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and time.monotonic() < entry[1]:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+            # Read the version before the data so a concurrent write orphans this result
+            version = self._versions.get(user_id, self._floor)
+
+        summary = self.compute(user_id)
+        with self._lock:
+            if self._versions.get(user_id, self._floor) != version:
+                return summary
+            self._entries[user_id] = (summary, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+        return summary
+
+    @staticmethod
+    def compute(user_id):
+        """Aggregate status counts and the per-type histogram in one query"""
+        rows = db_manager.execute_query('''
+        SELECT status, deployment_type, COUNT(*) as count
+        FROM deployments
+        WHERE user_id = %s
+        GROUP BY status, deployment_type
+        ''', (user_id,), fetch=True)
+
+        summary = {
+            'total_deployments': 0,
+            'active_deployments': 0,
+            'inactive_deployments': 0,
+            'pending_deployments': 0,
+            'deployment_types': {}
+        }
+        for row in rows:
+            count = row['count']
+            summary['total_deployments'] += count
+            status_key = f"{row['status'].lower()}_deployments"
+            if status_key in summary:
+                summary[status_key] += count
+            deployment_types = summary['deployment_types']
+            deployment_types[row['deployment_type']] = deployment_types.get(row['deployment_type'], 0) + count
+        return summary
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+            self._counter += 1
+            self._versions[user_id] = self._counter
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.max_users:
+                _, pruned = self._versions.popitem(last=False)
+                self._floor = max(self._floor, pruned)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+# Global deployment summary cache instance
+deployment_summary = DeploymentSummaryCache(**Config.DASHBOARD_SUMMARY_CONFIG)
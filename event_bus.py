@@ -0,0 +1,79 @@
+"""
+In-process publish/subscribe for deployment status events
+"""
+import queue
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+class Subscription:
+    """A subscriber's bounded inbox for one channel"""
+
+    def __init__(self, bus, channel, max_events=100):
+        self.bus = bus
+        self.channel = channel
+        self.events = queue.Queue(maxsize=max_events)
+        self.dropped = False
+
+    def get(self, timeout=None):
+        """Wait for the next event, returning None on timeout"""
+        try:
+            return self.events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+class EventBus:
+    """Fan out published events to every subscriber of a channel"""
+
+    def __init__(self):
+        self._subscribers = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, channel):
+        subscription = Subscription(self, channel)
+        with self._lock:
+            self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.channel)
+            if subscribers:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._subscribers[subscription.channel]
+
+    def publish(self, channel, event):
+        """Deliver an event to current subscribers without blocking the publisher"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            try:
+                subscription.events.put_nowait(event)
+            except queue.Full:
+                # Slow consumer; it will resync from the database
+                subscription.dropped = True
+        return len(subscribers)
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscribers.get(channel, ()))
+            return sum(len(s) for s in self._subscribers.values())
+
+def deployment_channel(deployment_id):
+    """Channel name for a deployment's status events"""
+    return f"deployment:{deployment_id}"
+
+# Global event bus instance
+event_bus = EventBus()
@@ -0,0 +1,186 @@
+"""
+Rendered page cache keyed by user and a per-user deployments version
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Iterator
+from flask import request, session, Response
+from config import Config
+from auth import current_user
+
+class FragmentCache:
+    """LRU cache of rendered pages, valid until the owner's deployments change
+
+    Every deployment write bumps the owner's version, which orphans their
+    cached pages. Versions are per process, so entries also expire after
+    ttl to bound staleness from writes handled by other worker processes.
+    """
+
+    def __init__(self, max_bytes=33554432, ttl=30, max_versions=100000):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.max_versions = max_versions
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._versions = OrderedDict()
+        self._counter = 0
+        # Version of users whose counter was pruned; always newer than anything they had cached
+        self._floor = 0
+        self._fernet = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _cipher(self):
+        if self._fernet is None:
+            from cryptography.fernet import Fernet
+            with self._lock:
+                if self._fernet is None:
+                    # Per-process key, as in CredentialsCache
+                    self._fernet = Fernet(Fernet.generate_key())
+        return self._fernet
+
+    def version(self, user_id):
+        with self._lock:
+            return self._versions.get(user_id, self._floor)
+
+    def bump(self, user_id):
+        """Invalidate every page cached for a user"""
+        with self._lock:
+            self._counter += 1
+            self._versions[user_id] = self._counter
+            self._versions.move_to_end(user_id)
+            while len(self._versions) > self.max_versions:
+                _, pruned = self._versions.popitem(last=False)
+                self._floor = max(self._floor, pruned)
+
+    def get(self, user_id, key):
+        """Return (etag, body) if a current page is cached, else None"""
+        with self._lock:
+            entry = self._entries.get((user_id, key))
+            current = self._versions.get(user_id, self._floor)
+            if entry is None or entry['version'] != current or time.monotonic() >= entry['expires_at']:
+                self.misses += 1
+                return None
+            self._entries.move_to_end((user_id, key))
+            self.hits += 1
+        body = entry['body']
+        if entry['sensitive']:
+            body = self._cipher().decrypt(body)
+        return entry['etag'], body
+
+    def set(self, user_id, key, version, body, sensitive=False):
+        """Store a page rendered from data read at the given version; returns its etag"""
+        etag = hashlib.sha1(body).hexdigest()[:20]
+        stored = self._cipher().encrypt(body) if sensitive else body
+        with self._lock:
+            previous = self._entries.pop((user_id, key), None)
+            if previous is not None:
+                self._bytes -= len(previous['body'])
+            self._entries[(user_id, key)] = {
+                'version': version,
+                'expires_at': time.monotonic() + self.ttl,
+                'etag': etag,
+                'body': stored,
+                'sensitive': sensitive
+            }
+            self._bytes += len(stored)
+            while self._bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted['body'])
+                self.evictions += 1
+        return etag
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions
+            }
+
+# Global fragment cache instance
+fragment_cache = FragmentCache(**Config.FRAGMENT_CACHE_CONFIG)
+
+# Characters of template output gathered before a streamed chunk is sent
+STREAM_CHUNK_SIZE = 4096
+
+def _page_response(etag, body):
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    # Pages are per user; browsers revalidate with If-None-Match on every load
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def _streamed_page(user_id, key, version, chunks, sensitive):
+    """Send template output as it renders; cache the page once it has all been sent
+
+    There is no ETag on this response since it depends on the whole body;
+    the next request is served from cache with one.
+    """
+    def generate():
+        parts = []
+        pending = []
+        pending_size = 0
+        for chunk in chunks:
+            pending.append(chunk)
+            pending_size += len(chunk)
+            if pending_size >= STREAM_CHUNK_SIZE:
+                text = ''.join(pending)
+                parts.append(text)
+                pending, pending_size = [], 0
+                yield text
+        text = ''.join(pending)
+        parts.append(text)
+        yield text
+        fragment_cache.set(user_id, key, version, ''.join(parts).encode('utf-8'), sensitive=sensitive)
+
+    response = Response(generate(), mimetype='text/html')
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def cached_page(key, render, sensitive=False):
+    """Serve the logged-in user's page for key from cache, or render and cache it
+
+    render() returns the page HTML, or an iterator of HTML chunks (e.g.
+    from stream_template) to stream it, to make it cacheable; any other
+    return value (a redirect, an error page response) is passed through
+    uncached. A request with flash messages pending always renders, since
+    the page shows them. [SECURITY] Pages holding secrets pass
+    sensitive=True and are kept encrypted in memory.
+    """
+    user_id = current_user.id
+    if session.get('_flashes'):
+        page = render()
+        # Rendering pops the flashes, so it must finish before the session is saved
+        return ''.join(page) if isinstance(page, Iterator) else page
+
+    cached = fragment_cache.get(user_id, key)
+    if cached is not None:
+        return _page_response(*cached)
+
+    # Read the version before the data so a concurrent write orphans this render
+    version = fragment_cache.version(user_id)
+    page = render()
+    if isinstance(page, Iterator):
+        return _streamed_page(user_id, key, version, page, sensitive)
+    if not isinstance(page, str):
+        return page
+    body = page.encode('utf-8')
+    return _page_response(fragment_cache.set(user_id, key, version, body, sensitive=sensitive), body)
@@ -0,0 +1,263 @@
+"""
+Background dependency probing for health, readiness and liveness checks
+"""
+import json
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait
+from datetime import datetime
+from config import Config
+from database import db_manager
+from backend_scheduler import backend_scheduler
+from ssh_pool import ssh_pool
+from migrator import migrator
+
+logger = logging.getLogger(__name__)
+
+STATUS_OK = 'ok'
+STATUS_DEGRADED = 'degraded'
+STATUS_DOWN = 'down'
+
+# Backend probes run here, never on the shared SSH executor; one in flight per host
+MAX_PROBE_THREADS = 16
+
+class HealthSnapshot:
+    """Result of one probe cycle, serialised once so requests only copy bytes"""
+
+    def __init__(self, report, checked_at):
+        self.report = report
+        self.status = report['status']
+        self.checked_at = checked_at
+        self.body = json.dumps(report).encode('utf-8')
+
+    def age(self):
+        return time.monotonic() - self.checked_at
+
+class HealthMonitor:
+    """Probes the database and SSH backends on a schedule and caches the result"""
+
+    def __init__(self, interval=5, stale_after=30, probe_timeout=5, saturation_threshold=0.9, slow_probe=1.0):
+        self.interval = interval
+        self.stale_after = stale_after
+        self.probe_timeout = probe_timeout
+        self.saturation_threshold = saturation_threshold
+        self.slow_probe = slow_probe
+        self.started_at = time.monotonic()
+        self._snapshot = None
+        self._schema_current = None
+        # Kept outside the pool so a saturated pool can't make a healthy database look down
+        self._db_conn = None
+        # Likewise one dedicated SSH transport per backend host, keyed by host id
+        self._backend_transports = {}
+        self._backend_probes = {}
+        self._probe_executor = ThreadPoolExecutor(max_workers=MAX_PROBE_THREADS, thread_name_prefix='health-probe')
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._probe_loop, name='health-monitor', daemon=True)
+            self._thread.start()
+        logger.info(f"✅ Health monitor probing every {self.interval}s")
+
+    def _probe_loop(self):
+        while True:
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error(f"❌ Health probe cycle failed: {e}")
+            time.sleep(self.interval)
+
+    def _grade(self, latency, error=None, saturated=False):
+        if error is not None:
+            return STATUS_DOWN
+        if saturated or latency > self.slow_probe:
+            return STATUS_DEGRADED
+        return STATUS_OK
+
+    def probe_database(self):
+        """Round trip on a dedicated primary connection plus pool saturation
+
+        Only a failed connect or ping is DOWN; a busy pool is DEGRADED, so
+        load alone never takes an instance out of rotation.
+        """
+        error = None
+        started = time.perf_counter()
+        try:
+            if self._db_conn is None:
+                self._db_conn = db_manager.connection_pool.open_unpooled()
+            self._db_conn.ping(reconnect=False)
+        except Exception as e:
+            error = str(e)
+            if self._db_conn is not None:
+                try:
+                    self._db_conn.close()
+                except Exception:
+                    pass
+                self._db_conn = None
+        latency = time.perf_counter() - started
+
+        pools = [{
+            'name': stats['name'],
+            'size': stats['size'],
+            'in_use': stats['in_use'],
+            'waiting': stats['waiting'],
+            'saturation': round(stats['saturation'], 3),
+            'timeouts': stats['timeouts']
+        } for stats in db_manager.pool_stats()]
+        saturated = any(p['saturation'] >= self.saturation_threshold for p in pools)
+        return {
+            'status': self._grade(latency, error, saturated),
+            'latency_ms': round(latency * 1000, 2),
+            'error': error,
+            'pools': pools
+        }
+
+    def probe_schema(self):
+        """Compare applied migrations with those on disk; stops querying once current"""
+        if self._schema_current is not None:
+            return self._schema_current
+        try:
+            status = migrator.status()
+        except Exception as e:
+            return {'status': STATUS_DOWN, 'error': str(e)}
+
+        report = dict(status=STATUS_DOWN if status['pending'] else STATUS_OK, **status)
+        if status['pending']:
+            logger.error(f"❌ {len(status['pending'])} pending schema migrations; run `flask db upgrade`")
+        else:
+            self._schema_current = report
+            logger.info(f"✅ Schema at version {status['current']}")
+        return report
+
+    def probe_replicas(self):
+        """Replica health as last seen by the replica selector's own checker"""
+        replicas = db_manager.replicas.status()
+        status = STATUS_OK if all(r['usable'] for r in replicas) else STATUS_DEGRADED
+        return {'status': status, 'replicas': replicas}
+
+    def _run_probe_command(self, host_id, ssh_config):
+        """Run `true` on the host's dedicated transport, connecting it first if needed"""
+        entry = self._backend_transports.get(host_id)
+        if entry is None or not entry.is_healthy():
+            if entry is not None:
+                entry.close()
+            entry = self._backend_transports[host_id] = ssh_pool.open_unpooled(ssh_config, timeout=self.probe_timeout)
+        channel = entry.transport.open_session(timeout=self.probe_timeout)
+        try:
+            channel.settimeout(self.probe_timeout)
+            channel.exec_command('true')
+            deadline = time.monotonic() + self.probe_timeout
+            while not channel.exit_status_ready():
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"No exit status within {self.probe_timeout}s")
+                time.sleep(0.01)
+            exit_status = channel.recv_exit_status()
+        finally:
+            channel.close()
+        return None if exit_status == 0 else f"Exit status {exit_status}"
+
+    def _probe_backend(self, host):
+        started = time.perf_counter()
+        ssh_config = None
+        try:
+            ssh_config = backend_scheduler.ssh_config_for(host['id'])
+            error = self._run_probe_command(host['id'], ssh_config)
+        except Exception as e:
+            error = str(e)
+            entry = self._backend_transports.pop(host['id'], None)
+            if entry is not None:
+                entry.close()
+        latency = time.perf_counter() - started
+
+        pool = ssh_pool.saturation(ssh_config) if ssh_config else {'saturation': 0, 'waiting': 0}
+        saturated = pool['waiting'] > 0 or pool['saturation'] >= self.saturation_threshold
+        return {
+            'status': self._grade(latency, error, saturated),
+            'host': f"{host['hostname']}:{host['port']}",
+            'latency_ms': round(latency * 1000, 2),
+            'error': error,
+            'pool': {'saturation': round(pool['saturation'], 3), 'waiting': pool['waiting']}
+        }
+
+    def probe_backends(self):
+        """Run a no-op command on every enabled backend host concurrently
+
+        Each host is probed over its own transport outside the SSH pool, so
+        deployments holding every pooled channel only make it DEGRADED. A
+        probe still running from an earlier cycle is reported, not restarted.
+        """
+        try:
+            hosts = [host for host in backend_scheduler.list_hosts().values() if host['enabled']]
+        except Exception as e:
+            return {'status': STATUS_DOWN, 'error': str(e), 'hosts': {}}
+
+        enabled = {host['id'] for host in hosts}
+        for host_id in list(self._backend_transports):
+            if host_id not in enabled:
+                self._backend_transports.pop(host_id).close()
+
+        futures = {}
+        for host in hosts:
+            future = self._backend_probes.get(host['id'])
+            if future is None or future.done():
+                future = self._backend_probes[host['id']] = self._probe_executor.submit(self._probe_backend, host)
+            futures[host['name']] = future
+        # Connect, banner and auth each get probe_timeout, then the command does
+        wait(futures.values(), timeout=self.probe_timeout * 4)
+        results = {}
+        for name, future in futures.items():
+            if future.done():
+                results[name] = future.result()
+            else:
+                results[name] = {'status': STATUS_DOWN, 'latency_ms': None, 'error': 'Probe timed out'}
+
+        statuses = [r['status'] for r in results.values()]
+        if not statuses or all(s == STATUS_DOWN for s in statuses):
+            status = STATUS_DOWN
+        elif all(s == STATUS_OK for s in statuses):
+            status = STATUS_OK
+        else:
+            status = STATUS_DEGRADED
+        return {'status': status, 'hosts': results}
+
+    def probe(self):
+        """Run every probe and publish a new snapshot"""
+        database = self.probe_database()
+        backends = self.probe_backends()
+        schema = self.probe_schema()
+        checks = {'database': database, 'schema': schema, 'backends': backends}
+        if db_manager.replicas.replicas:
+            checks['replicas'] = self.probe_replicas()
+
+        statuses = [check['status'] for check in checks.values()]
+        # The app cannot serve without the primary, a current schema, or any backend
+        if STATUS_DOWN in (database['status'], schema['status'], backends['status']):
+            status = STATUS_DOWN
+        elif all(s == STATUS_OK for s in statuses):
+            status = STATUS_OK
+        else:
+            status = STATUS_DEGRADED
+
+        report = dict(status=status, timestamp=datetime.now().isoformat(), **checks)
+        self._snapshot = HealthSnapshot(report, time.monotonic())
+        if status != STATUS_OK:
+            logger.warning(f"⚠️ Health status {status}")
+        return self._snapshot
+
+    def snapshot(self):
+        """Latest probe result, or None before the first cycle completes"""
+        return self._snapshot
+
+    def is_ready(self):
+        snapshot = self._snapshot
+        return snapshot is not None and snapshot.status != STATUS_DOWN and snapshot.age() < self.stale_after
+
+    def uptime(self):
+        return time.monotonic() - self.started_at
+
+# Global health monitor instance
+health_monitor = HealthMonitor(**Config.HEALTH_CHECK_CONFIG)
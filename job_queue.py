@@ -0,0 +1,195 @@
+"""
+Background job queue for long-running deployment work
+"""
+import queue
+import threading
+import logging
+import traceback
+from datetime import datetime, timedelta
+from config import Config
+from database import db_manager
+
+logger = logging.getLogger(__name__)
+
+class JobQueueFull(Exception):
+    """Raised when the pending job queue is at capacity"""
+
+class JobQueue:
+    """Bounded worker pool backed by the persistent jobs table"""
+
+    ACTIVE_STATUSES = ('Pending', 'Running')
+
+    def __init__(self, num_workers=4, max_pending=100, stale_after=900):
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self.stale_after = stale_after
+        self.handlers = {}
+        self.interrupt_handlers = {}
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._workers = []
+        self._lock = threading.Lock()
+        self._started = False
+
+    def register(self, job_type, handler, on_interrupted=None):
+        """Register the handler that runs jobs of the given type
+
+        on_interrupted, if given, is called with each job of that type that
+        recovery fails after it stalled mid-run, so the work it was doing can
+        be moved to its failure state.
+        """
+        self.handlers[job_type] = handler
+        if on_interrupted is not None:
+            self.interrupt_handlers[job_type] = on_interrupted
+
+    def start(self):
+        """Start worker threads and recover jobs left over from a previous process"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            for i in range(self.num_workers):
+                worker = threading.Thread(target=self._worker, name=f"job-worker-{i}", daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        logger.info(f"✅ Job queue started with {self.num_workers} workers")
+        # Recover off the calling thread so startup and the first request don't wait on MySQL
+        threading.Thread(target=self.recover, name='job-recovery', daemon=True).start()
+
+    def recover(self):
+        """Re-enqueue Pending jobs and fail jobs interrupted mid-run"""
+        try:
+            # Only Running jobs older than stale_after are considered dead, so a
+            # booting worker process doesn't fail jobs another process is running
+            now = datetime.now()
+            stalled = db_manager.execute_query(
+                "SELECT * FROM jobs WHERE status = %s AND started_at < %s ORDER BY id",
+                ('Running', now - timedelta(seconds=self.stale_after)), fetch=True, primary=True
+            )
+            interrupted = 0
+            for job in stalled:
+                # Claim each one, so processes recovering at once fail it only once
+                claimed = db_manager.execute_query(
+                    "UPDATE jobs SET status = %s, error = %s, finished_at = %s WHERE id = %s AND status = %s",
+                    ('Failed', 'Interrupted by application restart', now, job['id'], 'Running')
+                )
+                if not claimed:
+                    continue
+                interrupted += 1
+                on_interrupted = self.interrupt_handlers.get(job['job_type'])
+                if on_interrupted is not None:
+                    try:
+                        on_interrupted(job)
+                    except Exception as e:
+                        logger.error(f"❌ Cleanup of interrupted job {job['id']} failed: {e}")
+            pending = db_manager.execute_query(
+                "SELECT id FROM jobs WHERE status = %s ORDER BY id", ('Pending',), fetch=True, primary=True
+            )
+            for job in pending:
+                try:
+                    self._queue.put_nowait(job['id'])
+                except queue.Full:
+                    logger.warning("Job queue full during recovery, remaining jobs stay Pending")
+                    break
+            if pending or interrupted:
+                logger.info(f"♻️ Recovered {len(pending)} pending jobs, marked {interrupted} interrupted jobs failed")
+        except Exception as e:
+            logger.error(f"❌ Job recovery failed: {e}")
+
+    def enqueue(self, job_type, deployment_id, user_id):
+        """Persist a new job and hand it to the workers, returning the job id"""
+        if job_type not in self.handlers:
+            raise ValueError(f"No handler registered for job type {job_type}")
+        self.start()
+
+        with db_manager.transaction() as uow:
+            # Locking the deployment row serialises concurrent enqueues for it, so
+            # two clicks can't both miss the active job and queue two runs
+            if uow.execute("SELECT id FROM deployments WHERE id = %s FOR UPDATE", (deployment_id,),
+                           fetch_one=True) is None:
+                raise ValueError(f"Deployment {deployment_id} does not exist")
+            existing = uow.execute('''
+            SELECT id FROM jobs
+            WHERE deployment_id = %s AND job_type = %s AND status IN (%s, %s)
+            ORDER BY id DESC LIMIT 1
+            ''', (deployment_id, job_type) + self.ACTIVE_STATUSES, fetch_one=True)
+            if existing:
+                return existing['id']
+
+            job_id = uow.execute('''
+            INSERT INTO jobs (job_type, deployment_id, user_id, status, created_at)
+            VALUES (%s, %s, %s, %s, %s)
+            ''', (job_type, deployment_id, user_id, 'Pending', datetime.now()))
+
+        try:
+            self._queue.put_nowait(job_id)
+        except queue.Full:
+            self._finish(job_id, 'Failed', error='Job queue is full')
+            raise JobQueueFull(f"Job queue is full ({self.max_pending} pending jobs)")
+
+        return job_id
+
+    def get_job(self, job_id, user_id=None):
+        """Fetch a job row, optionally restricted to its owner"""
+        # Job state changes from worker threads, so always read it from the primary
+        if user_id is None:
+            return db_manager.execute_query("SELECT * FROM jobs WHERE id = %s", (job_id,), fetch_one=True, primary=True)
+        return db_manager.execute_query(
+            "SELECT * FROM jobs WHERE id = %s AND user_id = %s", (job_id, user_id), fetch_one=True, primary=True
+        )
+
+    def get_active_job(self, deployment_id, job_type):
+        """Return the Pending/Running job for a deployment, if any"""
+        return db_manager.execute_query('''
+        SELECT * FROM jobs
+        WHERE deployment_id = %s AND job_type = %s AND status IN (%s, %s)
+        ORDER BY id DESC LIMIT 1
+        ''', (deployment_id, job_type) + self.ACTIVE_STATUSES, fetch_one=True, primary=True)
+
+    def _finish(self, job_id, status, output=None, error=None):
+        db_manager.execute_query('''
+        UPDATE jobs SET status = %s, output = %s, error = %s, finished_at = %s
+        WHERE id = %s
+        ''', (status, output, error, datetime.now(), job_id))
+
+    def _worker(self):
+        while True:
+            job_id = self._queue.get()
+            try:
+                self._run(job_id)
+            except Exception as e:
+                logger.error(f"💥 Job worker error for job {job_id}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _run(self, job_id):
+        # Claim the job atomically so a job queued twice only runs once
+        claimed = db_manager.execute_query(
+            "UPDATE jobs SET status = %s, started_at = %s WHERE id = %s AND status = %s",
+            ('Running', datetime.now(), job_id, 'Pending')
+        )
+        if not claimed:
+            return
+
+        job = self.get_job(job_id)
+        if job is None:
+            # Deployment was deleted while the job was queued
+            return
+        handler = self.handlers.get(job['job_type'])
+        if handler is None:
+            self._finish(job_id, 'Failed', error=f"No handler for job type {job['job_type']}")
+            return
+
+        logger.info(f"🚀 Running job {job_id} ({job['job_type']}) for deployment {job['deployment_id']}")
+        try:
+            # Reads made by the handler must see the job's own writes
+            with db_manager.session_scope(job['user_id'], pin=True):
+                result = handler(job)
+            status = 'Completed' if result.get('success') else 'Failed'
+            self._finish(job_id, status, output=result.get('output'), error=result.get('error'))
+        except Exception as e:
+            logger.error(f"💥 Job {job_id} failed: {e}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            self._finish(job_id, 'Failed', error=str(e))
+
+# Global job queue instance
+job_queue = JobQueue(**Config.JOB_QUEUE_CONFIG)
@@ -0,0 +1,188 @@
+"""
+Marketplace catalog loaded from a data file, with precomputed indexes
+"""
+import bisect
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import logging
+from collections import OrderedDict
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+TOKEN_REGEX = re.compile(r'[a-z0-9]+')
+# Distinct filtered JSON bodies kept per catalog version
+MAX_CACHED_QUERIES = 256
+
+class CatalogError(ValueError):
+    """Raised when the catalog data file is malformed"""
+
+def tokenize(text):
+    return TOKEN_REGEX.findall((text or '').lower())
+
+def slugify(name):
+    return '-'.join(tokenize(name))
+
+class CatalogSnapshot:
+    """One immutable version of the catalog and everything derived from it"""
+
+    def __init__(self, data, logo_dir, digest):
+        self.categories = [(c['id'], c['label']) for c in data.get('categories', [])]
+        labels = dict(self.categories)
+
+        # Supported apps first, unsupported apps later, otherwise in file order
+        entries = data.get('apps', [])
+        for entry in entries:
+            missing = {'name', 'category', 'description'} - set(entry)
+            if missing:
+                raise CatalogError(f"Marketplace app {entry.get('name')!r} is missing {sorted(missing)}")
+        ordered = [e for e in entries if e.get('deployment_type')] + [e for e in entries if not e.get('deployment_type')]
+
+        self.apps = OrderedDict()
+        self.logos = {}
+        fingerprints = []
+        for entry in ordered:
+            app = {
+                'name': entry['name'],
+                'category': entry['category'],
+                'description': entry['description'],
+                'deployment_type': entry.get('deployment_type'),
+                'slug': slugify(entry['name']),
+                'logo_file': None,
+                'source_image': entry.get('source_image')
+            }
+            logo = entry.get('logo')
+            path = os.path.join(logo_dir, logo) if logo else None
+            if path and os.path.isfile(path):
+                with open(path, 'rb') as f:
+                    fingerprint = hashlib.sha256(f.read()).hexdigest()[:12]
+                stem, ext = os.path.splitext(logo)
+                app['logo_file'] = f"{stem}.{fingerprint}{ext}"
+                self.logos[app['logo_file']] = path
+                fingerprints.append(fingerprint)
+            elif logo:
+                logger.warning(f"⚠️ Marketplace logo {logo} for {entry['name']} not found; using {entry.get('source_image')}")
+            self.apps[app['name']] = app
+
+        self.version = hashlib.sha256((digest + ''.join(fingerprints)).encode('ascii')).hexdigest()[:16]
+
+        self.by_category = {category: [] for category, _ in self.categories}
+        for name, app in self.apps.items():
+            self.by_category.setdefault(app['category'], []).append(name)
+
+        # Inverted index over name, category and description; tokens kept sorted for prefix lookups
+        self._position = {name: i for i, name in enumerate(self.apps)}
+        self._postings = {}
+        for name, app in self.apps.items():
+            text = ' '.join([name, app['category'], labels.get(app['category'], ''), app['description'],
+                             app['deployment_type'] or ''])
+            for token in set(tokenize(text)):
+                self._postings.setdefault(token, set()).add(name)
+        self._tokens = sorted(self._postings)
+
+        self.fragment = None
+        self._responses = {}
+
+    def _prefix_matches(self, prefix):
+        matches = set()
+        i = bisect.bisect_left(self._tokens, prefix)
+        while i < len(self._tokens) and self._tokens[i].startswith(prefix):
+            matches |= self._postings[self._tokens[i]]
+            i += 1
+        return matches
+
+    def search(self, query=None, category=None):
+        """Apps matching every query word (as a word prefix) and the category, in catalog order"""
+        names = None
+        if category:
+            names = set(self.by_category.get(category, ()))
+        for token in tokenize(query):
+            matches = self._prefix_matches(token)
+            names = matches if names is None else names & matches
+            if not names:
+                return []
+        if names is None:
+            return list(self.apps.values())
+        return [self.apps[name] for name in sorted(names, key=self._position.__getitem__)]
+
+    def etag(self, query=None, category=None):
+        """Entity tag for a filtered listing; changes only with the catalog version"""
+        key = f"{self.version}|{category or ''}|{' '.join(tokenize(query))}"
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()[:20]
+
+    def cached_response(self, key, build):
+        """Memoise a serialised response body for this version"""
+        body = self._responses.get(key)
+        if body is None:
+            body = build()
+            if len(self._responses) >= MAX_CACHED_QUERIES:
+                self._responses.clear()
+            self._responses[key] = body
+        return body
+
+class MarketplaceCatalog:
+    """Serves the current catalog snapshot, reloading it when the data file changes"""
+
+    def __init__(self, catalog_file, logo_dir, reload_interval=30):
+        self.catalog_file = catalog_file
+        self.logo_dir = logo_dir
+        self.reload_interval = reload_interval
+        self._snapshot = None
+        self._mtime = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+
+    def _load(self):
+        with open(self.catalog_file, 'rb') as f:
+            raw = f.read()
+        try:
+            data = json.loads(raw)
+        except ValueError as e:
+            raise CatalogError(f"Invalid marketplace catalog {self.catalog_file}: {e}") from e
+        snapshot = CatalogSnapshot(data, self.logo_dir, hashlib.sha256(raw).hexdigest())
+        logger.info(f"✅ Marketplace catalog {snapshot.version} loaded with {len(snapshot.apps)} apps")
+        return snapshot
+
+    def snapshot(self):
+        """Current catalog version; the data file is re-read only when its mtime changes"""
+        now = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is not None and now - self._checked_at < self.reload_interval:
+            return snapshot
+
+        with self._lock:
+            if self._snapshot is not None and now - self._checked_at < self.reload_interval:
+                return self._snapshot
+            mtime = os.stat(self.catalog_file).st_mtime_ns
+            if self._snapshot is None or mtime != self._mtime:
+                try:
+                    self._snapshot = self._load()
+                    self._mtime = mtime
+                except (OSError, CatalogError) as e:
+                    if self._snapshot is None:
+                        raise
+                    # Keep serving the last good version until the file is fixed
+                    logger.error(f"❌ Marketplace catalog reload failed: {e}")
+            self._checked_at = now
+            return self._snapshot
+
+    def get(self, name):
+        return self.snapshot().apps.get(name)
+
+    def fragment(self, render):
+        """App grid HTML, rendered by render(snapshot) once per catalog version"""
+        snapshot = self.snapshot()
+        if snapshot.fragment is None:
+            snapshot.fragment = render(snapshot)
+        return snapshot.fragment
+
+    def logo_path(self, filename):
+        """Local file behind a fingerprinted logo name, or None if it isn't current"""
+        return self.snapshot().logos.get(filename)
+
+# Global marketplace catalog instance
+marketplace_catalog = MarketplaceCatalog(**Config.MARKETPLACE_CONFIG)
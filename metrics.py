@@ -0,0 +1,228 @@
+"""
+In-process metrics with Prometheus text exposition
+"""
+import bisect
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from fast queries up to long deployments
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class _ShardHolder:
+    """Per-thread anchor; its finalizer folds the thread's values back when the thread exits"""
+
+class _ShardedMetric:
+    """Metric whose values live in per-thread shards so updates never take a lock
+
+    Each thread only ever writes to its own dict. Scrapes sum the shards, and
+    shards of finished threads are merged into a retired total.
+    """
+    type_name = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        self._shards = []
+        self._retired = {}
+        self._lock = threading.Lock()
+
+    def _shard(self):
+        shard = getattr(self._local, 'values', None)
+        if shard is None:
+            shard = {}
+            holder = _ShardHolder()
+            self._local.values = shard
+            self._local.holder = holder
+            with self._lock:
+                self._shards.append(shard)
+            weakref.finalize(holder, self._retire, shard)
+        return shard
+
+    def _retire(self, shard):
+        with self._lock:
+            self._shards = [s for s in self._shards if s is not shard]
+            for labels, value in list(shard.items()):
+                self._retired[labels] = self._merge(self._retired.get(labels), value)
+
+    def _collect(self):
+        """Sum of every shard, keyed by label values"""
+        with self._lock:
+            shards = list(self._shards)
+            totals = {labels: self._merge(None, value) for labels, value in self._retired.items()}
+        for shard in shards:
+            for labels, value in list(shard.items()):
+                totals[labels] = self._merge(totals.get(labels), value)
+        return totals
+
+class Counter(_ShardedMetric):
+    type_name = 'counter'
+
+    def inc(self, *labels, amount=1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    @staticmethod
+    def _merge(total, value):
+        return (total or 0) + value
+
+    def render(self):
+        lines = []
+        for labels, value in sorted(self._collect().items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+class Histogram(_ShardedMetric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, *labels):
+        shard = self._shard()
+        entry = shard.get(labels)
+        if entry is None:
+            # [per-bucket counts (last is +Inf), sum, count]
+            entry = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            shard[labels] = entry
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextmanager
+    def time(self, *labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labels)
+
+    @staticmethod
+    def _merge(total, value):
+        if total is None:
+            return [list(value[0]), value[1], value[2]]
+        return [[a + b for a, b in zip(total[0], value[0])], total[1] + value[1], total[2] + value[2]]
+
+    def render(self):
+        lines = []
+        for labels, (counts, total, count) in sorted(self._collect().items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+class CallbackMetric:
+    """Gauge or counter whose samples are read from a callback at scrape time"""
+
+    def __init__(self, name, documentation, labelnames, callback, type_name='gauge'):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self.type_name = type_name
+
+    def render(self):
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.callback()
+        ]
+
+class MetricsRegistry:
+    """Holds every metric and renders them in Prometheus text format"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name, documentation, labelnames, callback, type_name='gauge'):
+        return self._register(CallbackMetric(name, documentation, labelnames, callback, type_name))
+
+    def render(self):
+        with self._lock:
+            registered = list(self._metrics.values())
+        lines = []
+        for metric in registered:
+            try:
+                samples = metric.render()
+            except Exception:
+                # A failing callback must not take the whole scrape down
+                continue
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+# Statement labels for ad-hoc SQL: verb plus the first table it touches
+_TABLE_REGEX = re.compile(
+    r'\b(?:FROM|INTO|UPDATE|JOIN|TABLE(?:\s+IF\s+NOT\s+EXISTS)?)\s+`?([\w.]+)', re.IGNORECASE
+)
+_statement_labels = {}
+MAX_STATEMENT_LABELS = 1024
+
+def statement_label(query):
+    """Low-cardinality label for a SQL string, e.g. 'select deployments'"""
+    label = _statement_labels.get(query)
+    if label is None:
+        stripped = query.lstrip()
+        verb = stripped.split(None, 1)[0].lower() if stripped else 'unknown'
+        match = _TABLE_REGEX.search(query)
+        label = f"{verb} {match.group(1)}" if match else verb
+        if len(_statement_labels) < MAX_STATEMENT_LABELS:
+            _statement_labels[query] = label
+    return label
+
+# Global metrics registry instance
+metrics = MetricsRegistry()
+
+HTTP_REQUEST_DURATION = metrics.histogram(
+    'hostinator_http_request_duration_seconds', 'Time to produce a response, by endpoint',
+    ('method', 'endpoint', 'status'))
+TEMPLATE_RENDER_DURATION = metrics.histogram(
+    'hostinator_template_render_duration_seconds', 'Jinja template render time', ('template',))
+DB_QUERY_DURATION = metrics.histogram(
+    'hostinator_db_query_duration_seconds', 'Database statement latency including pool checkout', ('statement',))
+DB_QUERY_ERRORS = metrics.counter(
+    'hostinator_db_query_errors_total', 'Database statements that raised', ('statement',))
+SSH_OPERATION_DURATION = metrics.histogram(
+    'hostinator_ssh_operation_duration_seconds', 'SSH connect/exec/sftp latency', ('operation', 'host'))
+SSH_OPERATION_ERRORS = metrics.counter(
+    'hostinator_ssh_operation_errors_total', 'SSH operations that failed', ('operation', 'host'))
@@ -0,0 +1,21 @@
+"""
+Backend host registry and per-deployment placement
+"""
+
+def upgrade(schema):
+    schema.execute("""
+    CREATE TABLE IF NOT EXISTS backend_hosts (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        name VARCHAR(255) UNIQUE NOT NULL,
+        hostname VARCHAR(255) NOT NULL,
+        port INT NOT NULL DEFAULT 22,
+        username VARCHAR(255),
+        capacity INT NOT NULL DEFAULT 100,
+        labels VARCHAR(1024) NOT NULL DEFAULT '*',
+        enabled BOOLEAN NOT NULL DEFAULT TRUE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
+
+    schema.add_column('deployments', 'backend_host_id', 'INT NULL')
+    schema.add_index('deployments', 'idx_backend_host', ('backend_host_id',))
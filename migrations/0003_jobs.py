@@ -0,0 +1,23 @@
+"""
+Persistent background job queue
+"""
+
+def upgrade(schema):
+    schema.execute("""
+    CREATE TABLE IF NOT EXISTS jobs (
+        id INT AUTO_INCREMENT PRIMARY KEY,
+        job_type VARCHAR(50) NOT NULL,
+        deployment_id INT NOT NULL,
+        user_id INT,
+        status VARCHAR(50) NOT NULL,
+        output MEDIUMTEXT,
+        error TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        started_at TIMESTAMP NULL,
+        finished_at TIMESTAMP NULL,
+        FOREIGN KEY (deployment_id) REFERENCES deployments(id) ON DELETE CASCADE,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+        INDEX idx_job_status (status),
+        INDEX idx_job_deployment (deployment_id, status)
+    ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
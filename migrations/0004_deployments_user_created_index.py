@@ -0,0 +1,6 @@
+"""
+Composite index backing keyset pagination of a user's deployments
+"""
+
+def upgrade(schema):
+    schema.add_index('deployments', 'idx_user_created', ('user_id', 'created_at', 'id'))
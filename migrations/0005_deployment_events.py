@@ -0,0 +1,18 @@
+"""
+Append-only log of deployment status transitions
+"""
+
+def upgrade(schema):
+    # No foreign key on deployment_id: the Deleted event outlives the row it describes
+    schema.execute("""
+    CREATE TABLE IF NOT EXISTS deployment_events (
+        id BIGINT AUTO_INCREMENT PRIMARY KEY,
+        deployment_id INT NOT NULL,
+        user_id INT,
+        status VARCHAR(50) NOT NULL,
+        occurred_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
+        INDEX idx_event_user (user_id, id),
+        INDEX idx_event_deployment (deployment_id, id)
+    ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
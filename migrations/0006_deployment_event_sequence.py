@@ -0,0 +1,33 @@
+"""
+Per-user event sequence numbers, assigned in commit order
+"""
+
+def upgrade(schema):
+    # One row per user; updating it serialises that user's event inserts until commit
+    schema.execute("""
+    CREATE TABLE IF NOT EXISTS deployment_event_sequences (
+        user_id INT PRIMARY KEY,
+        last_seq BIGINT NOT NULL DEFAULT 0,
+        FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+    ) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+    """)
+    schema.add_column('deployment_events', 'seq', 'BIGINT NULL')
+
+    # Number existing events per user in id order and start each sequence after them
+    schema.execute("""
+    UPDATE deployment_events e
+    JOIN (
+        SELECT id, ROW_NUMBER() OVER (PARTITION BY user_id ORDER BY id) AS seq
+        FROM deployment_events
+    ) numbered ON numbered.id = e.id
+    SET e.seq = numbered.seq
+    WHERE e.seq IS NULL
+    """)
+    schema.execute("""
+    INSERT INTO deployment_event_sequences (user_id, last_seq)
+    SELECT user_id, MAX(seq) FROM deployment_events
+    WHERE user_id IS NOT NULL
+    GROUP BY user_id
+    ON DUPLICATE KEY UPDATE last_seq = GREATEST(last_seq, VALUES(last_seq))
+    """)
+    schema.add_index('deployment_events', 'idx_event_user_seq', ('user_id', 'seq'))
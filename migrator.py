@@ -0,0 +1,258 @@
+"""
+Versioned schema migrations
+"""
+import importlib.util
+import os
+import re
+import time
+import logging
+import click
+import mysql.connector
+from config import Config
+from database import db_manager, IDENTIFIER_REGEX
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE_REGEX = re.compile(r'^(\d{4})_(\w+)\.py$')
+
+# Serialises migration runs across processes and hosts
+MIGRATION_LOCK_NAME = 'hostinator_schema_migrations'
+MIGRATION_LOCK_TIMEOUT = 60
+
+# DDL gives up quickly instead of queueing behind long transactions; while an
+# ALTER waits for its metadata lock every later query on the table waits too
+DDL_LOCK_WAIT_TIMEOUT = 5
+DDL_RETRIES = 5
+
+ER_NO_SUCH_TABLE = 1146
+ER_LOCK_WAIT_TIMEOUT = 1205
+ER_ALTER_OPERATION_NOT_SUPPORTED = 1845
+ER_ALTER_OPERATION_NOT_SUPPORTED_REASON = 1846
+
+SCHEMA_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    duration_ms INT NOT NULL
+) ENGINE=InnoDB CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci
+"""
+
+class MigrationError(Exception):
+    """Raised when a migration cannot be loaded or applied"""
+
+class Migration:
+    """One migrations/NNNN_name.py file exposing upgrade(schema)"""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def load(self):
+        spec = importlib.util.spec_from_file_location(f"migrations.m{self.version:04d}_{self.name}", self.path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if not hasattr(module, 'upgrade'):
+            raise MigrationError(f"Migration {self.path} has no upgrade(schema) function")
+        return module
+
+class SchemaEditor:
+    """DDL helpers handed to migrations; runs everything on one dedicated connection"""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor(buffered=True, dictionary=True)
+
+    def execute(self, sql, params=None):
+        """Run a statement, retrying when it times out waiting for a metadata lock"""
+        for attempt in range(DDL_RETRIES):
+            try:
+                self.cursor.execute(sql, params or ())
+                return self.cursor.rowcount
+            except mysql.connector.Error as err:
+                if err.errno != ER_LOCK_WAIT_TIMEOUT or attempt == DDL_RETRIES - 1:
+                    raise
+                logger.warning(f"⏳ Lock wait timeout, retrying DDL ({attempt + 1}/{DDL_RETRIES})")
+                time.sleep(2 ** attempt)
+
+    def fetch_one(self, sql, params=None):
+        self.cursor.execute(sql, params or ())
+        rows = self.cursor.fetchall()
+        return rows[0] if rows else None
+
+    def table_exists(self, table):
+        return self.fetch_one('''
+        SELECT COUNT(*) as count FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        ''', (table,))['count'] > 0
+
+    def column_exists(self, table, column):
+        return self.fetch_one('''
+        SELECT COUNT(*) as count FROM information_schema.COLUMNS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        ''', (table, column))['count'] > 0
+
+    def index_exists(self, table, index):
+        return self.fetch_one('''
+        SELECT COUNT(*) as count FROM information_schema.STATISTICS
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+        ''', (table, index))['count'] > 0
+
+    @staticmethod
+    def _check_identifiers(*identifiers):
+        for identifier in identifiers:
+            if not IDENTIFIER_REGEX.match(identifier):
+                raise MigrationError(f"Invalid identifier: {identifier}")
+
+    def add_column(self, table, column, definition):
+        """Add a column if missing, instantly where the server supports it"""
+        self._check_identifiers(table, column)
+        if self.column_exists(table, column):
+            return False
+        try:
+            self.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}, ALGORITHM=INSTANT")
+        except mysql.connector.Error as err:
+            if err.errno not in (ER_ALTER_OPERATION_NOT_SUPPORTED, ER_ALTER_OPERATION_NOT_SUPPORTED_REASON):
+                raise
+            self.execute(f"ALTER TABLE `{table}` ADD COLUMN `{column}` {definition}, ALGORITHM=INPLACE, LOCK=NONE")
+        logger.info(f"✅ Added column {table}.{column}")
+        return True
+
+    def add_index(self, table, index, columns):
+        """Add a secondary index if missing without blocking writes"""
+        self._check_identifiers(table, index, *columns)
+        if self.index_exists(table, index):
+            return False
+        column_list = ', '.join(f"`{column}`" for column in columns)
+        # InnoDB builds secondary indexes in place; LOCK=NONE fails rather than blocking DML
+        self.execute(f"ALTER TABLE `{table}` ADD INDEX `{index}` ({column_list}), ALGORITHM=INPLACE, LOCK=NONE")
+        logger.info(f"✅ Added index {table}.{index}")
+        return True
+
+    def close(self):
+        self.cursor.close()
+
+class Migrator:
+    """Applies pending migrations in version order and records them in schema_migrations"""
+
+    def __init__(self, db, directory=MIGRATIONS_DIR):
+        self.db = db
+        self.directory = directory
+
+    def discover(self):
+        """Migration files on disk, ordered by version"""
+        migrations = []
+        for filename in sorted(os.listdir(self.directory)):
+            match = MIGRATION_FILE_REGEX.match(filename)
+            if match:
+                migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(self.directory, filename)))
+        versions = [m.version for m in migrations]
+        if len(versions) != len(set(versions)):
+            raise MigrationError("Duplicate migration version numbers")
+        return migrations
+
+    def latest_version(self):
+        migrations = self.discover()
+        return migrations[-1].version if migrations else 0
+
+    def applied_versions(self):
+        """Versions recorded as applied; empty if the tracking table doesn't exist yet"""
+        try:
+            rows = self.db.execute_query("SELECT version FROM schema_migrations", fetch=True, primary=True)
+        except mysql.connector.Error as err:
+            if err.errno == ER_NO_SUCH_TABLE:
+                return set()
+            raise
+        return {row['version'] for row in rows}
+
+    def status(self):
+        """Current and latest versions plus what is still pending"""
+        applied = self.applied_versions()
+        pending = [m for m in self.discover() if m.version not in applied]
+        return {
+            'current': max(applied) if applied else 0,
+            'latest': self.latest_version(),
+            'pending': [f"{m.version:04d}_{m.name}" for m in pending]
+        }
+
+    def upgrade(self, target=None):
+        """Apply pending migrations up to target (default: all), returning the versions applied"""
+        applied_now = []
+        with self.db.get_connection() as conn:
+            editor = SchemaEditor(conn)
+            try:
+                locked = editor.fetch_one("SELECT GET_LOCK(%s, %s) AS locked",
+                                          (MIGRATION_LOCK_NAME, MIGRATION_LOCK_TIMEOUT))['locked']
+                if locked != 1:
+                    raise MigrationError("Another process is running migrations")
+                editor.execute("SET SESSION lock_wait_timeout = %s", (DDL_LOCK_WAIT_TIMEOUT,))
+                try:
+                    editor.execute(SCHEMA_MIGRATIONS_TABLE)
+                    # Re-read under the lock; another runner may have just finished
+                    applied = {row['version'] for row in self._fetch_versions(editor)}
+                    for migration in self.discover():
+                        if migration.version in applied or (target is not None and migration.version > target):
+                            continue
+                        self._apply(editor, migration)
+                        applied_now.append(migration.version)
+                finally:
+                    editor.execute("SET SESSION lock_wait_timeout = DEFAULT")
+                    editor.fetch_one("SELECT RELEASE_LOCK(%s) AS released", (MIGRATION_LOCK_NAME,))
+            finally:
+                editor.close()
+
+        if applied_now:
+            logger.info(f"✅ Applied migrations {applied_now}")
+        else:
+            logger.info("✅ Schema is up to date")
+        return applied_now
+
+    @staticmethod
+    def _fetch_versions(editor):
+        editor.cursor.execute("SELECT version FROM schema_migrations")
+        return editor.cursor.fetchall()
+
+    def _apply(self, editor, migration):
+        logger.info(f"🚀 Applying migration {migration.version:04d}_{migration.name}")
+        module = migration.load()
+        started = time.perf_counter()
+        try:
+            module.upgrade(editor)
+        except Exception as e:
+            # MySQL DDL commits implicitly, so migrations are written to be re-runnable
+            raise MigrationError(f"Migration {migration.version:04d}_{migration.name} failed: {e}") from e
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        editor.execute(
+            "INSERT INTO schema_migrations (version, name, duration_ms) VALUES (%s, %s, %s)",
+            (migration.version, migration.name, duration_ms)
+        )
+        if not Config.DB_CONFIG.get('autocommit'):
+            editor.conn.commit()
+
+# Global migrator instance
+migrator = Migrator(db_manager)
+
+@click.group('db')
+def db_cli():
+    """Schema migration commands"""
+
+@db_cli.command('upgrade')
+@click.option('--target', type=int, default=None, help='Stop after this migration version')
+def upgrade_command(target):
+    """Create the database if needed, apply pending migrations and seed sample data"""
+    db_manager.initialize_database(target=target)
+
+@db_cli.command('status')
+def status_command():
+    """Show the applied and latest schema versions"""
+    status = migrator.status()
+    click.echo(f"Current version: {status['current']}")
+    click.echo(f"Latest version:  {status['latest']}")
+    for name in status['pending']:
+        click.echo(f"Pending: {name}")
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    db_cli()
@@ -0,0 +1,34 @@
+"""
+Fingerprinted static asset routes
+"""
+import mimetypes
+import os
+from flask import Blueprint, request, abort, send_file
+from assets import asset_pipeline
+
+assets_bp = Blueprint('assets', __name__)
+
+# Pre-compressed variants written by `flask assets build`, best first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+@assets_bp.route('/assets/<path:filename>')
+def asset(filename):
+    """Built asset under its hashed name, pre-compressed when the client accepts it"""
+    path = asset_pipeline.path_for(filename)
+    if path is None:
+        abort(404)
+
+    encoding = None
+    for name, suffix in ENCODINGS:
+        if request.accept_encodings[name] and os.path.isfile(path + suffix):
+            encoding, path = name, path + suffix
+            break
+
+    response = send_file(path, mimetype=mimetypes.guess_type(filename)[0], max_age=asset_pipeline.max_age)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    # The name changes with the content, so a cached copy is never stale
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
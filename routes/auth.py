@@ -1,15 +1,19 @@
 """
 Authentication routes
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session
+from flask import Blueprint, render_template, request, redirect, url_for, flash
 from werkzeug.security import generate_password_hash, check_password_hash
 import logging
 from database import db_manager
+from auth import login_user, logout_user
 
 logger = logging.getLogger(__name__)
 
 auth_bp = Blueprint('auth', __name__)
 
+USER_BY_USERNAME = db_manager.register_statement(
+    'user_by_username', "SELECT * FROM users WHERE username = %s")
+
 @auth_bp.route('/login', methods=['GET', 'POST'])
 def login():
     if request.method == 'POST':
@@ -17,11 +21,10 @@ def login():
         password = request.form['password']
         
         try:
-            user = db_manager.execute_query("SELECT * FROM users WHERE username = %s", (username,), fetch_one=True)
+            user = db_manager.execute_statement(USER_BY_USERNAME, (username,), fetch_one=True)
             
             if user and check_password_hash(user['password'], password):
-                session['user_id'] = user['id']
-                session['username'] = user['username']
+                login_user(user)
                 flash('Login successful!', 'success')
                 return redirect(url_for('dashboard.dashboard'))
             else:
@@ -44,7 +47,7 @@ def register():
             return render_template('register.html')
         
         try:
-            existing_user = db_manager.execute_query("SELECT * FROM users WHERE username = %s", (username,), fetch_one=True)
+            existing_user = db_manager.execute_statement(USER_BY_USERNAME, (username,), fetch_one=True)
             
             if existing_user:
                 flash('Username already exists', 'error')
@@ -63,6 +66,6 @@ def register():
 
 @auth_bp.route('/logout')
 def logout():
-    session.clear()
+    logout_user()
     flash('You have been logged out', 'info')
     return redirect(url_for('auth.login'))
\ No newline at end of file
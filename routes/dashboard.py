@@ -1,25 +1,20 @@
 """
 Dashboard routes
 """
-from flask import Blueprint, render_template, redirect, url_for, session, flash
+from flask import Blueprint, render_template, stream_template, redirect, url_for, flash, request, make_response
 import logging
-from database import db_manager
+from deployment_summary import deployment_summary
+from deployment_listing import list_deployments, InvalidCursor
+from fragment_cache import cached_page
+from auth import login_required, current_user
 from utils import str_to_datetime
+from config import Config
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 dashboard_bp = Blueprint('dashboard', __name__)
 
-def login_required(f):
-    """Decorator to require login"""
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            return redirect(url_for('auth.login'))
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
-
 @dashboard_bp.route('/')
 @login_required
 def index():
@@ -28,13 +23,23 @@ def index():
 @dashboard_bp.route('/dashboard')
 @login_required
 def dashboard():
-    user_id = session['user_id']
+    user_id = current_user.id
+    status_filter = request.args.get('status') or None
+    type_filter = request.args.get('type') or None
+    cursor = request.args.get('cursor') or None
     
+    return cached_page(('dashboard', status_filter, type_filter, cursor),
+                       lambda: _render_dashboard(user_id, status_filter, type_filter, cursor))
+
+def _render_dashboard(user_id, status_filter, type_filter, cursor):
     try:
-        deployments_raw = db_manager.execute_query("SELECT * FROM deployments WHERE user_id = %s ORDER BY created_at DESC", (user_id,), fetch=True)
+        try:
+            page = list_deployments(user_id, cursor=cursor, status=status_filter, deployment_type=type_filter)
+        except InvalidCursor:
+            page = list_deployments(user_id, status=status_filter, deployment_type=type_filter)
         
         deployments = []
-        for d in deployments_raw:
+        for d in page['deployments']:
             deployment = dict(d)
             try:
                 deployment['created_at'] = str_to_datetime(deployment['created_at'])
@@ -45,32 +50,29 @@ def dashboard():
                 deployment['last_updated'] = datetime.now()
             deployments.append(deployment)
         
-        total_deployments = len(deployments)
-        active_deployments = sum(1 for d in deployments if d['status'] == 'Active')
-        inactive_deployments = sum(1 for d in deployments if d['status'] == 'Inactive')
-        pending_deployments = sum(1 for d in deployments if d['status'] == 'Pending')
-        
-        deployment_types = {}
-        for d in deployments:
-            if d['deployment_type'] in deployment_types:
-                deployment_types[d['deployment_type']] += 1
-            else:
-                deployment_types[d['deployment_type']] = 1
+        summary = deployment_summary.get(user_id)
         
-        return render_template('dashboard.html', 
+        # Streaming sends the page head while the deployment rows are still rendering
+        render = stream_template if Config.DASHBOARD_STREAMING else render_template
+        return render('dashboard.html', 
                               deployments=deployments,
-                              total_deployments=total_deployments,
-                              active_deployments=active_deployments,
-                              inactive_deployments=inactive_deployments,
-                              pending_deployments=pending_deployments,
-                              deployment_types=deployment_types)
+                              next_cursor=page['next_cursor'],
+                              is_first_page=cursor is None,
+                              status_filter=status_filter,
+                              type_filter=type_filter,
+                              **summary)
     except Exception as e:
         logger.error(f"Dashboard error: {e}")
         flash('Error loading dashboard. Please try again.', 'error')
-        return render_template('dashboard.html', 
+        # A response rather than HTML, so the error page isn't cached
+        return make_response(render_template('dashboard.html', 
                               deployments=[],
+                              next_cursor=None,
+                              is_first_page=True,
+                              status_filter=status_filter,
+                              type_filter=type_filter,
                               total_deployments=0,
                               active_deployments=0,
                               inactive_deployments=0,
                               pending_deployments=0,
-                              deployment_types={})
+                              deployment_types={}))
@@ -1,11 +1,22 @@
 """
 Deployment management routes
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash, session, jsonify
+from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify, Response, make_response
+from werkzeug.http import http_date
 import logging
+import json
+import time
 from datetime import datetime
 from database import db_manager
 from deployment_service import DeploymentService
+from job_queue import job_queue, JobQueueFull
+from event_bus import event_bus, deployment_channel
+from deployment_logs import deployment_logs
+from deployment_summary import deployment_summary
+from deployment_events import deployment_events, DEFAULT_EVENT_LIMIT
+from fragment_cache import fragment_cache, cached_page
+from auth import login_required, current_user
+from deployment_listing import list_deployments, InvalidCursor, DEFAULT_PAGE_SIZE
 from utils import str_to_datetime
 import traceback
 import re  # [SECURITY] Import re for validation
@@ -19,22 +30,78 @@ deployment_service = DeploymentService()
 # Allows: alphanumeric, hyphens, dots. No spaces, no special chars like ; | & $
 DOMAIN_REGEX = re.compile(r'^(?:[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?\.)+[a-zA-Z]{2,6}$')
 
-def login_required(f):
-    """Decorator to require login"""
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            return redirect(url_for('auth.login'))
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
+# Status push settings (seconds unless noted)
+SSE_HEARTBEAT_INTERVAL = 15
+SSE_RESYNC_INTERVAL = 30
+SSE_MAX_DURATION = 300
+SSE_RETRY_MS = 3000
+STATUS_LONG_POLL_MAX_WAIT = 30
+DEPLOYMENT_LOG_READ_LIMIT = 65536
+
+# Hot statements, prepared once per pooled connection
+DEPLOYMENT_FOR_USER = db_manager.register_statement(
+    'deployment_for_user', "SELECT * FROM deployments WHERE id = %s AND user_id = %s")
+DEPLOYMENT_STATUS_FOR_USER = db_manager.register_statement(
+    'deployment_status_for_user', "SELECT status, last_updated FROM deployments WHERE id = %s AND user_id = %s")
+DEPLOYMENT_STATUS = db_manager.register_statement(
+    'deployment_status', "SELECT status, last_updated FROM deployments WHERE id = %s")
+
+def _set_deployment_status(id, user_id, status, credentials_file=None):
+    """Persist a deployment status transition, log it and notify status subscribers"""
+    # TIMESTAMP columns have second precision; match it so pushed and stored values agree
+    now = datetime.now().replace(microsecond=0)
+    with db_manager.transaction() as uow:
+        if credentials_file is None:
+            uow.execute("UPDATE deployments SET status = %s, last_updated = %s WHERE id = %s", (status, now, id))
+        else:
+            uow.execute('''
+            UPDATE deployments 
+            SET status = %s, last_updated = %s, credentials_file = %s 
+            WHERE id = %s
+            ''', (status, now, credentials_file, id))
+        deployment_events.record(uow, id, user_id, status, now)
+    
+    deployment_summary.invalidate(user_id)
+    fragment_cache.bump(user_id)
+    event_bus.publish(deployment_channel(id), {'status': status, 'last_updated': now.isoformat()})
+
+def _set_deployments_status(ids, user_id, status):
+    """Persist the same status transition for many deployments in one statement"""
+    now = datetime.now().replace(microsecond=0)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with db_manager.transaction() as uow:
+        uow.execute(
+            f"UPDATE deployments SET status = %s, last_updated = %s WHERE id IN ({placeholders})",
+            (status, now, *ids)
+        )
+        deployment_events.record_many(uow, ids, user_id, status, now)
+    
+    deployment_summary.invalidate(user_id)
+    fragment_cache.bump(user_id)
+    for id in ids:
+        event_bus.publish(deployment_channel(id), {'status': status, 'last_updated': now.isoformat()})
+
+def _remove_deployment(id, user_id):
+    """Delete a deployment row, log it and notify status subscribers"""
+    now = datetime.now().replace(microsecond=0)
+    with db_manager.transaction() as uow:
+        uow.execute("DELETE FROM deployments WHERE id = %s", (id,))
+        deployment_events.record(uow, id, user_id, 'Deleted', now)
+    deployment_summary.invalidate(user_id)
+    fragment_cache.bump(user_id)
+    deployment_logs.discard(id)
+    event_bus.publish(deployment_channel(id), {'status': 'Deleted', 'last_updated': now.isoformat()})
 
 @deployments_bp.route('/deployment/<int:id>')
 @login_required
 def deployment_detail(id):
-    user_id = session['user_id']
-    
+    user_id = current_user.id
+    # [SECURITY] The page shows the deployment's credentials
+    return cached_page(('deployment', id), lambda: _render_deployment_detail(id, user_id), sensitive=True)
+
+def _render_deployment_detail(id, user_id):
     try:
-        deployment_raw = db_manager.execute_query("SELECT * FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
+        deployment_raw = db_manager.execute_statement(DEPLOYMENT_FOR_USER, (id, user_id), fetch_one=True)
         
         if deployment_raw:
             deployment = dict(deployment_raw)
@@ -48,11 +115,15 @@ def deployment_detail(id):
             
             credentials_content = None
             if deployment['credentials_file']:
-                credentials_content = deployment_service.read_credentials_file(deployment['credentials_file'])
+                credentials_content = deployment_service.read_credentials_file(deployment['credentials_file'], deployment['backend_host_id'])
             
-            return render_template('deployment.html', 
-                                  deployment=deployment, 
-                                  credentials_content=credentials_content)
+            page = render_template('deployment.html', 
+                                   deployment=deployment, 
+                                   credentials_content=credentials_content)
+            if deployment['credentials_file'] and credentials_content is None:
+                # The backend read failed; don't cache a page missing the credentials
+                return make_response(page)
+            return page
         else:
             flash('Deployment not found or you do not have permission to view it', 'error')
             return redirect(url_for('dashboard.dashboard'))
@@ -61,6 +132,39 @@ def deployment_detail(id):
         flash('Error loading deployment details. Please try again.', 'error')
         return redirect(url_for('dashboard.dashboard'))
 
+@deployments_bp.route('/api/deployments', methods=['GET'])
+@login_required
+def list_deployments_api():
+    """Keyset-paginated deployment listing with optional status/type filters"""
+    user_id = current_user.id
+    
+    try:
+        page = list_deployments(
+            user_id,
+            cursor=request.args.get('cursor') or None,
+            limit=request.args.get('limit', DEFAULT_PAGE_SIZE, type=int),
+            status=request.args.get('status') or None,
+            deployment_type=request.args.get('type') or None
+        )
+    except InvalidCursor:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    except Exception as e:
+        logger.error("List deployments error: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
+    
+    deployments = [{
+        'id': d['id'],
+        'name': d['name'],
+        'email': d['email'],
+        'status': d['status'],
+        'deployment_type': d['deployment_type'],
+        'has_credentials': bool(d['has_credentials']),
+        'created_at': d['created_at'].isoformat() if d['created_at'] else None,
+        'last_updated': d['last_updated'].isoformat() if d['last_updated'] else None
+    } for d in page['deployments']]
+    
+    return jsonify({'deployments': deployments, 'next_cursor': page['next_cursor']}), 200, {'Content-Type': 'application/json'}
+
 @deployments_bp.route('/deployment/new', methods=['GET', 'POST'])
 @login_required
 def new_deployment():
@@ -81,14 +185,18 @@ def new_deployment():
                                   pre_selected_type=pre_selected_type)
 
         now = datetime.now()
-        user_id = session['user_id']
+        user_id = current_user.id
         
         try:
             # FIXED: Changed initial status from 'Deploying' to 'Pending'
-            deployment_id = db_manager.execute_query('''
-            INSERT INTO deployments (name, email, status, deployment_type, created_at, last_updated, user_id)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ''', (name, email, 'Pending', deployment_type, now, now, user_id))
+            with db_manager.transaction() as uow:
+                deployment_id = uow.execute('''
+                INSERT INTO deployments (name, email, status, deployment_type, created_at, last_updated, user_id)
+                VALUES (%s, %s, %s, %s, %s, %s, %s)
+                ''', (name, email, 'Pending', deployment_type, now, now, user_id))
+                deployment_events.record(uow, deployment_id, user_id, 'Pending', now.replace(microsecond=0))
+            deployment_summary.invalidate(user_id)
+            fragment_cache.bump(user_id)
             
             flash(f'Deployment started for {app_name if app_name else deployment_type}. Please wait while we set up your environment.', 'info')
             return redirect(url_for('deployments.deployment_progress', id=deployment_id))
@@ -103,10 +211,10 @@ def new_deployment():
 @deployments_bp.route('/deployment/progress/<int:id>')
 @login_required
 def deployment_progress(id):
-    user_id = session['user_id']
+    user_id = current_user.id
     
     try:
-        deployment = db_manager.execute_query("SELECT * FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
+        deployment = db_manager.execute_statement(DEPLOYMENT_FOR_USER, (id, user_id), fetch_one=True, primary=True)
         
         if not deployment:
             flash('Deployment not found or you do not have permission to view it', 'error')
@@ -118,17 +226,74 @@ def deployment_progress(id):
         flash('Error loading deployment progress. Please try again.', 'error')
         return redirect(url_for('dashboard.dashboard'))
 
+def run_deployment_job(job):
+    """Job handler that runs the deployment script and records the outcome"""
+    id = job['deployment_id']
+    
+    try:
+        deployment = db_manager.execute_query("SELECT name, email, deployment_type, backend_host_id FROM deployments WHERE id = %s", (id,), fetch_one=True)
+        
+        if not deployment:
+            return {'success': False, 'error': 'Deployment no longer exists'}
+        
+        name = deployment['name']
+        email = deployment['email']
+        deployment_type = deployment['deployment_type']
+        
+        # [SECURITY] Double-check domain validation even here (Defense in Depth)
+        if not DOMAIN_REGEX.match(name):
+            raise ValueError('Security validation failed for domain name.')
+        
+        logger.info("🚀 Starting deployment for deployment ID %s, Type: %s, User: %s", id, deployment_type, job['user_id'])
+        
+        # FIXED: Update status to 'Pending' first to ensure it's counted correctly
+        _set_deployment_status(id, job['user_id'], 'Pending')
+        
+        # Execute the deployment script, streaming its output into a bounded buffer
+        log = deployment_logs.open(id, owner_id=job['user_id'])
+        # A redeploy stays on its host; new deployments are placed by the scheduler
+        result = deployment_service.execute_deployment_script(name, email, deployment_type, log=log,
+                                                              deployment_id=id,
+                                                              backend_host_id=deployment['backend_host_id'])
+        
+        if result['success']:
+            # Update to Active status
+            _set_deployment_status(id, job['user_id'], 'Active', credentials_file=result['credentials_file'])
+            
+            logger.info("✅ Deployment %s completed successfully", id)
+        else:
+            # Update to Failed/Inactive status
+            _set_deployment_status(id, job['user_id'], 'Inactive')
+            
+            logger.error("❌ Deployment %s failed: %s", id, result['output'])
+        
+        return {'success': result['success'], 'output': result['output']}
+    
+    except Exception:
+        # Ensure we update the database even on exception
+        try:
+            _set_deployment_status(id, job['user_id'], 'Inactive')
+        except Exception:
+            pass  # Don't let database update failure mask the original error
+        raise
+
+def fail_interrupted_deployment(job):
+    """Mark a deployment whose job stalled mid-run as failed, as the job itself would have"""
+    _set_deployment_status(job['deployment_id'], job['user_id'], 'Inactive')
+
+job_queue.register('deploy', run_deployment_job, on_interrupted=fail_interrupted_deployment)
+
 @deployments_bp.route('/api/execute-deployment/<int:id>', methods=['POST'])
 @login_required
 def execute_deployment_api(id):
-    """Execute deployment script - this runs in background"""
-    user_id = session['user_id']
+    """Queue the deployment script to run in the background and return the job id"""
+    user_id = current_user.id
     
     try:
         # Set content type to JSON
         response_headers = {'Content-Type': 'application/json'}
         
-        deployment = db_manager.execute_query("SELECT * FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
+        deployment = db_manager.execute_query("SELECT name FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
         
         if not deployment:
             logger.warning("Deployment %s not found for user %s", id, user_id)
@@ -138,80 +303,36 @@ def execute_deployment_api(id):
                 'output': 'Deployment not found or you do not have permission to access it.'
             }), 404, response_headers
         
-        name = deployment['name']
-        email = deployment['email']
-        deployment_type = deployment['deployment_type']
-        
         # [SECURITY] Double-check domain validation even here (Defense in Depth)
-        if not DOMAIN_REGEX.match(name):
+        if not DOMAIN_REGEX.match(deployment['name']):
              return jsonify({
                 'success': False, 
                 'error': 'Invalid domain format detected', 
                 'output': 'Security validation failed for domain name.'
             }), 400, response_headers
-
-        logger.info("🚀 Starting deployment for deployment ID %s, Type: %s, User: %s", id, deployment_type, user_id)
         
-        # FIXED: Update status to 'Pending' first to ensure it's counted correctly
-        # Then update to 'Deploying' to show it's in progress
-        now = datetime.now()
-        db_manager.execute_query('''
-        UPDATE deployments 
-        SET status = %s, last_updated = %s 
-        WHERE id = %s
-        ''', ('Pending', now, id))
+        job_id = job_queue.enqueue('deploy', id, user_id)
+        logger.info("📥 Deployment %s queued as job %s", id, job_id)
         
-        # Execute the deployment script
-        result = deployment_service.execute_deployment_script(name, email, deployment_type)
-        
-        if result['success']:
-            # Update to Active status
-            now = datetime.now()
-            db_manager.execute_query('''
-            UPDATE deployments 
-            SET status = %s, last_updated = %s, credentials_file = %s 
-            WHERE id = %s
-            ''', ('Active', now, result['credentials_file'], id))
-            
-            logger.info("✅ Deployment %s completed successfully", id)
-            return jsonify({
-                'success': True,
-                'message': 'Deployment completed successfully',
-                'output': result['output'],
-                'status': 'Active'
-            }), 200, response_headers
-        else:
-            # Update to Failed/Inactive status
-            now = datetime.now()
-            db_manager.execute_query('''
-            UPDATE deployments 
-            SET status = %s, last_updated = %s 
-            WHERE id = %s
-            ''', ('Inactive', now, id))
-            
-            logger.error("❌ Deployment %s failed: %s", id, result['output'])
-            return jsonify({
-                'success': False,
-                'message': 'Deployment failed',
-                'output': result['output'],
-                'status': 'Failed'
-            }), 200, response_headers  # Still return 200 to ensure JSON parsing works
-            
+        return jsonify({
+            'success': True,
+            'message': 'Deployment queued',
+            'job_id': job_id,
+            'status': 'Pending'
+        }), 202, response_headers
+    
+    except JobQueueFull as e:
+        logger.warning("Deployment %s rejected: %s", id, e)
+        return jsonify({
+            'success': False,
+            'error': 'Too many deployments in progress',
+            'output': 'The deployment queue is full. Please try again in a few minutes.',
+            'status': 'Pending'
+        }), 503, {'Content-Type': 'application/json'}
     except Exception as e:
         logger.error("💥 Execute deployment API error for ID %s: %s", id, e)
         logger.error("Traceback: %s", traceback.format_exc())
         
-        # Ensure we update the database even on exception
-        try:
-            now = datetime.now()
-            db_manager.execute_query('''
-            UPDATE deployments 
-            SET status = %s, last_updated = %s 
-            WHERE id = %s
-            ''', ('Inactive', now, id))
-        except:
-            pass  # Don't let database update failure mask the original error
-        
         return jsonify({
             'success': False, 
             'error': 'Internal server error',
@@ -219,60 +340,242 @@ def execute_deployment_api(id):
             'status': 'Failed'
         }), 200, {'Content-Type': 'application/json'}  # Always return JSON
 
+@deployments_bp.route('/api/jobs/<int:job_id>', methods=['GET'])
+@login_required
+def get_job_status(job_id):
+    """Get background job state and output"""
+    user_id = current_user.id
+    
+    try:
+        job = job_queue.get_job(job_id, user_id=user_id)
+        
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({
+            'id': job['id'],
+            'deployment_id': job['deployment_id'],
+            'status': job['status'],
+            'output': job['output'],
+            'error': job['error'],
+            'created_at': job['created_at'].isoformat() if job['created_at'] else None,
+            'started_at': job['started_at'].isoformat() if job['started_at'] else None,
+            'finished_at': job['finished_at'].isoformat() if job['finished_at'] else None
+        }), 200, {'Content-Type': 'application/json'}
+    
+    except Exception as e:
+        logger.error("Get job status error: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
+
+def _status_payload(deployment):
+    return {
+        'status': deployment['status'],
+        'last_updated': deployment['last_updated'].isoformat() if deployment['last_updated'] else None
+    }
+
 @deployments_bp.route('/api/deployment-status/<int:id>', methods=['GET'])
 @login_required
 def get_deployment_status(id):
-    """Get current deployment status - for polling"""
-    user_id = session['user_id']
+    """Get current deployment status - for polling.
+    
+    Supports long-polling: with an If-Modified-Since header (or a ``since``
+    ISO timestamp) and ``wait`` seconds, the request blocks until the status
+    changes or the wait expires, answering 304 if nothing changed.
+    """
+    user_id = current_user.id
     
     try:
-        deployment = db_manager.execute_query(
-            "SELECT status, last_updated FROM deployments WHERE id = %s AND user_id = %s", 
+        # Status is written by job workers, often in another process, so a
+        # per-process replica pin can't cover it; always read the primary
+        deployment = db_manager.execute_statement(
+            DEPLOYMENT_STATUS_FOR_USER, 
             (id, user_id), 
-            fetch_one=True
+            fetch_one=True,
+            primary=True
         )
         
         if not deployment:
             return jsonify({'error': 'Deployment not found'}), 404
         
-        return jsonify({
-            'status': deployment['status'],
-            'last_updated': deployment['last_updated'].isoformat() if deployment['last_updated'] else None
-        }), 200, {'Content-Type': 'application/json'}
+        since = request.if_modified_since
+        if since is not None:
+            # HTTP dates are UTC-aware; last_updated is stored as naive local time
+            since = since.astimezone().replace(tzinfo=None)
+        elif request.args.get('since'):
+            try:
+                since = datetime.fromisoformat(request.args['since'])
+            except ValueError:
+                return jsonify({'error': 'Invalid since timestamp'}), 400
+        
+        payload = _status_payload(deployment)
+        last_updated = deployment['last_updated']
+        
+        if since is not None and last_updated is not None and last_updated <= since:
+            wait = min(request.args.get('wait', 0, type=float), STATUS_LONG_POLL_MAX_WAIT)
+            event = None
+            if wait > 0:
+                with event_bus.subscribe(deployment_channel(id)) as subscription:
+                    event = subscription.get(timeout=wait)
+            if event is None:
+                return '', 304, {'Last-Modified': http_date(last_updated.astimezone())}
+            payload = event
+        
+        response = jsonify(payload)
+        if payload.get('last_updated'):
+            response.headers['Last-Modified'] = http_date(datetime.fromisoformat(payload['last_updated']).astimezone())
+        return response, 200, {'Content-Type': 'application/json'}
         
     except Exception as e:
         logger.error("Get deployment status error: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
 
+@deployments_bp.route('/api/deployment-events', methods=['GET'])
+@login_required
+def get_deployment_events():
+    """Status transitions after the ``after`` cursor, optionally for one deployment
+    
+    Clients keep the returned cursor (the last event's ``seq``) and pass it
+    back as ``after`` to receive only the transitions committed since their
+    last poll; none are skipped.
+    """
+    user_id = current_user.id
+    after = request.args.get('after', 0, type=int)
+    if after < 0:
+        return jsonify({'error': 'Invalid cursor'}), 400
+    
+    try:
+        page = deployment_events.fetch(
+            user_id,
+            after=after,
+            limit=request.args.get('limit', DEFAULT_EVENT_LIMIT, type=int),
+            deployment_id=request.args.get('deployment_id', type=int)
+        )
+    except Exception as e:
+        logger.error("Get deployment events error: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
+    
+    events = [{
+        'id': e['id'],
+        'seq': e['seq'],
+        'deployment_id': e['deployment_id'],
+        'status': e['status'],
+        'occurred_at': e['occurred_at'].isoformat() if e['occurred_at'] else None
+    } for e in page['events']]
+    
+    return jsonify({'events': events, 'cursor': page['cursor'], 'has_more': page['has_more']}), 200, {
+        'Content-Type': 'application/json', 'Cache-Control': 'no-cache'
+    }
+
+@deployments_bp.route('/api/deployment-logs/<int:id>', methods=['GET'])
+@login_required
+def get_deployment_logs(id):
+    """Tail live deployment script output from the given offset"""
+    user_id = current_user.id
+    offset = request.args.get('offset', 0, type=int)
+    
+    log = deployment_logs.get(id)
+    if log is None or log.owner_id != user_id:
+        # No run in this process (not started, expired, or handled by another worker)
+        return jsonify({'output': '', 'offset': offset, 'truncated': False, 'complete': False, 'available': False}), 200
+    
+    result = log.read(offset, limit=DEPLOYMENT_LOG_READ_LIMIT)
+    result['available'] = True
+    return jsonify(result), 200, {'Content-Type': 'application/json', 'Cache-Control': 'no-cache'}
+
+@deployments_bp.route('/api/deployment-status/<int:id>/stream', methods=['GET'])
+@login_required
+def stream_deployment_status(id):
+    """Server-Sent Events stream of status transitions for a deployment"""
+    user_id = current_user.id
+    
+    try:
+        # Status is written by job workers, often in another process, so a
+        # per-process replica pin can't cover it; always read the primary
+        deployment = db_manager.execute_statement(
+            DEPLOYMENT_STATUS_FOR_USER, 
+            (id, user_id), 
+            fetch_one=True,
+            primary=True
+        )
+    except Exception as e:
+        logger.error("Stream deployment status error: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
+    
+    if not deployment:
+        return jsonify({'error': 'Deployment not found'}), 404
+    
+    # Subscribe before sending the snapshot so no transition is missed in between
+    subscription = event_bus.subscribe(deployment_channel(id))
+    
+    def generate():
+        last_sent = _status_payload(deployment)
+        started = time.monotonic()
+        last_sync = started
+        try:
+            yield f"retry: {SSE_RETRY_MS}\n"
+            yield f"event: status\ndata: {json.dumps(last_sent)}\n\n"
+            
+            while time.monotonic() - started < SSE_MAX_DURATION:
+                event = subscription.get(timeout=SSE_HEARTBEAT_INTERVAL)
+                
+                # Resync from the database now and then, in case the transition
+                # happened in another worker process or events were dropped
+                if event is None and (subscription.dropped or time.monotonic() - last_sync >= SSE_RESYNC_INTERVAL):
+                    subscription.dropped = False
+                    last_sync = time.monotonic()
+                    row = db_manager.execute_statement(
+                        DEPLOYMENT_STATUS, (id,), fetch_one=True, primary=True
+                    )
+                    event = _status_payload(row) if row else {'status': 'Deleted', 'last_updated': None}
+                    if event == last_sent:
+                        event = None
+                
+                if event is None:
+                    yield ": keepalive\n\n"
+                    continue
+                
+                last_sent = event
+                yield f"event: status\ndata: {json.dumps(event)}\n\n"
+                if event['status'] == 'Deleted':
+                    break
+        finally:
+            subscription.close()
+    
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+
 @deployments_bp.route('/deployment/delete/<int:id>', methods=['POST'])
 @login_required
 def delete_deployment(id):
     """Delete deployment with improved error handling and guaranteed database cleanup"""
-    user_id = session['user_id']
+    user_id = current_user.id
     
     try:
-        deployment = db_manager.execute_query("SELECT name, deployment_type FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
+        deployment = db_manager.execute_query("SELECT name, deployment_type, credentials_file, backend_host_id FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
         
         if deployment:
             domain = deployment['name']
             deployment_type = deployment['deployment_type']
+            deployment_service.invalidate_credentials(deployment['credentials_file'])
             
             # Add immediate feedback to prevent browser hang perception
             flash('Delete operation started. This may take a moment...', 'info')
             
             try:
-                result = deployment_service.execute_container_action(domain, 'delete', deployment_type)
+                result = deployment_service.execute_container_action(domain, 'delete', deployment_type, deployment['backend_host_id'])
                 
                 if result['success']:
-                    db_manager.execute_query("DELETE FROM deployments WHERE id = %s", (id,))
+                    _remove_deployment(id, user_id)
                     flash('Deployment deleted successfully!', 'success')
                 else:
                     # Even if delete script fails, remove from database to prevent UI issues
-                    db_manager.execute_query("DELETE FROM deployments WHERE id = %s", (id,))
+                    _remove_deployment(id, user_id)
                     flash(f'Deployment removed from dashboard. Note: {result["output"]}', 'warning')
             except Exception as e:
                 # Fallback - remove from database even if there's an error
-                db_manager.execute_query("DELETE FROM deployments WHERE id = %s", (id,))
+                _remove_deployment(id, user_id)
                 flash(f'Deployment removed from dashboard. Error during cleanup: {str(e)}', 'warning')
         else:
             flash('Deployment not found or you do not have permission to delete it', 'error')
@@ -285,7 +588,7 @@ def delete_deployment(id):
 @deployments_bp.route('/deployment/update-status/<int:id>', methods=['POST'])
 @login_required
 def update_deployment_status(id):
-    user_id = session['user_id']
+    user_id = current_user.id
     
     status = request.form.get('status')
     action = request.form.get('action', '')
@@ -295,26 +598,24 @@ def update_deployment_status(id):
         return redirect(url_for('deployments.deployment_detail', id=id))
     
     try:
-        deployment = db_manager.execute_query("SELECT name, deployment_type FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
+        deployment = db_manager.execute_query("SELECT name, deployment_type, backend_host_id FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
         
         if deployment:
             domain = deployment['name']
             deployment_type = deployment['deployment_type']
             
             if action == 'stop' and status == 'Inactive':
-                result = deployment_service.execute_container_action(domain, 'stop', deployment_type)
+                result = deployment_service.execute_container_action(domain, 'stop', deployment_type, deployment['backend_host_id'])
                 if not result['success']:
                     flash(f'Error stopping container: {result["output"]}', 'error')
                     return redirect(url_for('deployments.deployment_detail', id=id))
             elif action == 'start' and status == 'Active':
-                result = deployment_service.execute_container_action(domain, 'start', deployment_type)
+                result = deployment_service.execute_container_action(domain, 'start', deployment_type, deployment['backend_host_id'])
                 if not result['success']:
                     flash(f'Error starting container: {result["output"]}', 'error')
                     return redirect(url_for('deployments.deployment_detail', id=id))
             
-            now = datetime.now()
-            db_manager.execute_query("UPDATE deployments SET status = %s, last_updated = %s WHERE id = %s", 
-                         (status, now, id))
+            _set_deployment_status(id, user_id, status)
             
             flash(f'Deployment status updated to {status}', 'success')
         else:
@@ -325,18 +626,65 @@ def update_deployment_status(id):
     
     return redirect(url_for('deployments.deployment_detail', id=id))
 
+BULK_ACTION_STATUS = {'stop': 'Inactive', 'start': 'Active'}
+
+@deployments_bp.route('/api/deployments/bulk-action', methods=['POST'])
+@login_required
+def bulk_deployment_action():
+    """Start or stop many of the user's deployments in one backend session"""
+    user_id = current_user.id
+    data = request.get_json(silent=True) or {}
+    action = data.get('action')
+    ids = data.get('ids')
+    
+    if action not in BULK_ACTION_STATUS:
+        return jsonify({'error': 'Invalid action'}), 400
+    if ids is not None and (not isinstance(ids, list) or not all(isinstance(i, int) for i in ids)):
+        return jsonify({'error': 'ids must be a list of deployment ids'}), 400
+    
+    try:
+        deployments = db_manager.execute_query(
+            "SELECT id, name, deployment_type, backend_host_id FROM deployments WHERE user_id = %s", (user_id,), fetch=True
+        )
+        if ids is not None:
+            wanted = set(ids)
+            deployments = [d for d in deployments if d['id'] in wanted]
+        
+        # [SECURITY] Only act on names that pass domain validation
+        deployments = [d for d in deployments if DOMAIN_REGEX.match(d['name'])]
+        if not deployments:
+            return jsonify({'results': {}}), 200
+        
+        results = deployment_service.execute_bulk_action(
+            action, [(d['id'], d['name'], d['deployment_type'], d['backend_host_id']) for d in deployments]
+        )
+        
+        response = {}
+        for d in deployments:
+            result = results[d['id']]
+            response[d['id']] = {'name': d['name'], 'success': result['success'], 'output': result['output']}
+        
+        succeeded = [d['id'] for d in deployments if results[d['id']]['success']]
+        if succeeded:
+            _set_deployments_status(succeeded, user_id, BULK_ACTION_STATUS[action])
+        
+        return jsonify({'results': response}), 200, {'Content-Type': 'application/json'}
+    except Exception as e:
+        logger.error("Bulk deployment action error: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
+
 @deployments_bp.route('/deployment/credentials/<int:id>')
 @login_required
 def get_deployment_credentials(id):
-    user_id = session['user_id']
+    user_id = current_user.id
     
     try:
-        deployment = db_manager.execute_query("SELECT credentials_file FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
+        deployment = db_manager.execute_query("SELECT credentials_file, backend_host_id FROM deployments WHERE id = %s AND user_id = %s", (id, user_id), fetch_one=True)
         
         if not deployment or not deployment['credentials_file']:
             return jsonify({'error': 'No credentials file found or you do not have permission'}), 404
         
-        credentials_content = deployment_service.read_credentials_file(deployment['credentials_file'])
+        credentials_content = deployment_service.read_credentials_file(deployment['credentials_file'], deployment['backend_host_id'])
         if not credentials_content:
             return jsonify({'error': 'Could not read credentials file'}), 500
         
@@ -344,3 +692,43 @@ def get_deployment_credentials(id):
     except Exception as e:
         logger.error("Get credentials error: %s", e)
         return jsonify({'error': 'Internal server error'}), 500
+
+MAX_BULK_CREDENTIALS = 100
+
+@deployments_bp.route('/api/deployments/credentials', methods=['GET'])
+@login_required
+def bulk_deployment_credentials():
+    """Credentials of many of the user's deployments, read concurrently per backend host
+    
+    Repeat ``id`` to choose deployments; by default every deployment with a
+    credentials file is returned, up to MAX_BULK_CREDENTIALS. A null
+    ``credentials`` means that file couldn't be read.
+    """
+    user_id = current_user.id
+    ids = set(request.args.getlist('id', type=int))
+    
+    try:
+        deployments = db_manager.execute_query(
+            "SELECT id, name, credentials_file, backend_host_id FROM deployments "
+            "WHERE user_id = %s AND credentials_file IS NOT NULL ORDER BY id", (user_id,), fetch=True
+        )
+        if ids:
+            deployments = [d for d in deployments if d['id'] in ids]
+        deployments = deployments[:MAX_BULK_CREDENTIALS]
+        
+        paths_by_host = {}
+        for d in deployments:
+            paths_by_host.setdefault(d['backend_host_id'], []).append(d['credentials_file'])
+        contents = {}
+        for backend_host_id, paths in paths_by_host.items():
+            contents.update(deployment_service.read_credentials_files(paths, backend_host_id))
+        
+        response = jsonify({'results': {
+            d['id']: {'name': d['name'], 'credentials': contents.get(d['credentials_file'])} for d in deployments
+        }})
+        # [SECURITY] Secrets must not be stored by the browser or any cache
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+    except Exception as e:
+        logger.error("Bulk credentials error: %s", e)
+        return jsonify({'error': 'Internal server error'}), 500
@@ -1,34 +1,47 @@
 """
 Health check routes
 """
-from flask import Blueprint, jsonify
+from flask import Blueprint, Response, jsonify, current_app
 from datetime import datetime
-from database import db_manager
+from health_monitor import health_monitor, STATUS_DOWN
 
 health_bp = Blueprint('health', __name__)
 
+def _snapshot_response(snapshot, status_code):
+    response = Response(snapshot.body, status=status_code, mimetype='application/json')
+    response.headers['Cache-Control'] = 'no-store'
+    response.headers['X-Health-Age'] = f"{snapshot.age():.1f}"
+    return response
+
+def _pending_response():
+    return jsonify({
+        'status': 'starting',
+        'timestamp': datetime.now().isoformat()
+    }), 503
+
 @health_bp.route('/health')
 def health_check():
-    """Health check endpoint for monitoring"""
-    try:
-        # Test database connection
-        result = db_manager.execute_query("SELECT 1 as test", fetch_one=True)
-        if result and result['test'] == 1:
-            return jsonify({
-                'status': 'healthy',
-                'database': 'connected',
-                'timestamp': datetime.now().isoformat()
-            }), 200
-        else:
-            return jsonify({
-                'status': 'unhealthy',
-                'database': 'error',
-                'timestamp': datetime.now().isoformat()
-            }), 500
-    except Exception as e:
-        return jsonify({
-            'status': 'unhealthy',
-            'database': 'error',
-            'error': str(e),
-            'timestamp': datetime.now().isoformat()
-        }), 500
+    """Full dependency report from the last background probe"""
+    snapshot = health_monitor.snapshot()
+    if snapshot is None:
+        return _pending_response()
+    return _snapshot_response(snapshot, 503 if snapshot.status == STATUS_DOWN else 200)
+
+@health_bp.route('/health/ready')
+def readiness():
+    """200 while the database and at least one backend answered recently"""
+    snapshot = health_monitor.snapshot()
+    if snapshot is None:
+        return _pending_response()
+    return _snapshot_response(snapshot, 200 if health_monitor.is_ready() else 503)
+
+@health_bp.route('/health/live')
+def liveness():
+    """The process is up and serving requests"""
+    snapshot = health_monitor.snapshot()
+    return jsonify({
+        'status': 'alive',
+        'uptime': round(health_monitor.uptime(), 1),
+        'last_probe_age': round(snapshot.age(), 1) if snapshot else None,
+        'startup': current_app.config.get('STARTUP_REPORT')
+    }), 200
@@ -1,42 +1,92 @@
 """
 Marketplace routes
 """
-from flask import Blueprint, render_template, redirect, url_for, session, flash
-from marketplace_data import MARKETPLACE_APPS
+import json
+from flask import Blueprint, render_template, redirect, url_for, flash, request, Response, abort, send_file
+from markupsafe import Markup
+from marketplace_catalog import marketplace_catalog
+from auth import login_required
 
 marketplace_bp = Blueprint('marketplace', __name__)
 
-def login_required(f):
-    """Decorator to require login"""
-    def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
-            return redirect(url_for('auth.login'))
-        return f(*args, **kwargs)
-    decorated_function.__name__ = f.__name__
-    return decorated_function
+# Logo URLs carry a content fingerprint, so a cached copy never goes stale
+LOGO_MAX_AGE = 31536000
+
+def logo_url(app):
+    """Fingerprinted local logo, or the original image until the logo is vendored"""
+    if app['logo_file']:
+        return url_for('marketplace.marketplace_logo', filename=app['logo_file'])
+    return app['source_image']
+
+def _render_grid(snapshot):
+    return Markup(render_template('marketplace_grid.html', apps=snapshot.apps.values(), logo_url=logo_url))
 
 @marketplace_bp.route('/marketplace')
 @login_required
 def marketplace():
     """Marketplace main page - requires authentication"""
-    return render_template('marketplace.html', apps=MARKETPLACE_APPS)
+    snapshot = marketplace_catalog.snapshot()
+    return render_template('marketplace.html',
+                           categories=snapshot.categories,
+                           grid=marketplace_catalog.fragment(_render_grid))
+
+@marketplace_bp.route('/api/marketplace/apps')
+@login_required
+def marketplace_apps_api():
+    """Catalog listing filtered by ``category`` and free-text ``q``, revalidated by ETag"""
+    snapshot = marketplace_catalog.snapshot()
+    category = request.args.get('category') or None
+    query = request.args.get('q') or None
+
+    etag = snapshot.etag(query, category)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        def build():
+            return json.dumps({
+                'version': snapshot.version,
+                'categories': [{'id': id, 'label': label} for id, label in snapshot.categories],
+                'apps': [{
+                    'name': app['name'],
+                    'category': app['category'],
+                    'description': app['description'],
+                    'deployment_type': app['deployment_type'],
+                    'logo_url': logo_url(app),
+                    'deploy_url': url_for('marketplace.marketplace_deploy', app_name=app['name']) if app['deployment_type'] else None
+                } for app in snapshot.search(query, category)]
+            })
+        response = Response(snapshot.cached_response(etag, build), mimetype='application/json')
+    response.set_etag(etag)
+    # The catalog is the same for every user; clients revalidate instead of re-downloading
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+@marketplace_bp.route('/marketplace/logos/<filename>')
+def marketplace_logo(filename):
+    """Vendored app logo under its fingerprinted name"""
+    path = marketplace_catalog.logo_path(filename)
+    if path is None:
+        abort(404)
+    response = send_file(path, max_age=LOGO_MAX_AGE)
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
 
 @marketplace_bp.route('/marketplace/deploy/<app_name>')
 @login_required
 def marketplace_deploy(app_name):
     """Deploy an app from marketplace - redirect to new deployment with pre-selected type"""
-    if app_name not in MARKETPLACE_APPS:
+    app_info = marketplace_catalog.get(app_name)
+    if app_info is None:
         flash('Application not found', 'error')
         return redirect(url_for('marketplace.marketplace'))
-    
-    app_info = MARKETPLACE_APPS[app_name]
-    
+
     # Check if the app is supported by hostinator
     if not app_info['deployment_type']:
         flash(f'{app_name} deployment is coming soon! Not yet supported.', 'info')
         return redirect(url_for('marketplace.marketplace'))
-    
+
     # Redirect to new deployment with pre-selected type
-    return redirect(url_for('deployments.new_deployment', 
-                           app_name=app_name, 
+    return redirect(url_for('deployments.new_deployment',
+                           app_name=app_name,
                            deployment_type=app_info['deployment_type']))
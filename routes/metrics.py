@@ -0,0 +1,50 @@
+"""
+Prometheus metrics endpoint and request instrumentation
+"""
+import hmac
+import time
+from flask import Blueprint, Response, request, g, abort, before_render_template, template_rendered
+from config import Config
+from metrics import metrics, HTTP_REQUEST_DURATION, TEMPLATE_RENDER_DURATION
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+@metrics_bp.route('/metrics')
+def prometheus_metrics():
+    """Prometheus text exposition of all registered metrics"""
+    # [SECURITY] When METRICS_TOKEN is set, scrapers must present it as a bearer token
+    if Config.METRICS_TOKEN:
+        supplied = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(supplied.encode('utf-8'), f"Bearer {Config.METRICS_TOKEN}".encode('utf-8')):
+            abort(401)
+    return Response(metrics.render(), content_type=PROMETHEUS_CONTENT_TYPE)
+
+def init_request_metrics(app):
+    """Time every request and template render of an app"""
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def observe_request(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - started,
+                request.method, request.endpoint or 'unmatched', str(response.status_code)
+            )
+        return response
+
+    def start_template_timer(sender, template, context, **extra):
+        g.setdefault('template_started', []).append(time.perf_counter())
+
+    def observe_template(sender, template, context, **extra):
+        started = g.get('template_started')
+        if started:
+            TEMPLATE_RENDER_DURATION.observe(time.perf_counter() - started.pop(), template.name or 'string')
+
+    before_render_template.connect(start_template_timer, app, weak=False)
+    template_rendered.connect(observe_template, app, weak=False)
@@ -0,0 +1,87 @@
+"""
+Download marketplace app logos into the local static tree
+
+Each app's source_image is fetched into MARKETPLACE_CONFIG['logo_dir'] and the
+catalog data file is updated to point at the local copy, which the app then
+serves under a fingerprinted URL. Re-run after adding apps; pass --force to
+refresh logos that are already vendored. Exits non-zero when any logo
+couldn't be fetched; those apps keep loading their source_image.
+"""
+import json
+import mimetypes
+import os
+import sys
+import urllib.request
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config
+from marketplace_catalog import slugify
+
+DOWNLOAD_TIMEOUT = 30
+MAX_LOGO_BYTES = 2 * 1024 * 1024
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.svg', '.gif', '.webp', '.ico'}
+
+def extension_for(url, content_type):
+    ext = mimetypes.guess_extension((content_type or '').split(';')[0].strip()) or ''
+    if ext == '.jpe':
+        ext = '.jpg'
+    if ext not in IMAGE_EXTENSIONS:
+        ext = os.path.splitext(url.split('?')[0])[1].lower()
+    return ext if ext in IMAGE_EXTENSIONS else None
+
+def vendor_logos(force=False):
+    """Fetch missing logos and record them in the catalog data file; returns the apps that failed"""
+    catalog_file = Config.MARKETPLACE_CONFIG['catalog_file']
+    logo_dir = Config.MARKETPLACE_CONFIG['logo_dir']
+    os.makedirs(logo_dir, exist_ok=True)
+
+    with open(catalog_file) as f:
+        data = json.load(f)
+
+    changed = False
+    failed = []
+    for app in data['apps']:
+        if app.get('logo') and os.path.isfile(os.path.join(logo_dir, app['logo'])) and not force:
+            continue
+        url = app.get('source_image')
+        if not url:
+            print(f"⚠️ {app['name']}: no source_image")
+            failed.append(app['name'])
+            continue
+
+        print(f"🔍 Fetching {app['name']} logo from {url}")
+        try:
+            request = urllib.request.Request(url, headers={'User-Agent': 'hostinator-logo-vendor/1.0'})
+            with urllib.request.urlopen(request, timeout=DOWNLOAD_TIMEOUT) as response:
+                content = response.read(MAX_LOGO_BYTES + 1)
+                content_type = response.headers.get('Content-Type')
+        except Exception as e:
+            print(f"❌ {app['name']}: {e}")
+            failed.append(app['name'])
+            continue
+
+        ext = extension_for(url, content_type)
+        if len(content) > MAX_LOGO_BYTES or ext is None:
+            print(f"❌ {app['name']}: not an image or too large ({content_type}, {len(content)} bytes)")
+            failed.append(app['name'])
+            continue
+
+        filename = f"{slugify(app['name'])}{ext}"
+        with open(os.path.join(logo_dir, filename), 'wb') as f:
+            f.write(content)
+        app['logo'] = filename
+        changed = True
+        print(f"✅ {app['name']}: saved {filename}")
+
+    if changed:
+        with open(catalog_file, 'w') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"📄 Updated {catalog_file}")
+    if failed:
+        print(f"⚠️ {len(failed)} logos not vendored: {', '.join(failed)}")
+    return failed
+
+if __name__ == '__main__':
+    sys.exit(1 if vendor_logos(force='--force' in sys.argv[1:]) else 0)
@@ -1,74 +1,119 @@
 """
 SSH connection and remote server management
 """
-import paramiko
+import codecs
 import logging
+import socket
+import time
+from contextlib import contextmanager
+from ssh_pool import ssh_pool
+from metrics import SSH_OPERATION_DURATION, SSH_OPERATION_ERRORS
 
 logger = logging.getLogger(__name__)
 
+# Seconds between checks of a command's output streams when both are quiet
+STREAM_POLL_INTERVAL = 0.05
+
 class SSHManager:
     """SSH connection and remote command execution"""
     
-    def __init__(self, ssh_config):
+    def __init__(self, ssh_config, pool=None):
         self.ssh_config = ssh_config
+        self.pool = pool or ssh_pool
+        self.host_label = f"{ssh_config['hostname']}:{ssh_config['port']}"
     
-    def create_ssh_client(self):
-        """Create and return an SSH client connection"""
-        ssh = paramiko.SSHClient()
-        
-        # [SECURITY] Load system host keys to prevent MitM
-        ssh.load_system_host_keys()
-        
-        # [SECURITY] Use AutoAddPolicy only if strictly necessary, effectively works as 'soft' secure mode.
-        # Ideally, use RejectPolicy() in production if you have pre-populated known_hosts.
-        # For now, we will AutoAdd to avoid disruption but you should populate ~/.ssh/known_hosts
-        ssh.set_missing_host_key_policy(paramiko.AutoAddPolicy()) 
-        # Uncomment below line for strict security (recommended for prod):
-        # ssh.set_missing_host_key_policy(paramiko.RejectPolicy())
-        
+    @contextmanager
+    def _count_errors(self, operation):
         try:
-            ssh.connect(
-                hostname=self.ssh_config['hostname'],
-                port=self.ssh_config['port'],
-                username=self.ssh_config['username'],
-                password=self.ssh_config['password']
-            )
-            return ssh
-        except Exception as e:
-            logger.error(f"Failed to connect to SSH: {e}")
+            yield
+        except Exception:
+            SSH_OPERATION_ERRORS.inc(operation, self.host_label)
             raise
     
+    def stream_command(self, command, timeout=300, chunk_size=4096):
+        """Execute a command and yield ('stdout'|'stderr', text) chunks as they arrive.
+        
+        The last item is ('exit', exit_status). timeout is the longest both
+        streams may stay silent before socket.timeout is raised.
+        """
+        with SSH_OPERATION_DURATION.time('exec', self.host_label), self._count_errors('exec'), \
+                self.pool.channel(self.ssh_config, timeout=timeout) as channel:
+            channel.exec_command(command)
+            stdout_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            stderr_decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            
+            # Poll both streams: blocking on stdout would leave stderr unread, which
+            # both delays it and stops paramiko from reopening the channel window
+            last_activity = time.monotonic()
+            while True:
+                progressed = False
+                if channel.recv_ready():
+                    progressed = True
+                    text = stdout_decoder.decode(channel.recv(chunk_size))
+                    if text:
+                        yield 'stdout', text
+                if channel.recv_stderr_ready():
+                    progressed = True
+                    text = stderr_decoder.decode(channel.recv_stderr(chunk_size))
+                    if text:
+                        yield 'stderr', text
+                if progressed:
+                    last_activity = time.monotonic()
+                    continue
+                # Output precedes the exit status on the wire, so nothing is left once it's in
+                if channel.exit_status_ready() and not channel.recv_ready() and not channel.recv_stderr_ready():
+                    break
+                if time.monotonic() - last_activity > timeout:
+                    raise socket.timeout(f"No output from {self.host_label} for {timeout}s")
+                time.sleep(STREAM_POLL_INTERVAL)
+            
+            tail = stdout_decoder.decode(b'', final=True)
+            if tail:
+                yield 'stdout', tail
+            tail = stderr_decoder.decode(b'', final=True)
+            if tail:
+                yield 'stderr', tail
+            
+            yield 'exit', channel.recv_exit_status()
+    
     def execute_command(self, command, timeout=300):
-        """Execute a command on the remote server via SSH with configurable timeout"""
+        """Execute a command on the remote server via a pooled SSH channel with configurable timeout"""
         try:
-            ssh = self.create_ssh_client()
-            stdin, stdout, stderr = ssh.exec_command(command, timeout=timeout)
-            output = stdout.read().decode('utf-8')
-            error = stderr.read().decode('utf-8')
-            exit_status = stdout.channel.recv_exit_status()
-            ssh.close()
+            output_parts = []
+            error_parts = []
+            exit_status = None
+            for stream, data in self.stream_command(command, timeout=timeout):
+                if stream == 'stdout':
+                    output_parts.append(data)
+                elif stream == 'stderr':
+                    error_parts.append(data)
+                else:
+                    exit_status = data
+            output = ''.join(output_parts)
+            error = ''.join(error_parts)
             
             if exit_status != 0 and error:
-                return {'success': False, 'output': error}
+                return {'success': False, 'output': error, 'exit_status': exit_status}
             
-            return {'success': True, 'output': output if output else "Command executed successfully"}
+            return {'success': True, 'output': output if output else "Command executed successfully", 'exit_status': exit_status}
         except Exception as e:
-            return {'success': False, 'output': f"SSH Error: {str(e)}"}
+            return {'success': False, 'output': f"SSH Error: {str(e)}", 'exit_status': None}
     
     def read_remote_file(self, file_path):
-        """Read a file from the remote server via SSH"""
+        """Read a file from the remote server via SFTP on a pooled transport"""
         if not file_path:
             return None
         
+        import paramiko
         try:
-            ssh = self.create_ssh_client()
-            sftp = ssh.open_sftp()
-            
-            with sftp.open(file_path, 'r') as file:
-                content = file.read().decode('utf-8')
-            
-            sftp.close()
-            ssh.close()
+            with SSH_OPERATION_DURATION.time('sftp', self.host_label), self._count_errors('sftp'), \
+                    self.pool.transport(self.ssh_config) as transport:
+                sftp = paramiko.SFTPClient.from_transport(transport)
+                try:
+                    with sftp.open(file_path, 'r') as file:
+                        content = file.read().decode('utf-8')
+                finally:
+                    sftp.close()
             
             return content
         except Exception as e:
@@ -0,0 +1,263 @@
+"""
+Persistent SSH transport pool shared by all SSHManager instances
+"""
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from config import Config
+from metrics import metrics, SSH_OPERATION_DURATION, SSH_OPERATION_ERRORS
+
+logger = logging.getLogger(__name__)
+
+class SSHPoolTimeout(TimeoutError):
+    """Raised when no channel slot frees up for a host within the acquire timeout"""
+
+class PooledTransport:
+    """An authenticated SSH connection and its channel bookkeeping"""
+
+    def __init__(self, client):
+        self.client = client
+        self.transport = client.get_transport()
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.active_channels = 0
+
+    def is_healthy(self):
+        """Check that the underlying transport is still usable"""
+        return (self.transport is not None
+                and self.transport.is_active()
+                and self.transport.is_authenticated())
+
+    def idle_for(self):
+        return time.monotonic() - self.last_used
+
+    def close(self):
+        try:
+            self.client.close()
+        except Exception as e:
+            logger.debug(f"Error closing SSH transport: {e}")
+
+class SSHConnectionPool:
+    """Thread-safe pool of authenticated paramiko transports keyed by backend host"""
+
+    def __init__(self, max_transports_per_host=4, max_channels_per_transport=8,
+                 keepalive_interval=30, idle_timeout=300, connect_timeout=15, acquire_timeout=30):
+        self.max_transports_per_host = max_transports_per_host
+        self.max_channels_per_transport = max_channels_per_transport
+        self.keepalive_interval = keepalive_interval
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.acquire_timeout = acquire_timeout
+        self._pools = {}
+        self._connecting = {}
+        self._waiting = {}
+        self._lock = threading.Condition()
+
+    @staticmethod
+    def host_key(ssh_config):
+        return (ssh_config['hostname'], ssh_config['port'], ssh_config['username'])
+
+    def _connect(self, ssh_config, timeout=None, pooled=True):
+        """Open and authenticate a new SSH connection
+
+        timeout, when given, also bounds the banner exchange and
+        authentication, not just the TCP connect.
+        """
+        import paramiko  # Deferred: paramiko adds ~100ms to worker boot
+        client = paramiko.SSHClient()
+
+        # [SECURITY] Load system host keys to prevent MitM. AutoAddPolicy keeps
+        # unknown hosts working; use RejectPolicy() in production once
+        # ~/.ssh/known_hosts is populated
+        client.load_system_host_keys()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+
+        host = f"{ssh_config['hostname']}:{ssh_config['port']}"
+        limits = {'timeout': self.connect_timeout}
+        if timeout is not None:
+            limits = {'timeout': timeout, 'banner_timeout': timeout, 'auth_timeout': timeout}
+        started = time.perf_counter()
+        try:
+            client.connect(
+                hostname=ssh_config['hostname'],
+                port=ssh_config['port'],
+                username=ssh_config['username'],
+                password=ssh_config['password'],
+                **limits
+            )
+        except Exception:
+            SSH_OPERATION_ERRORS.inc('connect', host)
+            raise
+        finally:
+            SSH_OPERATION_DURATION.observe(time.perf_counter() - started, 'connect', host)
+        transport = client.get_transport()
+        if self.keepalive_interval:
+            transport.set_keepalive(self.keepalive_interval)
+        logger.info(f"🔐 Opened {'pooled' if pooled else 'unpooled'} SSH transport to {host}")
+        return PooledTransport(client)
+
+    def open_unpooled(self, ssh_config, timeout=None):
+        """A new connection that doesn't count toward the host's limits; the caller closes it"""
+        return self._connect(ssh_config, timeout=timeout, pooled=False)
+
+    def _evict(self, entries):
+        """Drop dead and idle transports from a host's pool (caller holds the lock)"""
+        kept = []
+        for entry in entries:
+            if not entry.is_healthy():
+                entry.close()
+            elif entry.active_channels == 0 and entry.idle_for() > self.idle_timeout:
+                entry.close()
+            else:
+                kept.append(entry)
+        return kept
+
+    def _checkout(self, ssh_config):
+        """Reserve a channel slot on a pooled transport, connecting if necessary
+
+        Waits up to acquire_timeout for a slot on a saturated host, then
+        raises SSHPoolTimeout (a TimeoutError, so an OSError).
+        """
+        key = self.host_key(ssh_config)
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._lock:
+            while True:
+                entries = self._evict(self._pools.get(key, []))
+                self._pools[key] = entries
+
+                available = [e for e in entries if e.active_channels < self.max_channels_per_transport]
+                if available:
+                    entry = min(available, key=lambda e: e.active_channels)
+                    entry.active_channels += 1
+                    entry.last_used = time.monotonic()
+                    return entry
+
+                if len(entries) + self._connecting.get(key, 0) < self.max_transports_per_host:
+                    # Reserve the slot so concurrent callers don't over-connect
+                    self._connecting[key] = self._connecting.get(key, 0) + 1
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SSHPoolTimeout(
+                        f"No SSH channel available for {ssh_config['hostname']}:{ssh_config['port']} "
+                        f"after {self.acquire_timeout}s ({len(entries)} transports busy)"
+                    )
+                self._waiting[key] = self._waiting.get(key, 0) + 1
+                try:
+                    self._lock.wait(timeout=remaining)
+                finally:
+                    self._waiting[key] -= 1
+
+        try:
+            entry = self._connect(ssh_config)
+        finally:
+            with self._lock:
+                self._connecting[key] -= 1
+                self._lock.notify_all()
+
+        entry.active_channels = 1
+        with self._lock:
+            self._pools.setdefault(key, []).append(entry)
+        return entry
+
+    def _checkin(self, ssh_config, entry, discard=False):
+        key = self.host_key(ssh_config)
+        with self._lock:
+            entry.active_channels = max(0, entry.active_channels - 1)
+            entry.last_used = time.monotonic()
+            if discard or not entry.is_healthy():
+                entries = self._pools.get(key, [])
+                if entry in entries:
+                    entries.remove(entry)
+                entry.close()
+            self._lock.notify_all()
+
+    @contextmanager
+    def transport(self, ssh_config):
+        """Borrow a healthy transport for the duration of the block"""
+        import paramiko
+        entry = self._checkout(ssh_config)
+        discard = False
+        try:
+            yield entry.transport
+        except (paramiko.SSHException, EOFError, OSError):
+            discard = not entry.is_healthy()
+            raise
+        finally:
+            self._checkin(ssh_config, entry, discard=discard)
+
+    @contextmanager
+    def channel(self, ssh_config, timeout=None):
+        """Open a session channel on a pooled transport, retrying once on a stale transport"""
+        import paramiko
+        entry = self._checkout(ssh_config)
+        try:
+            channel = entry.transport.open_session()
+        except (paramiko.SSHException, EOFError, OSError) as e:
+            logger.warning(f"Pooled SSH transport unusable, reconnecting: {e}")
+            self._checkin(ssh_config, entry, discard=True)
+            entry = self._checkout(ssh_config)
+            try:
+                channel = entry.transport.open_session()
+            except Exception:
+                self._checkin(ssh_config, entry, discard=True)
+                raise
+
+        if timeout is not None:
+            channel.settimeout(timeout)
+        try:
+            yield channel
+        finally:
+            try:
+                channel.close()
+            finally:
+                self._checkin(ssh_config, entry)
+
+    def evict_idle(self):
+        """Close idle and dead transports across all hosts"""
+        with self._lock:
+            for key in list(self._pools):
+                self._pools[key] = self._evict(self._pools[key])
+
+    def close_all(self):
+        """Close every pooled transport"""
+        with self._lock:
+            for entries in self._pools.values():
+                for entry in entries:
+                    entry.close()
+            self._pools.clear()
+
+    def saturation(self, ssh_config):
+        """Share of a host's channel capacity in use, and callers waiting for a slot"""
+        key = self.host_key(ssh_config)
+        capacity = self.max_transports_per_host * self.max_channels_per_transport
+        with self._lock:
+            in_use = sum(e.active_channels for e in self._pools.get(key, []))
+            return {'saturation': in_use / capacity, 'waiting': self._waiting.get(key, 0)}
+
+    def stats(self):
+        """Return per-host transport and channel counts"""
+        with self._lock:
+            return {
+                f"{host}:{port}": {
+                    'transports': len(entries),
+                    'active_channels': sum(e.active_channels for e in entries)
+                }
+                for (host, port, _user), entries in self._pools.items()
+            }
+
+# Global SSH transport pool instance
+ssh_pool = SSHConnectionPool(**Config.SSH_POOL_CONFIG)
+
+def _pool_samples(key):
+    def collect():
+        for host, counts in ssh_pool.stats().items():
+            yield (host,), counts[key]
+    return collect
+
+metrics.callback('hostinator_ssh_pool_transports', 'Open pooled SSH transports', ('host',),
+                 _pool_samples('transports'))
+metrics.callback('hostinator_ssh_pool_active_channels', 'Channels open on pooled transports', ('host',),
+                 _pool_samples('active_channels'))
@@ -0,0 +1,241 @@
+// Per-page values rendered by the template into #page-data
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+// Variables to handle delete modal
+let pendingDeleteId = null;
+let deleteModalInstance = null;
+
+// Function to show delete modal
+function showDeleteModal(deploymentName, deploymentId) {
+    pendingDeleteId = deploymentId;
+    document.getElementById('deleteDeploymentName').textContent = deploymentName;
+
+    if (!deleteModalInstance) {
+        deleteModalInstance = new bootstrap.Modal(document.getElementById('deleteModal'));
+    }
+    deleteModalInstance.show();
+}
+
+// Function to confirm delete
+function confirmDelete() {
+    if (pendingDeleteId) {
+        // Hide modal first
+        deleteModalInstance.hide();
+
+        // Set form action and submit after a small delay
+        setTimeout(() => {
+            const form = document.getElementById('deleteForm');
+            form.action = `/deployment/delete/${pendingDeleteId}`;
+            form.submit();
+        }, 200);
+    }
+}
+
+// Deployment Types Chart with more colors
+const typeCtx = document.getElementById('deploymentTypesChart').getContext('2d');
+const typeData = {
+    labels: pageData.deploymentTypes.labels,
+    datasets: [{
+        data: pageData.deploymentTypes.counts,
+        backgroundColor: [
+            '#0d6efd',  // Blue - Primary color
+            '#28a745',  // Green - Success
+            '#ffc107',  // Yellow/Gold
+            '#dc3545',  // Red
+            '#6610f2',  // Purple
+            '#17a2b8',  // Cyan
+            '#e83e8c',  // Pink
+            '#fd7e14',  // Orange
+            '#20c997',  // Teal
+            '#6c757d',  // Gray
+            '#343a40',  // Dark
+            '#007bff'   // Light Blue
+        ],
+        hoverBackgroundColor: [
+            '#0b5ed7',  // Darker Blue
+            '#218838',  // Darker Green
+            '#e0a800',  // Darker Yellow
+            '#c82333',  // Darker Red
+            '#560bd0',  // Darker Purple
+            '#138496',  // Darker Cyan
+            '#d91a5c',  // Darker Pink
+            '#e96200',  // Darker Orange
+            '#1aa179',  // Darker Teal
+            '#5a6268',  // Darker Gray
+            '#23272b',  // Darker Dark
+            '#0056b3'   // Darker Light Blue
+        ],
+        hoverBorderColor: "rgba(234, 236, 244, 1)",
+    }]
+};
+new Chart(typeCtx, {
+    type: 'doughnut',
+    data: typeData,
+    options: {
+        maintainAspectRatio: true,
+        aspectRatio: 1.5,
+        plugins: {
+            legend: {
+                position: 'bottom',
+                labels: {
+                    padding: 10,
+                    font: {
+                        size: 11
+                    }
+                }
+            }
+        },
+        cutout: '70%'
+    }
+});
+
+// Deployment Status Chart
+const statusCtx = document.getElementById('deploymentStatusChart').getContext('2d');
+const statusData = {
+    labels: ['Active', 'Inactive', 'Pending'],
+    datasets: [{
+        label: 'Number of Deployments',
+        data: pageData.statusCounts,
+        backgroundColor: [
+            'rgba(40, 167, 69, 0.7)',
+            'rgba(220, 53, 69, 0.7)',
+            'rgba(255, 193, 7, 0.7)'
+        ],
+        borderColor: [
+            'rgb(40, 167, 69)',
+            'rgb(220, 53, 69)',
+            'rgb(255, 193, 7)'
+        ],
+        borderWidth: 1
+    }]
+};
+new Chart(statusCtx, {
+    type: 'bar',
+    data: statusData,
+    options: {
+        maintainAspectRatio: true,
+        aspectRatio: 1.5,
+        scales: {
+            y: {
+                beginAtZero: true,
+                ticks: {
+                    precision: 0
+                }
+            }
+        },
+        plugins: {
+            legend: {
+                display: false  // Hide legend for bar chart to save space
+            }
+        }
+    }
+});
+
+// View credentials function
+function viewCredentials(id, domain) {
+    const credentialsModal = new bootstrap.Modal(document.getElementById('credentialsModal'));
+    document.getElementById('credentialsDomain').textContent = domain;
+    document.getElementById('credentials-table-modal').innerHTML = '<tr><td colspan="2">Loading...</td></tr>';
+
+    fetch(`/deployment/credentials/${id}`)
+        .then(response => response.json())
+        .then(data => {
+            if (data.error) {
+                document.getElementById('credentials-table-modal').innerHTML = 
+                    `<tr><td colspan="2">Error: ${data.error}</td></tr>`;
+            } else {
+                const credentialsTable = document.getElementById('credentials-table-modal');
+                credentialsTable.innerHTML = '';
+
+                // Parse and display credentials
+                const lines = data.credentials.split('\n');
+                lines.forEach(line => {
+                    if (line.trim() === '') return;
+
+                    const row = document.createElement('tr');
+
+                    if (line.includes(':')) {
+                        const parts = line.split(':', 1);
+                        const key = parts[0];
+                        const value = line.substring(key.length + 1).trim();
+
+                        row.innerHTML = `
+                            <th style="width: 40%;">${key}</th>
+                            <td class="d-flex justify-content-between align-items-center">
+                                <span class="credential-value">${value}</span>
+                                <button class="btn btn-sm btn-outline-secondary copy-btn" 
+                                        onclick="copyCredentialValue(this)" 
+                                        data-value="${value}">
+                                    <i class="bi bi-clipboard"></i>
+                                </button>
+                            </td>
+                        `;
+                    } else {
+                        row.innerHTML = `<td colspan="2">${line}</td>`;
+                    }
+
+                    credentialsTable.appendChild(row);
+                });
+            }
+        })
+        .catch(error => {
+            document.getElementById('credentials-table-modal').innerHTML = 
+                `<tr><td colspan="2">Error: ${error.message}</td></tr>`;
+        });
+
+    credentialsModal.show();
+}
+
+// Copy individual credential value
+function copyCredentialValue(button) {
+    const value = button.getAttribute('data-value');
+
+    // Create a temporary textarea element to copy from
+    const textarea = document.createElement('textarea');
+    textarea.value = value;
+    textarea.setAttribute('readonly', '');
+    textarea.style.position = 'absolute';
+    textarea.style.left = '-9999px';
+    document.body.appendChild(textarea);
+
+    // Select and copy the text
+    textarea.select();
+    document.execCommand('copy');
+
+    // Remove the temporary element
+    document.body.removeChild(textarea);
+
+    // Change button icon temporarily to show success
+    const icon = button.querySelector('i');
+    icon.classList.remove('bi-clipboard');
+    icon.classList.add('bi-check');
+
+    setTimeout(() => {
+        icon.classList.remove('bi-check');
+        icon.classList.add('bi-clipboard');
+    }, 1500);
+}
+
+// Copy all credentials
+function copyAllCredentials() {
+    const values = Array.from(document.querySelectorAll('.credential-value'))
+                       .map(el => el.textContent)
+                       .join('\n');
+
+    // Create a temporary textarea element to copy from
+    const textarea = document.createElement('textarea');
+    textarea.value = values;
+    textarea.setAttribute('readonly', '');
+    textarea.style.position = 'absolute';
+    textarea.style.left = '-9999px';
+    document.body.appendChild(textarea);
+
+    // Select and copy the text
+    textarea.select();
+    document.execCommand('copy');
+
+    // Remove the temporary element
+    document.body.removeChild(textarea);
+
+    alert('All credentials copied to clipboard!');
+}
@@ -0,0 +1,55 @@
+// Copy individual credential value
+function copyCredentialValue(button) {
+    const value = button.getAttribute('data-value');
+
+    // Create a temporary textarea element to copy from
+    const textarea = document.createElement('textarea');
+    textarea.value = value;
+    textarea.setAttribute('readonly', '');
+    textarea.style.position = 'absolute';
+    textarea.style.left = '-9999px';
+    document.body.appendChild(textarea);
+
+    // Select and copy the text
+    textarea.select();
+    document.execCommand('copy');
+
+    // Remove the temporary element
+    document.body.removeChild(textarea);
+
+    // Change button icon temporarily to show success
+    const icon = button.querySelector('i');
+    icon.classList.remove('bi-clipboard');
+    icon.classList.add('bi-check');
+
+    setTimeout(() => {
+        icon.classList.remove('bi-check');
+        icon.classList.add('bi-clipboard');
+    }, 1500);
+}
+
+// Copy all credentials
+function copyAllCredentials() {
+    const content = document.getElementById('credentialsContent') ? 
+                    document.getElementById('credentialsContent').textContent : 
+                    Array.from(document.querySelectorAll('.credential-value'))
+                         .map(el => el.textContent)
+                         .join('\n');
+
+    // Create a temporary textarea element to copy from
+    const textarea = document.createElement('textarea');
+    textarea.value = content;
+    textarea.setAttribute('readonly', '');
+    textarea.style.position = 'absolute';
+    textarea.style.left = '-9999px';
+    document.body.appendChild(textarea);
+
+    // Select and copy the text
+    textarea.select();
+    document.execCommand('copy');
+
+    // Remove the temporary element
+    document.body.removeChild(textarea);
+
+    alert('All credentials copied to clipboard!');
+}
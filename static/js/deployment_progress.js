@@ -0,0 +1,314 @@
+// Per-page values rendered by the template into #page-data
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+// Deployment progress steps
+const deploymentSteps = [
+    { message: "Initializing deployment...", progress: 5 },
+    { message: "Setting up environment...", progress: 15 },
+    { message: "Creating database...", progress: 30 },
+    { message: `Configuring ${pageData.deploymentType}...`, progress: 50 },
+    { message: "Setting up web server...", progress: 70 },
+    { message: "Finalizing deployment...", progress: 85 },
+    { message: "Deployment complete!", progress: 100 }
+];
+
+// Store deployment type and name for later use
+const deploymentType = pageData.deploymentType;
+const deploymentName = pageData.deploymentName;
+
+let currentStep = 0;
+let progressInterval;
+let statusPollTimer;
+let statusPolling = false;
+let statusLastModified = null;
+let deploymentStarted = false;
+let jobId = null;
+let jobOutputShown = false;
+let statusSource = null;
+let logInterval;
+let logOffset = 0;
+
+// Function to update progress UI
+function updateProgress(step) {
+    if (step < deploymentSteps.length) {
+        document.getElementById('progress-bar').style.width = deploymentSteps[step].progress + '%';
+        document.getElementById('status-message').textContent = deploymentSteps[step].message;
+
+        // Add log entry
+        const logs = document.getElementById('deployment-logs');
+        const timestamp = new Date().toLocaleTimeString();
+        logs.textContent += `\n[${timestamp}] ${deploymentSteps[step].message}`;
+
+        // Auto-scroll logs to bottom
+        const logsContainer = logs.parentElement.parentElement;
+        logsContainer.scrollTop = logsContainer.scrollHeight;
+    }
+}
+
+// Function to stop all status updates
+function stopStatusUpdates() {
+    clearInterval(progressInterval);
+    statusPolling = false;
+    clearTimeout(statusPollTimer);
+    if (statusSource) {
+        statusSource.close();
+        statusSource = null;
+    }
+    if (logInterval) {
+        clearInterval(logInterval);
+        logInterval = null;
+        pollLogs();
+    }
+}
+
+// Function to append new live script output from the last offset
+function pollLogs() {
+    fetch(`/api/deployment-logs/${pageData.deploymentId}?offset=${logOffset}`, {
+        method: 'GET',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Requested-With': 'XMLHttpRequest'
+        }
+    })
+    .then(response => response.json())
+    .then(data => {
+        if (!data.output) return;
+
+        const logs = document.getElementById('deployment-logs');
+        if (logOffset === 0) {
+            logs.textContent += `\n\n[${new Date().toLocaleTimeString()}] Server Output:\n`;
+        }
+        if (data.truncated) {
+            logs.textContent += '\n[... earlier output truncated ...]\n';
+        }
+        logs.textContent += data.output;
+        logOffset = data.offset;
+
+        const logsContainer = logs.parentElement.parentElement;
+        logsContainer.scrollTop = logsContainer.scrollHeight;
+    })
+    .catch(error => {
+        console.log('Log poll error (will retry):', error);
+    });
+}
+
+// Function to react to a deployment status update (pushed or polled)
+function handleDeploymentStatus(data) {
+    const logs = document.getElementById('deployment-logs');
+    const timestamp = new Date().toLocaleTimeString();
+
+    if (data.status === 'Active') {
+        // Deployment succeeded!
+        stopStatusUpdates();
+
+        // Complete the progress bar
+        updateProgress(deploymentSteps.length - 1);
+
+        logs.textContent += `\n[${timestamp}] ✅ Deployment completed successfully!`;
+        // FIXED: Use the stored deploymentType variable instead of undefined
+        logs.textContent += `\n[${timestamp}] Your ${deploymentType} deployment is now active and accessible.`;
+
+        // Show success message
+        document.getElementById('deployment-status').classList.add('d-none');
+        document.getElementById('deployment-complete').classList.remove('d-none');
+
+        checkJobStatus(5);
+
+    } else if (data.status === 'Failed' || data.status === 'Deleted') {
+        // Deployment failed
+        logs.textContent += `\n[${timestamp}] ❌ Deployment failed.`;
+        showDeploymentFailed('Deployment failed');
+
+    } else if (data.status === 'Inactive') {
+        // Inactive may be left over from an earlier attempt; the job decides
+        checkJobStatus(5);
+    }
+    // If status is still 'Pending' or 'Deploying', keep waiting
+}
+
+// Seconds the server may hold a status poll open (at most STATUS_LONG_POLL_MAX_WAIT)
+const STATUS_POLL_WAIT = 25;
+// Delay before polling again after a failed request
+const STATUS_POLL_RETRY_DELAY = 5000;
+
+// Function to long-poll deployment status; the server answers when it changes
+function checkDeploymentStatus() {
+    if (!statusPolling) return;
+
+    const headers = {
+        'Content-Type': 'application/json',
+        'X-Requested-With': 'XMLHttpRequest'
+    };
+    if (statusLastModified) {
+        headers['If-Modified-Since'] = statusLastModified;
+    }
+
+    fetch(`/api/deployment-status/${pageData.deploymentId}?wait=${STATUS_POLL_WAIT}`, {
+        method: 'GET',
+        headers: headers,
+        cache: 'no-store'
+    })
+    .then(response => {
+        const lastModified = response.headers.get('Last-Modified');
+        if (lastModified) statusLastModified = lastModified;
+        // 304: nothing changed during the wait
+        if (response.status === 304) return null;
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+    })
+    .then(data => {
+        if (data) handleDeploymentStatus(data);
+        checkJobStatus();
+        // Poll again straight away; the server does the waiting. Without a
+        // Last-Modified to send it can't wait, so back off instead of spinning
+        const delay = statusLastModified ? 0 : STATUS_POLL_RETRY_DELAY;
+        if (statusPolling) statusPollTimer = setTimeout(checkDeploymentStatus, delay);
+    })
+    .catch(error => {
+        console.log('Status check error (will retry):', error);
+        // Don't stop polling on error, just back off briefly
+        if (statusPolling) statusPollTimer = setTimeout(checkDeploymentStatus, STATUS_POLL_RETRY_DELAY);
+    });
+}
+
+// Function to subscribe to pushed status updates, falling back to long-polling
+function startStatusUpdates() {
+    if (window.EventSource) {
+        statusSource = new EventSource(`/api/deployment-status/${pageData.deploymentId}/stream`);
+        statusSource.addEventListener('status', event => {
+            handleDeploymentStatus(JSON.parse(event.data));
+        });
+        return;
+    }
+
+    statusPolling = true;
+    checkDeploymentStatus();
+}
+
+// Function to show failure state in the UI
+function showDeploymentFailed(message) {
+    stopStatusUpdates();
+
+    document.getElementById('progress-bar').classList.remove('progress-bar-animated', 'progress-bar-striped');
+    document.getElementById('progress-bar').classList.add('bg-danger');
+    document.getElementById('status-message').textContent = message;
+
+    document.getElementById('deployment-status').classList.add('d-none');
+    document.getElementById('deployment-failed').classList.remove('d-none');
+}
+
+// Function to check the background job running this deployment
+function checkJobStatus(retries = 0) {
+    if (!jobId || jobOutputShown) return;
+
+    fetch(`/api/jobs/${jobId}`, {
+        method: 'GET',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Requested-With': 'XMLHttpRequest'
+        }
+    })
+    .then(response => response.json())
+    .then(job => {
+        if (job.status !== 'Completed' && job.status !== 'Failed') {
+            // The job records its result just after the status changes
+            if (retries > 0) setTimeout(() => checkJobStatus(retries - 1), 1000);
+            return;
+        }
+
+        const logs = document.getElementById('deployment-logs');
+        const timestamp = new Date().toLocaleTimeString();
+        jobOutputShown = true;
+
+        // Output already streamed live doesn't need repeating
+        if (job.output && logOffset === 0) {
+            logs.textContent += `\n\n[${timestamp}] Server Response:\n${job.output}`;
+        }
+        if (job.status === 'Failed') {
+            if (job.error) {
+                logs.textContent += `\n[${timestamp}] ${job.error}`;
+            }
+            logs.textContent += `\n[${timestamp}] ❌ Deployment failed.`;
+            showDeploymentFailed('Deployment failed');
+        }
+    })
+    .catch(error => {
+        console.log('Job status check error (will retry):', error);
+    });
+}
+
+// Function to execute deployment
+function executeDeployment() {
+    // Start progress animation
+    updateProgress(currentStep);
+
+    progressInterval = setInterval(() => {
+        currentStep++;
+        if (currentStep < deploymentSteps.length - 1) {
+            updateProgress(currentStep);
+        }
+        // Don't clear interval here - let status polling handle completion
+    }, 3000);
+
+    startStatusUpdates();
+
+    // Make API call to start deployment (fire and forget)
+    fetch(`/api/execute-deployment/${pageData.deploymentId}`, {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-Requested-With': 'XMLHttpRequest'
+        }
+    })
+    .then(response => {
+        deploymentStarted = true;
+        const contentType = response.headers.get('content-type');
+        if (!contentType || !contentType.includes('application/json')) {
+            throw new Error('Server returned non-JSON response');
+        }
+        return response.json();
+    })
+    .then(data => {
+        // The deployment now runs as a background job; status polling handles the result
+        const logs = document.getElementById('deployment-logs');
+        const timestamp = new Date().toLocaleTimeString();
+
+        if (data.job_id) {
+            jobId = data.job_id;
+            logs.textContent += `\n[${timestamp}] Deployment queued (job #${jobId})`;
+            logInterval = setInterval(pollLogs, 2000);
+        } else if (!data.success) {
+            logs.textContent += `\n\n[${timestamp}] ❌ ${data.output || data.error}`;
+            showDeploymentFailed('Failed to start deployment');
+        }
+    })
+    .catch(error => {
+        const logs = document.getElementById('deployment-logs');
+        const timestamp = new Date().toLocaleTimeString();
+
+        if (!deploymentStarted) {
+            // Only show error if deployment never started
+            clearInterval(progressInterval);
+            statusPolling = false;
+            clearTimeout(statusPollTimer);
+
+            logs.textContent += `\n\n[${timestamp}] ❌ Failed to start deployment: ${error.message}`;
+
+            document.getElementById('progress-bar').classList.remove('progress-bar-animated', 'progress-bar-striped');
+            document.getElementById('progress-bar').classList.add('bg-danger');
+            document.getElementById('status-message').textContent = 'Failed to start deployment';
+
+            document.getElementById('deployment-status').classList.add('d-none');
+            document.getElementById('deployment-failed').classList.remove('d-none');
+        } else {
+            // Deployment started but API response failed - rely on status polling
+            logs.textContent += `\n[${timestamp}] Monitoring deployment status...`;
+        }
+    });
+}
+
+// Cleanup intervals when page unloads
+window.addEventListener('beforeunload', stopStatusUpdates);
+
+// Start deployment when page loads
+document.addEventListener('DOMContentLoaded', executeDeployment);
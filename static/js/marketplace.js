@@ -0,0 +1,84 @@
+// Per-page values rendered by the template into #page-data
+const pageData = JSON.parse(document.getElementById('page-data').textContent);
+
+const searchInput = document.getElementById('searchInput');
+const cards = document.querySelectorAll('.app-card');
+const noResults = document.getElementById('noResults');
+
+// Search functionality
+searchInput?.addEventListener('input', () => {
+    const value = searchInput.value.toLowerCase();
+    let visibleCards = 0;
+
+    cards.forEach(card => {
+        const name = card.getAttribute('data-name').toLowerCase();
+        const description = card.querySelector('.card-text').textContent.toLowerCase();
+        const isVisible = name.includes(value) || description.includes(value);
+
+        card.style.display = isVisible ? 'block' : 'none';
+        if (isVisible) visibleCards++;
+    });
+
+    // Show/hide no results message
+    noResults.classList.toggle('d-none', visibleCards > 0);
+});
+
+// Category filter functionality
+function filterCategory(category) {
+    let visibleCards = 0;
+
+    // Update active button
+    document.querySelectorAll('#categoryFilters .btn').forEach(btn => {
+        btn.classList.remove('active');
+    });
+    event.target.classList.add('active');
+
+    cards.forEach(card => {
+        const cardCategory = card.getAttribute('data-category');
+        const isVisible = category === 'all' || cardCategory === category;
+
+        card.style.display = isVisible ? 'block' : 'none';
+        if (isVisible) visibleCards++;
+    });
+
+    // Show/hide no results message
+    noResults.classList.toggle('d-none', visibleCards > 0);
+
+    // Clear search when filtering
+    if (searchInput) searchInput.value = '';
+}
+
+// Show app details modal
+function showAppDetails(name, description, image, deploymentType) {
+    document.getElementById('modalAppName').textContent = name;
+    document.getElementById('modalAppDescription').textContent = description;
+    document.getElementById('modalAppImage').src = image;
+
+    const statusDiv = document.getElementById('modalAppStatus');
+    const deployButtonDiv = document.getElementById('modalDeployButton');
+
+    if (deploymentType) {
+        statusDiv.innerHTML = '<span class="badge bg-success">✓ Ready to Deploy</span>';
+        deployButtonDiv.innerHTML = `<a href="${pageData.deployUrlPrefix}${name}" class="btn btn-primary"><i class="bi bi-rocket-takeoff me-2"></i>Deploy Now</a>`;
+    } else {
+        statusDiv.innerHTML = '<span class="badge bg-warning">Coming Soon</span>';
+        deployButtonDiv.innerHTML = '<button class="btn btn-outline-primary" disabled><i class="bi bi-clock me-2"></i>Not Available Yet</button>';
+    }
+
+    const modal = new bootstrap.Modal(document.getElementById('appDetailsModal'));
+    modal.show();
+}
+
+// Animate cards on load
+document.addEventListener('DOMContentLoaded', () => {
+    cards.forEach((card, index) => {
+        card.style.opacity = '0';
+        card.style.transform = 'translateY(20px)';
+
+        setTimeout(() => {
+            card.style.transition = 'opacity 0.3s ease, transform 0.3s ease';
+            card.style.opacity = '1';
+            card.style.transform = 'translateY(0)';
+        }, index * 100);
+    });
+});
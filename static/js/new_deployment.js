@@ -0,0 +1,32 @@
+// Form validation
+document.querySelector('form')?.addEventListener('submit', function(e) {
+    const domain = document.getElementById('name').value;
+    const email = document.getElementById('email').value;
+
+    // Basic domain validation
+    if (!domain.includes('.') || domain.length < 4) {
+        e.preventDefault();
+        alert('Please enter a valid domain name (e.g., example.com)');
+        return false;
+    }
+
+    // Email validation
+    const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+    if (!emailRegex.test(email)) {
+        e.preventDefault();
+        alert('Please enter a valid email address');
+        return false;
+    }
+
+    // Show loading state
+    const submitBtn = this.querySelector('button[type="submit"]');
+    const originalText = submitBtn.innerHTML;
+    submitBtn.innerHTML = '<i class="bi bi-arrow-repeat me-2 spin"></i>Starting deployment...';
+    submitBtn.disabled = true;
+
+    // Re-enable if there's an error (won't execute if form submits successfully)
+    setTimeout(() => {
+        submitBtn.innerHTML = originalText;
+        submitBtn.disabled = false;
+    }, 5000);
+});
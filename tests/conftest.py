@@ -0,0 +1,42 @@
+"""
+Shared fake SSH backend; Config is read once at import, so every test module uses this one
+"""
+import os
+import threading
+import pytest
+from benchmarks.fake_ssh import FakeSSHBackend
+from benchmarks.run import configure_environment
+
+PER_HOST_LIMIT = 2
+
+class TrackingSSHBackend(FakeSSHBackend):
+    """Fake backend that records the most commands it ran at once"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.active = 0
+        self.peak = 0
+        self._tracking_lock = threading.Lock()
+
+    def run_command(self, channel, command):
+        with self._tracking_lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            super().run_command(channel, command)
+        finally:
+            with self._tracking_lock:
+                self.active -= 1
+
+@pytest.fixture(scope='session')
+def backend():
+    os.environ['ASYNC_SSH_MAX_PER_HOST'] = str(PER_HOST_LIMIT)
+    backend = TrackingSSHBackend(latency=0.05).start()
+    configure_environment(backend)
+    yield backend
+    backend.stop()
+
+@pytest.fixture
+def ssh_config(backend):
+    return {'hostname': '127.0.0.1', 'port': backend.port,
+            'username': backend.username, 'password': backend.password}
@@ -0,0 +1,88 @@
+"""
+Concurrent SSH helpers against the in-process fake SSH backend
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks.fake_ssh import CREDENTIALS_CONTENT
+from tests.conftest import PER_HOST_LIMIT
+
+@pytest.fixture
+def service(backend):
+    from deployment_service import DeploymentService
+    service = DeploymentService()
+    service.credentials_cache.clear()
+    backend.peak = 0
+    return service
+
+def test_run_commands_returns_results_in_order(backend, service):
+    results = service.run_commands(['echo 1', 'echo 2', 'echo 3'])
+
+    assert [result['success'] for result in results] == [True, True, True]
+    assert all('Deployment completed' in result['output'] for result in results)
+
+def test_host_limit_holds_across_concurrent_callers(backend, service):
+    # Each call runs its own event loop; together they must still respect the host limit
+    callers = [threading.Thread(target=service.run_commands, args=([f'echo {n}' for n in range(4)],))
+               for _ in range(3)]
+    for caller in callers:
+        caller.start()
+    for caller in callers:
+        caller.join()
+
+    assert backend.peak == PER_HOST_LIMIT
+
+def test_busy_host_does_not_starve_other_hosts_of_executor_threads(backend, ssh_config, service, monkeypatch):
+    import async_ssh
+    # No more workers than one host's limit: calls waiting on that host must not hold any
+    executor = ThreadPoolExecutor(max_workers=PER_HOST_LIMIT)
+    monkeypatch.setattr(async_ssh, '_executor', executor)
+    busy_commands = 30
+    execs_before = backend.operations['exec']
+
+    callers = [threading.Thread(target=service.run_commands, args=([f'echo {n}' for n in range(10)],))
+               for _ in range(busy_commands // 10)]
+    for caller in callers:
+        caller.start()
+    time.sleep(0.1)
+    # Same backend under another name, so it counts as a different host
+    other_host = async_ssh.AsyncSSHManager(dict(ssh_config, hostname='localhost'))
+    result = asyncio.run(other_host.execute_command('echo other'))
+    busy_started = backend.operations['exec'] - execs_before - 1
+    for caller in callers:
+        caller.join()
+    executor.shutdown()
+
+    assert result['success']
+    # The other host's command ran ahead of the busy host's backlog, not behind it
+    assert busy_started < busy_commands
+
+def test_read_credentials_files_reads_concurrently_and_caches(backend, service):
+    paths = [f"/home/site{n}.example.com/credentials_site{n}.example.com.txt" for n in range(4)]
+
+    contents = service.read_credentials_files(paths)
+    assert contents == {path: CREDENTIALS_CONTENT.decode('utf-8') for path in paths}
+
+    sftp_before = backend.operations['sftp']
+    assert service.read_credentials_files(paths) == contents
+    assert backend.operations['sftp'] == sftp_before
+
+def test_host_gate_cancelled_waiter_does_not_leak_its_slot(backend):
+    from async_ssh import HostGate
+    gate = HostGate(1)
+
+    async def scenario():
+        await gate.acquire()
+        waiter = asyncio.ensure_future(gate.acquire())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        gate.release()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        await asyncio.wait_for(gate.acquire(), timeout=1)
+        gate.release()
+
+    asyncio.run(scenario())
+    assert gate.in_use == 0
@@ -0,0 +1,37 @@
+"""
+Bulk container actions keyed by deployment id
+"""
+import re
+import pytest
+
+class ScriptedSSHManager:
+    """Answers a bulk session as the backend would, with a chosen exit status per deployment id"""
+
+    def __init__(self, exit_statuses):
+        self.exit_statuses = exit_statuses
+
+    def execute_command(self, command, timeout=300):
+        output = []
+        for deployment_id in re.findall(r'BEGIN (\d+) ', command):
+            output.append(f"__HOSTINATOR_BULK__BEGIN {deployment_id} same.example.com")
+            output.append(f"output of {deployment_id}")
+            output.append(f"__HOSTINATOR_BULK__END {deployment_id} {self.exit_statuses[int(deployment_id)]}")
+        return {'success': True, 'output': '\n'.join(output), 'exit_status': 0}
+
+@pytest.fixture
+def service(backend, monkeypatch):
+    # Imported here: Config is read at import, after the backend fixture sets the environment
+    from deployment_service import DeploymentService
+    service = DeploymentService()
+    monkeypatch.setattr(service, 'ssh_manager_for', lambda backend_host_id: ScriptedSSHManager({1: 0, 2: 1}))
+    return service
+
+def test_deployments_sharing_a_name_get_their_own_results(service):
+    results = service.execute_bulk_action('stop', [
+        (1, 'same.example.com', 'wordpress', 1),
+        (2, 'same.example.com', 'wordpress', 1),
+    ])
+
+    assert results[1] == {'success': True, 'output': 'output of 1'}
+    assert results[2]['success'] is False
+    assert results[2]['output'] == 'output of 2'
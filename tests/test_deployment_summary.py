@@ -0,0 +1,33 @@
+"""
+Dashboard summary cache invalidation
+"""
+import pytest
+
+@pytest.fixture
+def cache(backend, monkeypatch):
+    # Imported here: Config is read at import, after the backend fixture sets the environment
+    from deployment_summary import DeploymentSummaryCache
+    cache = DeploymentSummaryCache(ttl=30)
+    results = iter([{'total_deployments': 1}, {'total_deployments': 2}])
+    monkeypatch.setattr(cache, 'compute', lambda user_id: next(results))
+    return cache
+
+def test_summary_is_cached_until_invalidated(cache):
+    assert cache.get(1) == {'total_deployments': 1}
+    assert cache.get(1) == {'total_deployments': 1}
+    cache.invalidate(1)
+    assert cache.get(1) == {'total_deployments': 2}
+
+def test_invalidation_during_compute_is_not_overwritten(cache, monkeypatch):
+    compute = cache.compute
+
+    def compute_racing_a_write(user_id):
+        summary = compute(user_id)
+        cache.invalidate(user_id)
+        return summary
+
+    monkeypatch.setattr(cache, 'compute', compute_racing_a_write)
+    assert cache.get(1) == {'total_deployments': 1}
+    monkeypatch.setattr(cache, 'compute', compute)
+    # The stale result wasn't cached, so this computes afresh
+    assert cache.get(1) == {'total_deployments': 2}
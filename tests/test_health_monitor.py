@@ -0,0 +1,34 @@
+"""
+Backend health probes against the in-process fake SSH backend
+"""
+import pytest
+
+@pytest.fixture
+def monitor(backend, ssh_config, monkeypatch):
+    # Imported here: Config is read at import, after the backend fixture sets the environment
+    import health_monitor
+    from ssh_pool import SSHConnectionPool
+    pool = SSHConnectionPool(max_transports_per_host=1, max_channels_per_transport=2, acquire_timeout=30)
+    monkeypatch.setattr(health_monitor, 'ssh_pool', pool)
+    monkeypatch.setattr(health_monitor.backend_scheduler, 'ssh_config_for', lambda host_id: ssh_config)
+    monitor = health_monitor.HealthMonitor(probe_timeout=2, slow_probe=1.0)
+    yield monitor
+    for entry in monitor._backend_transports.values():
+        entry.close()
+    pool.close_all()
+
+HOST = {'id': 1, 'name': 'fake', 'hostname': '127.0.0.1', 'port': 0, 'enabled': True}
+
+def test_backend_probe_is_ok_on_an_idle_host(monitor):
+    result = monitor._probe_backend(HOST)
+    assert result['status'] == 'ok', result
+
+def test_saturated_ssh_pool_is_degraded_not_down(monitor, ssh_config):
+    import health_monitor
+    pool = health_monitor.ssh_pool
+    with pool.channel(ssh_config), pool.channel(ssh_config):
+        result = monitor._probe_backend(HOST)
+
+    assert result['status'] == 'degraded', result
+    assert result['error'] is None
+    assert result['pool']['saturation'] == 1.0
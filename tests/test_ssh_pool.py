@@ -0,0 +1,23 @@
+"""
+SSH transport pool limits against the in-process fake SSH backend
+"""
+import time
+import pytest
+
+def test_checkout_times_out_when_host_is_saturated(ssh_config):
+    # Imported here: Config is read at import, after the backend fixture sets the environment
+    from ssh_pool import SSHConnectionPool, SSHPoolTimeout
+    pool = SSHConnectionPool(max_transports_per_host=1, max_channels_per_transport=1, acquire_timeout=0.2)
+    try:
+        with pool.channel(ssh_config):
+            started = time.monotonic()
+            with pytest.raises(SSHPoolTimeout):
+                with pool.channel(ssh_config):
+                    pass
+            assert time.monotonic() - started < 1.0
+
+        # The slot is usable again once released
+        with pool.channel(ssh_config):
+            pass
+    finally:
+        pool.close_all()